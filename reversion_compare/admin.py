@@ -8,22 +8,32 @@
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
 import logging
+import uuid
+from functools import update_wrapper
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.admin.utils import quote, unquote
-from django.http import Http404
-from django.shortcuts import get_object_or_404, render
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
+from django.template.loader import render_to_string
 from django.urls import path, reverse
+from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
 from django.utils.translation import gettext as _
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
 from reversion import RevertError
 from reversion.admin import VersionAdmin
 from reversion.models import Revision, Version
 
+from reversion_compare import timing
 from reversion_compare.compare_raw import get_version_data, pformat
+from reversion_compare.field_data import get_field_data
 from reversion_compare.helpers import html_diff
-from reversion_compare.mixins import CompareMethodsMixin, CompareMixin
+from reversion_compare.mixins import CompareMethodsMixin, CompareMixin, CompareResult
 
 
 logger = logging.getLogger(__name__)
@@ -73,6 +83,8 @@ class BaseCompareVersionAdmin(CompareMixin, VersionAdmin):
     # Template file used for the compare view:
     compare_template = "reversion-compare/compare.html"
     compare_raw_template = "reversion-compare/compare_raw.html"
+    field_timeline_template = "reversion-compare/field_timeline.html"
+    blame_template = "reversion-compare/blame.html"
 
     # change template from django-reversion to add compare selection form:
     object_history_template = "reversion-compare/object_history.html"
@@ -88,42 +100,67 @@ class BaseCompareVersionAdmin(CompareMixin, VersionAdmin):
                 "<str:object_id>/history/compare/",
                 admin_site.admin_view(self.compare_view),
                 name=f"{info[0]}_{info[1]}_compare"
-            )
+            ),
+            path(
+                "<str:object_id>/history/field/<str:field_name>/",
+                admin_site.admin_view(self.field_timeline_view),
+                name=f"{info[0]}_{info[1]}_field_timeline"
+            ),
+            path(
+                "<str:object_id>/history/blame/<str:field_name>/",
+                admin_site.admin_view(self.blame_view),
+                name=f"{info[0]}_{info[1]}_blame"
+            ),
         ]
         return reversion_urls + urls
 
     def _get_action_list(self, request, object_id, extra_context=None):
-        """Renders the history view."""
+        """Returns the action list and the HistoryPage for the history view."""
         object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+        history_page = self._get_history_page(
+            request.GET,
+            Version.objects.get_for_object_reference(self.model, object_id).select_related("revision__user"),
+        )
+        return self._build_action_list(object_id, history_page), history_page
+
+    def _build_action_list(self, object_id, history_page) -> list:
         opts = self.model._meta
+
+        # Build all revision urls from one prefix, instead of a reverse() call per version:
+        url_prefix = reverse(
+            f"{self.admin_site.name}:{opts.app_label}_{opts.model_name}_revision",
+            args=(quote(object_id), 0),
+        ).removesuffix('0/')
+
         action_list = [
             {
                 "version": version,
                 "revision": version.revision,
-                "url": reverse(
-                    f"{self.admin_site.name}:{opts.app_label}_{opts.model_name}_revision",
-                    args=(quote(version.object_id), version.id),
-                ),
+                "url": f'{url_prefix}{version.id}/',
             }
-            for version in self._order_version_queryset(
-                Version.objects.get_for_object_reference(self.model, object_id).select_related("revision__user")
-            )
+            for version in history_page.versions
         ]
         return action_list
 
-    def history_view(self, request, object_id, extra_context=None):
-        """Renders the history view."""
-        action_list = self._get_action_list(request, object_id, extra_context=extra_context)
-        self._annotate_action_list(action_list)
+    def _build_history_context(self, action_list, history_page, extra_context=None) -> dict:
+        if history_page.is_latest:
+            self._annotate_action_list(action_list)
 
-        # Compile the context.
         context = {
             'action_list': action_list,
+            'history_page': history_page,
             'comparable': len(action_list) >= 2,
             'compare_view': True,
         }
         context.update(extra_context or {})
-        return super().history_view(request, object_id, context)
+        return context
+
+    def history_view(self, request, object_id, extra_context=None):
+        """Renders the history view."""
+        action_list, history_page = self._get_action_list(request, object_id, extra_context=extra_context)
+        context = self._build_history_context(action_list, history_page, extra_context)
+        # Skip VersionAdmin.history_view(), because it would build a action list of all versions, too:
+        return admin.ModelAdmin.history_view(self, request, object_id, context)
 
     def _build_base_context(self, request, obj, version1, version2):
         opts = self.model._meta
@@ -156,15 +193,35 @@ class BaseCompareVersionAdmin(CompareMixin, VersionAdmin):
         if self.compare is None:
             raise Http404("Compare view not enabled.")
 
-        object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
-        obj = get_object_or_404(self.model, pk=object_id)
-        queryset = Version.objects.get_for_object(obj)
-        nav = self._resolve_versions_and_navigation(request.GET, queryset)
-        version1 = nav['version1']
-        version2 = nav['version2']
+        timings = timing.get_compare_timings()
+        with timing.activate(timings):
+            response = self._compare_view(request, object_id, timings, extra_context=extra_context)
+        if timings is not None and not response.streaming:
+            timings.add_to_response(response, f'Compare {self.model._meta.label} {object_id}')
+        return response
+
+    def _compare_view(self, request, object_id, timings, extra_context=None):
+        with timing.phase('versions'):
+            object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+            obj = get_object_or_404(self.model, pk=object_id)
+            queryset = Version.objects.get_for_object(obj)
+            nav = self._resolve_versions_and_navigation(request.GET, queryset)
+            version1 = nav['version1']
+            version2 = nav['version2']
 
         try:
-            compare_result = self.compare(obj, version1, version2)
+            if self.get_compare_streaming():
+                compare_result = self.get_cached_compare_result(obj, version1, version2)
+                if compare_result is None:
+                    # Deserialize both versions before the response is started,
+                    # so that a RevertError can still fallback to the raw compare:
+                    with timing.phase('deserialize'):
+                        for version in (version1, version2):
+                            get_field_data(version)
+                    return self.streaming_compare_view(request, obj, nav, extra_context=extra_context, timings=timings)
+            else:
+                with timing.phase('compare'):
+                    compare_result = self.get_compare_result(obj, version1, version2)
         except RevertError as err:
             logger.exception('Fallback compare caused')
             # A old version can't be loaded.
@@ -173,15 +230,142 @@ class BaseCompareVersionAdmin(CompareMixin, VersionAdmin):
             # Fallback to JSON compare
             return self.compare_raw(request, obj, version1, version2, compare_error=err, extra_context=extra_context)
 
-        context = self._build_base_context(request, obj, version1, version2)
+        with timing.phase('render'):
+            return self._render_compare(request, obj, nav, compare_result, extra_context, timings)
+
+    def _render_compare(self, request, obj, nav, compare_result, extra_context=None, timings=None):
+        context = self._build_base_context(request, obj, nav['version1'], nav['version2'])
         context.update({
             'compare_data': compare_result.diff,
             'has_unfollowed_fields': compare_result.has_unfollowed_fields,
         })
+        if timings is not None:
+            context['compare_timings'] = timings
         context.update(nav)  # merges next_url / prev_url if present
         context.update(extra_context or {})
         return render(request, self.compare_template or self._get_template_list('compare.html'), context)
 
+    def _build_field_context(self, request, obj, field, title) -> dict:
+        opts = self.model._meta
+        return {
+            **self.admin_site.each_context(request),
+            'opts': opts,
+            'app_label': opts.app_label,
+            'model_name': capfirst(opts.verbose_name),
+            'title': title % {'field': getattr(field, 'verbose_name', None) or field.name},
+            'obj': obj,
+            'original': obj,
+            'field': field,
+            'changelist_url': reverse(f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_changelist'),
+            'history_url': reverse(
+                f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_history',
+                args=(quote(obj.pk),),
+            ),
+            'compare_url': reverse(
+                f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_compare',
+                args=(quote(obj.pk),),
+            ),
+        }
+
+    def field_timeline_view(self, request, object_id, field_name, extra_context=None):
+        """
+        Show all changes of one field over the whole history of the object.
+        """
+        if self.compare is None:
+            raise Http404("Compare view not enabled.")
+
+        object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+        obj = get_object_or_404(self.model, pk=object_id)
+        versions = Version.objects.get_for_object(obj).select_related('revision__user').order_by('pk')
+        timeline = self.get_field_timeline(obj, field_name, versions.iterator(chunk_size=100))
+        if self.history_latest_first:
+            timeline.reverse()
+
+        field = self._get_field_plan(obj, field_name).field
+        context = self._build_field_context(request, obj, field, _('Changes of %(field)s'))
+        context['timeline'] = timeline
+        context.update(extra_context or {})
+        return render(request, self.field_timeline_template or self._get_template_list('field_timeline.html'), context)
+
+    def blame_view(self, request, object_id, field_name, extra_context=None):
+        """
+        Show every line of the current field value with the version, that changed it last.
+        """
+        if self.compare is None:
+            raise Http404("Compare view not enabled.")
+
+        object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+        obj = get_object_or_404(self.model, pk=object_id)
+        blame = self.get_field_blame(obj, field_name, Version.objects.get_for_object(obj))
+
+        field = self._get_field_plan(obj, field_name).field
+        context = self._build_field_context(request, obj, field, _('Blame of %(field)s'))
+        context['blame'] = blame.lines
+        context['blame_approximate'] = blame.approximate
+        context.update(extra_context or {})
+        return render(request, self.blame_template or self._get_template_list('blame.html'), context)
+
+    def streaming_compare_view(self, request, obj, nav, extra_context=None, timings=None):
+        """
+        Send the page header directly and then the diff of every field as soon as it's created.
+        The compare result will be stored in the compare result cache at the end.
+        """
+        version1 = nav['version1']
+        version2 = nav['version2']
+        template_name = self.compare_template or self._get_template_list('compare.html')
+        field_template_name = 'reversion-compare/compare_field_partial.html'
+
+        # Split the page at the marker into the head and the tail:
+        marker = f'<!-- {uuid.uuid4().hex} -->'
+        context = self._build_base_context(request, obj, version1, version2)
+        context.update({
+            'compare_stream_marker': mark_safe(marker),
+            'has_unfollowed_fields': False,
+        })
+        context.update(nav)
+        context.update(extra_context or {})
+
+        def render_page():
+            with timing.phase('render'):
+                return render_to_string(template_name, context, request=request).split(marker, 1)
+
+        def stream():
+            # The generator runs outside of the view, so activate the timings for every step:
+            with timing.activate(timings):
+                head, tail = render_page()
+            yield head
+
+            compare_result = CompareResult(diff=[], has_unfollowed_fields=False)
+            field_diffs = self.iter_compare(obj, version1, version2, compare_result)
+            while True:
+                with timing.activate(timings), timing.phase('compare'):
+                    field_diff = next(field_diffs, None)
+                    if field_diff is not None:
+                        compare_result.diff.append(field_diff)
+                        html = render_to_string(field_template_name, {'field_diff': field_diff})
+                if field_diff is None:
+                    break
+                yield html
+
+            if not compare_result.diff:
+                yield render_to_string(field_template_name, {'field_diff': None})
+
+            self.set_cached_compare_result(obj, version1, version2, compare_result)
+
+            # The tail contains e.g. the "unfollowed fields" note:
+            context['has_unfollowed_fields'] = compare_result.has_unfollowed_fields
+            with timing.activate(timings):
+                head, tail = render_page()
+            if timings is not None:
+                timings.log(f'Streamed compare {self.model._meta.label} {obj.pk}')
+            yield tail
+
+        response = StreamingHttpResponse(stream(), content_type='text/html; charset=utf-8')
+        if timings is not None:
+            # Only the timings until the response starts are known here:
+            response['Server-Timing'] = timings.get_server_timing()
+        return response
+
     def compare_raw(self, request, obj, version1, version2, compare_error, extra_context=None):
         """
         Fallback: compare the raw json data.
@@ -211,6 +395,85 @@ class CompareVersionAdmin(CompareMethodsMixin, BaseCompareVersionAdmin):
     """
 
 
+class AsyncCompareVersionAdmin(CompareVersionAdmin):
+    """
+    CompareVersionAdmin with async history and compare views, for running under ASGI.
+
+    The database lookups use the async ORM, the compare itself runs in a bounded
+    thread pool, see: settings.REVERSION_COMPARE_ASYNC_WORKERS
+    The streaming compare view is not supported, the sync view is used for it.
+    """
+
+    def get_urls(self):
+        opts = self.model._meta
+        info = opts.app_label, opts.model_name
+        async_urls = [
+            path(
+                "<str:object_id>/history/compare/",
+                self._async_admin_view(self.acompare_view),
+                name=f"{info[0]}_{info[1]}_compare",
+            ),
+            path(
+                "<path:object_id>/history/",
+                self._async_admin_view(self.ahistory_view),
+                name=f"{info[0]}_{info[1]}_history",
+            ),
+        ]
+        async_names = {url.name for url in async_urls}
+        return async_urls + [url for url in super().get_urls() if getattr(url, 'name', None) not in async_names]
+
+    def _async_admin_view(self, view):
+        """
+        Async version of AdminSite.admin_view()
+        """
+        admin_site = self.admin_site
+
+        async def inner(request, *args, **kwargs):
+            if not await sync_to_async(admin_site.has_permission)(request):
+                return redirect_to_login(
+                    request.get_full_path(),
+                    reverse('admin:login', current_app=admin_site.name),
+                )
+            return await view(request, *args, **kwargs)
+
+        return csrf_protect(never_cache(update_wrapper(inner, view)))
+
+    async def ahistory_view(self, request, object_id, extra_context=None):
+        """Async version of history_view()"""
+        object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+        queryset = await sync_to_async(Version.objects.get_for_object_reference)(self.model, object_id)
+        history_page = await self._aget_history_page(request.GET, queryset.select_related("revision__user"))
+        action_list = self._build_action_list(object_id, history_page)
+        context = self._build_history_context(action_list, history_page, extra_context)
+        # The permission checks and the object lookup of the admin history view are sync:
+        return await sync_to_async(admin.ModelAdmin.history_view)(self, request, object_id, context)
+
+    async def acompare_view(self, request, object_id, extra_context=None):
+        """Async version of compare_view()"""
+        if self.compare is None:
+            raise Http404("Compare view not enabled.")
+        if self.get_compare_streaming():
+            return await sync_to_async(self.compare_view)(request, object_id, extra_context=extra_context)
+
+        object_id = unquote(object_id)  # Underscores in primary key get quoted to "_5F"
+        obj = await aget_object_or_404(self.model, pk=object_id)
+        queryset = await sync_to_async(Version.objects.get_for_object)(obj)
+        nav = await self._aresolve_versions_and_navigation(request.GET, queryset)
+        version1 = nav['version1']
+        version2 = nav['version2']
+
+        try:
+            compare_result = await self.aget_compare_result(obj, version1, version2)
+        except RevertError as err:
+            logger.exception('Fallback compare caused')
+            return await sync_to_async(self.compare_raw)(
+                request, obj, version1, version2, compare_error=err, extra_context=extra_context
+            )
+
+        # The admin context (e.g. the permission checks) is sync:
+        return await sync_to_async(self._render_compare)(request, obj, nav, compare_result, extra_context)
+
+
 if hasattr(settings, "ADD_REVERSION_ADMIN") and settings.ADD_REVERSION_ADMIN:
 
     @admin.register(Revision)
@@ -1,4 +1,5 @@
 from django.apps import AppConfig as BaseAppConfig
+from django.conf import settings
 
 
 class AppConfig(BaseAppConfig):
@@ -7,3 +8,15 @@ class AppConfig(BaseAppConfig):
 
     def ready(self):
         import reversion_compare.checks  # noqa
+        from reversion.signals import post_revision_commit
+
+        from reversion_compare.signals import store_changed_fields_receiver, store_version_digests
+
+        post_revision_commit.connect(store_version_digests, dispatch_uid='reversion_compare_version_digests')
+        post_revision_commit.connect(store_changed_fields_receiver, dispatch_uid='reversion_compare_changed_fields')
+
+        if getattr(settings, 'REVERSION_COMPARE_PLAN_WARMUP', False):
+            # Needs the registered ModelAdmins: 'django.contrib.admin' must be before us in INSTALLED_APPS
+            from reversion_compare.plan import warm_compare_plans
+
+            warm_compare_plans()
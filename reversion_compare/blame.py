@@ -0,0 +1,77 @@
+"""
+    blame
+    ~~~~~
+
+    "git blame" of a text field: Which version changed a line of the text last?
+
+    The blame is created incrementally over the versions: The line owners of a version
+    are created from the owners of the previous version and one line level diff
+    (diff-match-patch linesToChars mode). The owners of every version are stored in
+    the compare result cache (if activated via settings.REVERSION_COMPARE_CACHE),
+    so a new version needs only one diff.
+
+    If a diff runs out of time, the changed lines are not exact: The blame of this and
+    all following versions is marked as approximate and never cached.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import dataclasses
+import time
+
+from diff_match_patch import diff_match_patch
+
+from reversion_compare.helpers import get_diff_timeout
+
+
+def split_lines(text: str) -> list:
+    """
+    Split the text into lines with the line endings, in the same way as diff_match_patch.diff_linesToChars()
+    """
+    lines = [f'{line}\n' for line in text.split('\n')]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+@dataclasses.dataclass
+class FieldBlame:
+    lines: list  # [{'number':..., 'line':..., 'version':..., 'revision':..., 'first':...}, ...]
+    approximate: bool = False  # A diff ran out of time: Unchanged lines may be owned by a newer version
+
+
+def blame_lines(text1: str, owners1: list, text2: str, owner2) -> tuple[list, bool]:
+    """
+    Returns the owners of all lines of text2 and if they are exact:
+    The owner of unchanged lines is taken from owners1 (the owners of all lines of text1)
+    all inserted or changed lines are owned by owner2.
+    """
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = timeout = get_diff_timeout()
+    chars1, chars2, __ = dmp.diff_linesToChars(text1, text2)
+
+    start_time = time.monotonic()
+    diff = dmp.diff_main(chars1, chars2, checklines=False)
+    # A diff, that runs out of time, is valid but not minimal:
+    exact = not timeout or time.monotonic() - start_time < timeout
+
+    # Every character is one line:
+    owners2 = []
+    position = 0
+    for op, data in diff:
+        count = len(data)
+        if op == diff_match_patch.DIFF_EQUAL:
+            owners2.extend(owners1[position : position + count])
+            position += count
+        elif op == diff_match_patch.DIFF_DELETE:
+            position += count
+        else:
+            owners2.extend([owner2] * count)
+
+    line_count = len(split_lines(text2))
+    if len(owners2) != line_count or position != len(owners1):
+        # e.g.: Too many different lines for linesToChars
+        return [owner2] * line_count, False
+    return owners2, exact
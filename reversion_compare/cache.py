@@ -0,0 +1,130 @@
+"""
+    cache
+    ~~~~~
+
+    Cache the compare results of two versions.
+
+    A Version is never changed after it was written, so the compare result of
+    two versions is always the same, as long as the compare configuration is
+    not changed. This is not true for relation fields: Their diffs contain the live
+    related objects (e.g. the __str__ of a ForeignKey target or the deleted objects).
+    So only the diffs of the plain fields are cached, relation fields are compared on
+    every request. The blame line owners of a version field are cached, too.
+    The cache is disabled by default, activate it in settings, e.g.:
+
+        REVERSION_COMPARE_CACHE = 'default'  # Name of the Django cache to use
+        REVERSION_COMPARE_CACHE_TIMEOUT = 60 * 60 * 24  # optional
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils import timezone, translation
+
+import reversion_compare
+
+
+CACHE_KEY_PREFIX = 'reversion_compare'
+
+# Only the settings, that change the compare result:
+COMPARE_RESULT_SETTINGS = (
+    'REVERSION_COMPARE_DIFF_ENGINE',
+    'REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID',
+    'REVERSION_COMPARE_IGNORE_NOT_REGISTERED',
+    'REVERSION_COMPARE_JSON_DECODER',
+    'REVERSION_COMPARE_RELATION_DIGEST_SIZE',
+    'REVERSION_COMPARE_RELATION_PAGE_SIZE',
+)
+
+
+def get_compare_cache_alias() -> str | None:
+    return getattr(settings, 'REVERSION_COMPARE_CACHE', None) or None
+
+
+def get_compare_cache():
+    return caches[get_compare_cache_alias()]
+
+
+def get_compare_cache_timeout():
+    return getattr(settings, 'REVERSION_COMPARE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _setting_to_str(value) -> str:
+    """
+    Returns a string of the setting value, that is the same in all processes.
+    """
+    if callable(value):
+        # e.g. a function or class instead of a dotted path: repr() contains the memory address
+        if not hasattr(value, '__qualname__'):
+            value = type(value)
+        return f'{value.__module__}.{value.__qualname__}'
+    return repr(value)
+
+
+def get_reversion_compare_settings() -> tuple:
+    """
+    Returns the COMPARE_RESULT_SETTINGS as (name, value string) tuple.
+    """
+    return tuple((name, _setting_to_str(getattr(settings, name, None))) for name in COMPARE_RESULT_SETTINGS)
+
+
+def get_compare_config_key(compare_instance, obj) -> str:
+    """
+    Returns a hash of everything that can change the compare result of two versions:
+
+     * The package version
+     * The compare class (e.g. the ModelAdmin with own compare_* methods) and the model
+     * compare_fields / compare_exclude
+     * The REVERSION_COMPARE_* settings, that change the result, see: COMPARE_RESULT_SETTINGS
+       (e.g. the cache or timing settings are not included)
+     * Current language and timezone, because the result contains rendered html
+       (e.g. translated labels and DateTimeField values in the current timezone)
+
+    So a result is only used for requests with the same language and timezone.
+    """
+    compare_class = compare_instance.__class__
+    config = (
+        reversion_compare.__version__,
+        f'{compare_class.__module__}.{compare_class.__qualname__}',
+        obj._meta.label,
+        compare_instance.compare_fields,
+        compare_instance.compare_exclude,
+        get_reversion_compare_settings(),
+        translation.get_language(),
+        timezone.get_current_timezone_name(),
+    )
+    return hashlib.sha256(repr(config).encode('utf-8')).hexdigest()
+
+
+def get_compare_cache_key(compare_instance, obj, version1, version2) -> str | None:
+    """
+    Returns the cache key for the compare result of version1 and version2 or None if the cache is disabled.
+    """
+    if get_compare_cache_alias() is None:
+        return None
+
+    config_key = get_compare_config_key(compare_instance, obj)
+    return f'{CACHE_KEY_PREFIX}:compare:{config_key}:{version1.pk}:{version2.pk}'
+
+
+def get_deleted_versions_cache_key(revision_pk, content_type_id) -> str | None:
+    """
+    Returns the cache key for the deleted versions of one model in a revision or None if the cache is disabled.
+    """
+    if get_compare_cache_alias() is None:
+        return None
+    return f'{CACHE_KEY_PREFIX}:deleted:{revision_pk}:{content_type_id}'
+
+
+def get_blame_cache_key(version_pk, attname) -> str | None:
+    """
+    Returns the cache key for the blame line owners of a version field or None if the cache is disabled.
+    """
+    if get_compare_cache_alias() is None:
+        return None
+    return f'{CACHE_KEY_PREFIX}:blame:{version_pk}:{attname}'
@@ -0,0 +1,81 @@
+"""
+    changed_fields
+    ~~~~~~~~~~~~~~
+
+    Index of the changed fields of every Version.
+
+    The history can be filtered by a changed field, e.g.: "?changed_field=status"
+    Without the index, this needs a compare of every version with its previous version.
+    The changed fields are the same as in the compare view (see: CompareMixin.get_changed_fields())
+    and stored in the ChangedField model. Disabled by default, activate it in settings:
+
+        REVERSION_COMPARE_CHANGED_FIELDS = True
+
+    Create the index of existing versions via the "backfill_changed_fields" management command.
+    Without stored changed fields, the history views display all versions with a message.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from reversion.models import Version
+
+from reversion_compare.models import ChangedField
+
+
+# Name of the GET parameter of the history views:
+CHANGED_FIELD_PARAMETER = 'changed_field'
+
+
+def get_changed_fields_enabled() -> bool:
+    return getattr(settings, 'REVERSION_COMPARE_CHANGED_FIELDS', False)
+
+
+def get_previous_version(version) -> Version | None:
+    """
+    Returns the previous Version of the same object or None
+    """
+    return (
+        Version.objects.using(version._state.db)
+        .get_for_object_reference(version._model, version.object_id, model_db=version.db)
+        .filter(pk__lt=version.pk)
+        .select_related('revision')
+        .order_by('-pk')
+        .first()
+    )
+
+
+def store_changed_fields(compare_instance, obj, version1, version2) -> list:
+    """
+    Compare version2 with its previous version1 and store the names of all changed fields.
+    """
+    field_names = compare_instance.get_changed_fields(obj, version1, version2)
+    ChangedField.objects.using(version2._state.db).bulk_create(
+        [ChangedField(version_id=version2.pk, field_name=field_name) for field_name in field_names],
+        ignore_conflicts=True,
+    )
+    return field_names
+
+
+def get_indexed_expression():
+    """
+    Has the version stored changed fields? see: store.iter_version_pairs()
+    """
+    return Exists(ChangedField.objects.filter(version=OuterRef('pk')))
+
+
+def any_changed_field(queryset):
+    """
+    Returns a queryset of one stored changed field of the versions, if there is any.
+    No changed fields at all: The index is not activated or not backfilled for these versions.
+    """
+    return ChangedField.objects.filter(version__in=queryset.values('pk')).values_list('pk', flat=True)[:1]
+
+
+def filter_changed_field(queryset, field_name: str):
+    """
+    Filter the version queryset by the changed field.
+    """
+    return queryset.filter(compare_changed_fields__field_name=field_name)
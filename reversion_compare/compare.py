@@ -11,19 +11,43 @@
 import dataclasses
 import datetime
 import decimal
+import functools
+import itertools
 import logging
+import operator
+from collections.abc import Mapping
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import models, router
+from django.db.models import Max, Q
 from django.utils.encoding import force_str
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 from reversion import is_registered
 from reversion.models import Version
 from reversion.revisions import _get_options
 from rich.pretty import pretty_repr
 
+from reversion_compare.cache import get_compare_cache, get_compare_cache_timeout, get_deleted_versions_cache_key
+from reversion_compare.field_data import get_field_data
+from reversion_compare.plan import FieldPlan
+from reversion_compare.set_diff import (
+    chunked,
+    diff_digests,
+    first_ids,
+    get_existing_ids,
+    get_objects,
+    get_relation_page_size,
+    get_version_digests,
+    get_versions,
+    same_version_data,
+    use_digests,
+    with_digests,
+)
+from reversion_compare.timing import phase
+
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +71,200 @@ class ManyToSomethingResult:
     deleted: list = dataclasses.field(default_factory=list)  # [Version], populated only for reverse relations
 
 
+def _find_deleted_version_pks(revision, content_types: dict, known_pks: dict) -> dict:
+    """
+    Returns {content_type_id: [version pk]} of all versions of the revision,
+    whose objects don't exist anymore.
+    The objects of the versions in known_pks ({content_type_id: [version pk]}) are known
+    to be deleted and are not checked again.
+    """
+    revision_versions = {content_type.pk: {} for content_type in content_types.values()}
+    for pk, content_type_id, object_id, db in (
+        revision.version_set.filter(content_type__in=content_types.values())
+        .order_by('pk')
+        .values_list('pk', 'content_type_id', 'object_id', 'db')
+    ):
+        revision_versions[content_type_id][(object_id, db)] = pk  # The latest version of the object wins
+
+    deleted_pks = {}
+    for model, content_type in content_types.items():
+        model_db = router.db_for_write(model)
+        versions = {
+            object_id: pk for (object_id, db), pk in revision_versions[content_type.pk].items() if db == model_db
+        }
+        known = set(known_pks.get(content_type.pk, ()))
+        unknown_ids = [object_id for object_id, pk in versions.items() if pk not in known]
+        if unknown_ids:
+            missing_ids = set(unknown_ids).difference(get_existing_ids(model, unknown_ids, using=model_db))
+        else:
+            missing_ids = set()
+        deleted_pks[content_type.pk] = sorted(
+            pk for object_id, pk in versions.items() if pk in known or object_id in missing_ids
+        )
+    return deleted_pks
+
+
+def get_deleted_versions(revision, related_models) -> dict:
+    """
+    Returns {content_type_id: [Version]} with all versions of the revision,
+    whose objects don't exist anymore.
+
+    Same as VersionQuerySet.get_deleted() on the versions of the revision, but only the objects
+    of the revision are checked instead of all versions of the model and all models are handled
+    together.
+    """
+    deleted_pks = get_deleted_version_pks(revision, related_models)
+    result = {content_type_id: [] for content_type_id in deleted_pks}
+    all_pks = [pk for pks in deleted_pks.values() for pk in pks]
+    for chunk in chunked(all_pks):
+        for version in Version.objects.filter(pk__in=chunk):
+            result[version.content_type_id].append(version)
+    return result
+
+
+def get_deleted_version_pks(revision, related_models) -> dict:
+    """
+    Returns {content_type_id: [Version pk]}, see: get_deleted_versions()
+    The deleted pks will be stored in the compare cache, if activated via settings.REVERSION_COMPARE_CACHE
+    The list of deleted objects only grows: The cached ones are not checked again,
+    but all other objects are checked on every call.
+    """
+    content_types = ContentType.objects.get_for_models(*related_models, for_concrete_models=False)
+
+    cache_keys = {}  # {cache key: content type id}
+    for content_type in content_types.values():
+        cache_key = get_deleted_versions_cache_key(revision.pk, content_type.pk)
+        if cache_key is not None:
+            cache_keys[cache_key] = content_type.pk
+    known_pks = {}
+    if cache_keys:
+        for cache_key, pks in get_compare_cache().get_many(cache_keys).items():
+            known_pks[cache_keys[cache_key]] = pks
+
+    deleted_pks = _find_deleted_version_pks(revision, content_types, known_pks)
+    if cache_keys:
+        changed = {pk: pks for pk, pks in deleted_pks.items() if known_pks.get(pk) != pks}
+        if changed:
+            get_compare_cache().set_many(
+                {get_deleted_versions_cache_key(revision.pk, pk): pks for pk, pks in changed.items()},
+                timeout=get_compare_cache_timeout(),
+            )
+    return deleted_pks
+
+
+class RelatedVersionsPrefetch:
+    """
+    Load the related Version rows of all relation fields of one revision with a single query.
+
+    The target ids of every m2m / reverse FK field are collected via add(), then load()
+    fetches all of them at once and get_versions() hands the shared result to each CompareObject.
+    """
+
+    def __init__(self, revision):
+        self.revision = revision
+        self.wanted = {}  # {content_type_id: set(object_ids)}
+        self.loaded = None  # {(content_type_id, object_id): Version}
+        self.deleted_models = set()  # Related models of reverse relations
+        self.deleted = None  # {content_type_id: [Version]}
+
+    def add(self, content_type, object_ids):
+        if self.loaded is not None:
+            raise RuntimeError('Related versions are already loaded')
+        self.wanted.setdefault(content_type.pk, set()).update(object_ids)
+
+    def add_deleted_model(self, related_model):
+        """
+        Search deleted objects of this model in the revision, see: get_deleted_versions()
+        """
+        if self.loaded is not None:
+            raise RuntimeError('Related versions are already loaded')
+        self.deleted_models.add(related_model)
+
+    def load(self):
+        # Usually one query, but the "IN" lists are chunked:
+        wanted = [(content_type_id, object_id) for content_type_id, ids in self.wanted.items() for object_id in ids]
+        self.loaded = {}
+        for chunk in chunked(wanted):
+            query = Q()
+            for content_type_id, items in itertools.groupby(chunk, key=operator.itemgetter(0)):
+                query |= Q(content_type_id=content_type_id, object_id__in=[object_id for __, object_id in items])
+            for version in with_digests(self.revision.version_set.filter(query)):
+                self.loaded[(version.content_type_id, version.object_id)] = version
+
+        if self.deleted_models:
+            self.deleted = get_deleted_versions(self.revision, self.deleted_models)
+
+    def get_deleted(self, content_type) -> list | None:
+        """
+        Returns a new list of the deleted versions or None if the model was not prefetched.
+        """
+        if self.deleted is None or content_type.pk not in self.deleted:
+            return None
+        return list(self.deleted[content_type.pk])
+
+    def get_versions(self, content_type, object_ids) -> dict | None:
+        """
+        Returns {object_id: Version} or None if the ids were not prefetched.
+        """
+        if self.loaded is None:
+            return None
+        wanted = self.wanted.get(content_type.pk)
+        if wanted is None or not wanted.issuperset(object_ids):
+            return None
+        return {
+            object_id: self.loaded[(content_type.pk, object_id)]
+            for object_id in object_ids
+            if (content_type.pk, object_id) in self.loaded
+        }
+
+
+@functools.cache
+def get_parent_models(model) -> tuple:
+    """
+    Returns all multi-table inheritance parents of the model, the nearest first.
+    """
+    return tuple(model._meta.concrete_model._meta.get_parent_list())
+
+
+def get_ids_with_versions_before(model, object_ids, revision) -> set:
+    """
+    Returns the ids of the objects with a version before the revision was created,
+    the same ids as get_latest_versions_before(), without loading the versions.
+    """
+    object_ids_with_versions = set()
+    for chunk in chunked(object_ids):
+        object_ids_with_versions.update(
+            Version.objects.get_for_model(model)
+            .filter(object_id__in=chunk, revision__date_created__lt=revision.date_created)
+            .order_by()
+            .values_list('object_id', flat=True)
+            .distinct()
+        )
+    return object_ids_with_versions
+
+
+def get_latest_versions_before(model, object_ids, revision) -> dict:
+    """
+    Returns {object_id: Version} with the latest version of every object before the revision was created.
+    Uses one query per chunk of objects.
+    """
+    if not object_ids:
+        return {}
+
+    versions = {}
+    for chunk in chunked(object_ids):
+        latest_pks = (
+            Version.objects.get_for_model(model)
+            .filter(object_id__in=chunk, revision__date_created__lt=revision.date_created)
+            .order_by()
+            .values('object_id')
+            .annotate(latest_pk=Max('pk'))
+            .values('latest_pk')
+        )
+        versions.update((version.object_id, version) for version in Version.objects.filter(pk__in=latest_pks))
+    return versions
+
+
 class CompareObject:
     def __init__(
         self,
@@ -57,6 +275,8 @@ class CompareObject:
         follow: bool | None,
         compare_foreign_objects_as_id: bool,
         ignore_not_registered: bool,
+        prefetch: RelatedVersionsPrefetch | None = None,
+        flatchoices: Mapping | None = None,
     ):
         self.field = field
         self.field_name = field_name
@@ -66,21 +286,32 @@ class CompareObject:
         self.follow = follow
         self.compare_foreign_objects_as_id = compare_foreign_objects_as_id
         self.ignore_not_registered = ignore_not_registered
+        self.prefetch = prefetch
+        self._flatchoices = flatchoices
+        self._reverse_foreign_key_target = None
+
+    @cached_property
+    def value(self):
+        # Plain field values are read from the serialized data, without deserializing the version:
+        field_data = get_field_data(self.version_record)
         if self.compare_foreign_objects_as_id:
-            self.value = version_record.field_dict.get(getattr(field, "attname", field_name), DOES_NOT_EXIST)
+            return field_data.get(getattr(self.field, "attname", self.field_name), DOES_NOT_EXIST)
         else:
-            self.value = version_record.field_dict.get(field_name, DOES_NOT_EXIST)
+            return field_data.get(self.field_name, DOES_NOT_EXIST)
 
     def _obj_repr(self, obj):
         if isinstance(obj, (datetime.time, datetime.date, datetime.datetime)):
             return obj.isoformat()
         if isinstance(obj, decimal.Decimal):
             return str(obj)
-        return pretty_repr(obj, max_width=300, indent_size=4, expand_all=True)
+        with phase('repr'):
+            return pretty_repr(obj, max_width=300, indent_size=4, expand_all=True)
 
     def _choices_repr(self, choices):
-        if flatchoices := self.field.flatchoices:
-            flatchoices = dict(flatchoices)
+        flatchoices = self._flatchoices
+        if flatchoices is None:
+            flatchoices = dict(self.field.flatchoices)
+        if flatchoices:
             if isinstance(choices, (list, tuple)):
                 choices_repr = []
                 for choice in choices:
@@ -147,7 +378,14 @@ class CompareObject:
             except ObjectDoesNotExist:
                 return None
 
-    def get_reverse_foreign_key(self) -> ManyToSomethingResult:
+    def get_reverse_foreign_key_target(self):
+        """
+        Returns (target ids, related model) of a reverse relation or None.
+        The ids are collected from the live relations, so cache the result.
+        """
+        if self._reverse_foreign_key_target is not None:
+            return self._reverse_foreign_key_target or None
+
         obj = self.get_object_version().object
         if self.field.related_name and hasattr(obj, self.field.related_name):
             if isinstance(self.field, models.fields.related.OneToOneRel):
@@ -156,41 +394,96 @@ class CompareObject:
                 except ObjectDoesNotExist:
                     ids = set()
             else:
-                # If there is a _ptr this is a multi-inheritance table and inherits from a non-abstract class
-                ids = {force_str(v.pk) for v in getattr(obj, force_str(self.field.related_name)).all()}
-                if not ids and any(f.name.endswith("_ptr") for f in obj._meta.get_fields()):
-                    # If there is a _ptr this is a multi-inheritance table and inherits from a non-abstract class
-                    # lets try and get the parent items associated entries for this field
-                    others = self.version_record.revision.version_set.filter(
-                        object_id=self.version_record.object_id
-                    ).all()
-                    for p in others:
-                        p_obj = p._object_version.object
-                        if not isinstance(p_obj, type(obj)) and hasattr(p_obj, force_str(self.field.related_name)):
-                            ids = {force_str(v.pk) for v in getattr(p_obj, force_str(self.field.related_name)).all()}
+                related_manager = getattr(obj, force_str(self.field.related_name))
+                ids = set(map(force_str, related_manager.values_list('pk', flat=True)))
+                if not ids:
+                    ids = self._get_parent_reverse_foreign_key_ids(obj)
         else:
-            return ManyToSomethingResult()
+            self._reverse_foreign_key_target = ()
+            return None
 
         # Get the related model of the current field:
         related_model = self.field.field.model
+        self._reverse_foreign_key_target = (ids, related_model)
+        return self._reverse_foreign_key_target
+
+    def _get_parent_reverse_foreign_key_ids(self, obj) -> set:
+        """
+        Multi-table inheritance: Use the relation of the parent object, if the parent is in the same revision.
+        """
+        related_name = force_str(self.field.related_name)
+        for parent_model in get_parent_models(type(obj)):
+            if not hasattr(parent_model, related_name):
+                continue
+            content_type = ContentType.objects.get_for_model(parent_model, for_concrete_model=False)
+            parent_in_revision = Version.objects.filter(
+                revision_id=self.version_record.revision_id,
+                content_type=content_type,
+                object_id=self.version_record.object_id,
+            ).exists()
+            if parent_in_revision:
+                # The parent has the same primary key, so no need to deserialize the parent version:
+                parent_obj = parent_model(pk=obj.pk)
+                return set(map(force_str, getattr(parent_obj, related_name).values_list('pk', flat=True)))
+        return set()
+
+    def get_reverse_foreign_key(self) -> ManyToSomethingResult:
+        target = self.get_reverse_foreign_key_target()
+        if target is None:
+            return ManyToSomethingResult()
+
+        ids, related_model = target
         return self.get_many_to_something(ids, related_model, is_reverse=True)
 
-    def get_many_to_many(self) -> ManyToSomethingResult:
+    def get_many_to_many_target(self):
         """
-        returns a queryset with all many2many objects
+        Returns (target ids, related model) of a many-to-many field or None.
         """
         if self.field.get_internal_type() != 'ManyToManyField' or self.value is DOES_NOT_EXIST:  # FIXME!
-            return ManyToSomethingResult()
+            return None
 
         try:
             ids = frozenset(map(force_str, self.value))
         except TypeError:
             # catch errors e.g. produced by taggit's TaggableManager
             logger.exception("Can't collect m2m ids")
-            return ManyToSomethingResult()
+            return None
 
         # Get the related model of the current field:
-        return self.get_many_to_something(ids, self.field.related_model)
+        return ids, self.field.related_model
+
+    def get_many_to_many(self) -> ManyToSomethingResult:
+        """
+        returns a queryset with all many2many objects
+        """
+        target = self.get_many_to_many_target()
+        if target is None:
+            return ManyToSomethingResult()
+
+        ids, related_model = target
+        return self.get_many_to_something(ids, related_model)
+
+    def collect_prefetch(self, is_reversed: bool) -> None:
+        """
+        Register the target ids of this relation field in the shared prefetch.
+        """
+        if self.prefetch is None:
+            return
+
+        if is_reversed:
+            target = self.get_reverse_foreign_key_target()
+        else:
+            target = self.get_many_to_many_target()
+
+        if target is not None:
+            ids, related_model = target
+            if use_digests(ids):
+                # Huge relation: The versions are not loaded, see: CompareObjects.get_digest_m2s_change_info()
+                return
+            if ids and is_registered(related_model):
+                self.prefetch.add(ContentType.objects.get_for_model(related_model), ids)
+            if is_reversed and is_registered(related_model):
+                self.prefetch.add_deleted_model(related_model)
 
     def get_many_to_something(self, target_ids, related_model, is_reverse=False) -> ManyToSomethingResult:
         if not is_registered(related_model):
@@ -202,13 +495,16 @@ class CompareObject:
         # A group of related object versions.
         old_revision = self.version_record.revision
 
-        # Get a queryset with all related objects.
-        versions = {
-            ver.object_id: ver
-            for ver in old_revision.version_set.filter(
-                content_type=ContentType.objects.get_for_model(related_model), object_id__in=target_ids
-            ).all()
-        }
+        content_type = ContentType.objects.get_for_model(related_model)
+        versions = None
+        if self.prefetch is not None:
+            versions = self.prefetch.get_versions(content_type, target_ids)
+        if versions is None:
+            # Get all related versions, with chunked "IN" lists:
+            versions = {}
+            for chunk in chunked(target_ids):
+                queryset = with_digests(old_revision.version_set.filter(content_type=content_type, object_id__in=chunk))
+                versions.update((ver.object_id, ver) for ver in queryset)
 
         missing_objects_dict = {}
         deleted = []
@@ -222,23 +518,22 @@ class CompareObject:
             #     f"target: {target_ids} - actual: {versions} - missing: {potentially_missing_ids}"
             # )
             if potentially_missing_ids:
-                missing_objects_dict = {
-                    force_str(rel.pk): rel
-                    for rel in related_model.objects.filter(pk__in=potentially_missing_ids).iterator()
-                    if is_registered(rel.__class__) or not self.ignore_not_registered
-                }
+                missing_objects = related_model.objects.filter(pk__in=potentially_missing_ids)
+                if is_reverse:
+                    # Only the ids are needed, the versions will be loaded below
+                    missing_objects_dict = {force_str(pk): None for pk in missing_objects.values_list('pk', flat=True)}
+                else:
+                    missing_objects_dict = {force_str(rel.pk): rel for rel in missing_objects.iterator()}
 
         if is_reverse:
-            missing_objects_dict = {
-                ver.object_id: ver
-                for o in missing_objects_dict.values()
-                for ver in Version.objects.get_for_object(o)
-                if ver.revision.date_created < old_revision.date_created
-            }
+            missing_objects_dict = get_latest_versions_before(related_model, missing_objects_dict.keys(), old_revision)
 
             if is_registered(related_model) or not self.ignore_not_registered:
-                # shift query to database
-                deleted = list(Version.objects.filter(revision=old_revision).get_deleted(related_model))
+                deleted = None
+                if self.prefetch is not None:
+                    deleted = self.prefetch.get_deleted(content_type)
+                if deleted is None:
+                    deleted = get_deleted_versions(old_revision, [related_model])[content_type.pk]
             else:
                 deleted = []
 
@@ -298,38 +593,72 @@ class CompareObjects:
         version1: Version,
         version2: Version,
         is_reversed: bool,
+        prefetch1: RelatedVersionsPrefetch | None = None,
+        prefetch2: RelatedVersionsPrefetch | None = None,
+        plan: FieldPlan | None = None,
     ):
         self.field = field
         self.field_name = field_name
         self.internal_type = field.get_internal_type()
         self.obj = obj
-
-        # is a related field (ForeignKey, ManyToManyField etc.)
-        self.is_related = getattr(self.field, 'related_model', None) is not None
         self.is_reversed = is_reversed
-        if not self.is_related:
-            self.follow = None
-        elif self.field_name in _get_options(self.obj.__class__).follow:
-            self.follow = True
+        self.plan = plan
+
+        if plan is not None:
+            # Use the precompiled information of the compare plan
+            self.is_related = plan.is_related
+            self.follow = plan.follow
+            compare_foreign_objects_as_id = plan.compare_foreign_objects_as_id
+            ignore_not_registered = plan.ignore_not_registered
+            flatchoices = plan.flatchoices
         else:
-            self.follow = False
+            # is a related field (ForeignKey, ManyToManyField etc.)
+            self.is_related = getattr(self.field, 'related_model', None) is not None
+            if not self.is_related:
+                self.follow = None
+            elif self.field_name in _get_options(self.obj.__class__).follow:
+                self.follow = True
+            else:
+                self.follow = False
 
-        compare_foreign_objects_as_id = getattr(settings, 'REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID', False)
-        ignore_not_registered = getattr(settings, 'REVERSION_COMPARE_IGNORE_NOT_REGISTERED', False)
+            compare_foreign_objects_as_id = getattr(settings, 'REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID', False)
+            ignore_not_registered = getattr(settings, 'REVERSION_COMPARE_IGNORE_NOT_REGISTERED', False)
+            flatchoices = None
 
         self.compare_obj1 = CompareObject(
-            field, field_name, obj, version1, self.follow, compare_foreign_objects_as_id, ignore_not_registered
+            field,
+            field_name,
+            obj,
+            version1,
+            self.follow,
+            compare_foreign_objects_as_id,
+            ignore_not_registered,
+            prefetch=prefetch1,
+            flatchoices=flatchoices,
         )
         self.compare_obj2 = CompareObject(
-            field, field_name, obj, version2, self.follow, compare_foreign_objects_as_id, ignore_not_registered
+            field,
+            field_name,
+            obj,
+            version2,
+            self.follow,
+            compare_foreign_objects_as_id,
+            ignore_not_registered,
+            prefetch=prefetch2,
+            flatchoices=flatchoices,
         )
 
-        self.value1 = self.compare_obj1.value
-        self.value2 = self.compare_obj2.value
-
         self.M2O_CHANGE_INFO = None
         self.M2M_CHANGE_INFO = None
 
+    @property
+    def value1(self):
+        return self.compare_obj1.value
+
+    @property
+    def value2(self):
+        return self.compare_obj2.value
+
     def changed(self):
         """ return True if at least one field has changed values. """
 
@@ -354,6 +683,12 @@ class CompareObjects:
 
         return self.compare_obj1 != self.compare_obj2
 
+    def collect_prefetch(self):
+        """ register the relation target ids of both versions in their prefetch """
+        if self.internal_type == 'ManyToManyField' or self.is_reversed:
+            self.compare_obj1.collect_prefetch(self.is_reversed)
+            self.compare_obj2.collect_prefetch(self.is_reversed)
+
     def to_string(self):
         return self.compare_obj1.to_string(), self.compare_obj2.to_string()
 
@@ -370,20 +705,128 @@ class CompareObjects:
         if self.M2O_CHANGE_INFO is not None:
             return self.M2O_CHANGE_INFO
 
-        m2o_data1, m2o_data2 = self.get_reverse_foreign_key()
-
-        self.M2O_CHANGE_INFO = self.get_m2s_change_info(m2o_data1, m2o_data2)
+        digest_targets = self._get_digest_targets(
+            self.compare_obj1.get_reverse_foreign_key_target(),
+            self.compare_obj2.get_reverse_foreign_key_target(),
+        )
+        if digest_targets is not None:
+            self.M2O_CHANGE_INFO = self.get_digest_m2s_change_info(*digest_targets, is_reverse=True)
+        else:
+            m2o_data1, m2o_data2 = self.get_reverse_foreign_key()
+            self.M2O_CHANGE_INFO = self.get_m2s_change_info(m2o_data1, m2o_data2)
         return self.M2O_CHANGE_INFO
 
     def get_m2m_change_info(self):
         if self.M2M_CHANGE_INFO is not None:
             return self.M2M_CHANGE_INFO
 
-        m2m_data1, m2m_data2 = self.get_many_to_many()
-
-        self.M2M_CHANGE_INFO = self.get_m2s_change_info(m2m_data1, m2m_data2)
+        digest_targets = self._get_digest_targets(
+            self.compare_obj1.get_many_to_many_target(),
+            self.compare_obj2.get_many_to_many_target(),
+        )
+        if digest_targets is not None:
+            self.M2M_CHANGE_INFO = self.get_digest_m2s_change_info(*digest_targets, is_reverse=False)
+        else:
+            m2m_data1, m2m_data2 = self.get_many_to_many()
+            self.M2M_CHANGE_INFO = self.get_m2s_change_info(m2m_data1, m2m_data2)
         return self.M2M_CHANGE_INFO
 
+    def _get_digest_targets(self, target1, target2):
+        """
+        Returns (ids1, ids2, related model) if the relation is too big to compare the versions, otherwise None.
+        """
+        if target1 is None and target2 is None:
+            return None
+        related_model = (target1 or target2)[1]
+        if not is_registered(related_model):
+            return None
+
+        ids1 = target1[0] if target1 is not None else frozenset()
+        ids2 = target2[0] if target2 is not None else frozenset()
+        if not use_digests(ids1, ids2):
+            return None
+        return ids1, ids2, related_model
+
+    def get_digest_m2s_change_info(self, ids1, ids2, related_model, is_reverse):
+        """
+        Memory bounded version of get_many_to_something() + get_m2s_change_info() for huge relations:
+        Compare digests of the versions and load only the first items of every category,
+        see: reversion_compare.set_diff
+        The number of not loaded items of every category is stored in "more".
+        """
+        revision1 = self.compare_obj1.version_record.revision
+        revision2 = self.compare_obj2.version_record.revision
+        content_type = ContentType.objects.get_for_model(related_model)
+
+        with phase('digests'):
+            digests1 = get_version_digests(revision1, content_type, ids1)
+            digests2 = get_version_digests(revision2, content_type, ids2)
+
+            missing_ids1 = missing_ids2 = set()
+            if not self.follow:
+                # Try to fill missing related objects, see: CompareObject.get_many_to_something()
+                missing_ids1 = get_existing_ids(related_model, ids1 - digests1.keys())
+                missing_ids2 = get_existing_ids(related_model, ids2 - digests2.keys())
+                if is_reverse:
+                    # Only the objects with a previous version are displayed:
+                    missing_ids1 = get_ids_with_versions_before(related_model, missing_ids1, revision1)
+                    missing_ids2 = get_ids_with_versions_before(related_model, missing_ids2, revision2)
+
+            set_diff = diff_digests(digests1, digests2, missing_ids1, missing_ids2)
+
+        page_size = get_relation_page_size()
+        pages = {
+            field.name: first_ids(getattr(set_diff, field.name), page_size) for field in dataclasses.fields(set_diff)
+        }
+        more = {name: len(getattr(set_diff, name)) - len(page) for name, page in pages.items()}
+
+        versions1 = get_versions(
+            revision1, content_type, pages['changed_items'] + pages['removed_items'] + pages['same_items']
+        )
+        versions2 = get_versions(revision2, content_type, pages['changed_items'] + pages['added_items'])
+
+        missing_page_ids = (
+            pages['same_missing_objects'] + pages['removed_missing_objects'] + pages['added_missing_objects']
+        )
+        if is_reverse:
+            missing1 = get_latest_versions_before(related_model, missing_page_ids, revision1)
+            missing2 = get_latest_versions_before(related_model, missing_page_ids, revision2)
+
+            deleted_pks = get_deleted_version_pks(revision1, [related_model])[content_type.pk]
+            deleted = []
+            for chunk in chunked(deleted_pks[:page_size]):
+                deleted.extend(Version.objects.filter(pk__in=chunk))
+            more['deleted_items'] = len(deleted_pks) - len(deleted)
+        else:
+            missing1 = missing2 = get_objects(related_model, missing_page_ids)
+            deleted = []
+            more['deleted_items'] = 0
+
+        def sorted_items(items):
+            return sorted((item for item in items if item is not None), key=force_str)
+
+        return {
+            "changed_items": [
+                (versions1[object_id], versions2[object_id])
+                for object_id in pages['changed_items']
+                if object_id in versions1 and object_id in versions2
+            ],
+            "removed_items": sorted_items(versions1.get(object_id) for object_id in pages['removed_items']),
+            "added_items": sorted_items(versions2.get(object_id) for object_id in pages['added_items']),
+            "same_items": sorted_items(versions1.get(object_id) for object_id in pages['same_items']),
+            "same_missing_objects": sorted_items(
+                missing1.get(object_id) or missing2.get(object_id) for object_id in pages['same_missing_objects']
+            ),
+            "removed_missing_objects": sorted_items(
+                missing1.get(object_id) for object_id in pages['removed_missing_objects']
+            ),
+            "added_missing_objects": sorted_items(
+                missing2.get(object_id) for object_id in pages['added_missing_objects']
+            ),
+            "deleted_items": sorted_items(deleted),
+            "more": more,
+        }
+
     # Abstract Many-to-Something (either -many or -one) as both
     # many2many and many2one relationships looks the same from the referred object.
     def get_m2s_change_info(self, obj1_data, obj2_data):
@@ -429,7 +872,7 @@ class CompareObjects:
 
             if version1 is not None and version2 is not None:
                 # In both -> version changed or the same
-                if version1.serialized_data == version2.serialized_data:
+                if same_version_data(version1, version2):
                     # logger.debug("same item: %s", version1)
                     same_items.append(version1)
                 else:
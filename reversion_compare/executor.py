@@ -0,0 +1,173 @@
+"""
+    executor
+    ~~~~~~~~
+
+    Bounded thread pool for the async views: The compare (deserialization, relation
+    lookups and the CPU bound diff creation) runs in this pool, so the event loop
+    never blocks and the number of parallel compares is limited. Change the number
+    of threads in settings, e.g.:
+
+        REVERSION_COMPARE_ASYNC_WORKERS = 4
+
+    With 0 the compare runs via Django's default sync_to_async() thread.
+
+    The diff executor generates the diffs of big field values in parallel, see
+    helpers.ParallelDiffs. It's a own pool, so that a compare in the compare pool
+    never waits for a diff, that can't start. Disabled by default, activate e.g.:
+
+        REVERSION_COMPARE_DIFF_WORKERS = 4
+
+    diff-match-patch is pure Python, so a process pool is used, except on free-threaded
+    builds. The workers are always started via "spawn": Forking a multi-threaded server
+    process is unsafe. They call django.setup() with the DJANGO_SETTINGS_MODULE.
+    Only the built-in diff engines are used in the workers, the diffs of engines added
+    via register_diff_engine() are generated inline.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+
+
+# Default number of threads for the compare in async views:
+ASYNC_WORKERS = 4
+
+# Default number of workers for the parallel diffs (0 == disabled):
+DIFF_WORKERS = 0
+
+# Default diff executor type: "auto" (thread pool on free-threaded builds, else process pool), "process" or "thread"
+DIFF_EXECUTOR = 'auto'
+
+# Default min. size (characters of both values) of a diff, that will be generated in parallel:
+DIFF_PARALLEL_MIN_SIZE = 50_000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_diff_executor = None
+_diff_executor_lock = threading.Lock()
+
+
+def get_async_workers() -> int:
+    return getattr(settings, 'REVERSION_COMPARE_ASYNC_WORKERS', ASYNC_WORKERS)
+
+
+def get_compare_executor() -> ThreadPoolExecutor | None:
+    """
+    Returns the shared compare executor or None if disabled via settings.REVERSION_COMPARE_ASYNC_WORKERS = 0
+    """
+    global _executor
+
+    max_workers = get_async_workers()
+    if not max_workers:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='reversion_compare')
+        return _executor
+
+
+def _call_in_executor(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # The threads are not request bound, so clean up the connections like at the end of a request:
+        close_old_connections()
+
+
+async def run_in_compare_executor(func, *args, **kwargs):
+    """
+    Run the sync function in the compare executor and return the result.
+    Context variables (e.g. the diff engine) are passed to the thread.
+    """
+    executor = get_compare_executor()
+    if executor is None:
+        return await sync_to_async(func)(*args, **kwargs)
+    return await sync_to_async(_call_in_executor, thread_sensitive=False, executor=executor)(func, *args, **kwargs)
+
+
+def shutdown_compare_executor() -> None:
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def get_diff_workers() -> int:
+    return getattr(settings, 'REVERSION_COMPARE_DIFF_WORKERS', DIFF_WORKERS)
+
+
+def get_diff_parallel_min_size() -> int:
+    return getattr(settings, 'REVERSION_COMPARE_DIFF_PARALLEL_MIN_SIZE', DIFF_PARALLEL_MIN_SIZE)
+
+
+def get_diff_executor_type() -> str:
+    executor_type = getattr(settings, 'REVERSION_COMPARE_DIFF_EXECUTOR', DIFF_EXECUTOR)
+    if executor_type == 'auto':
+        gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+        return 'process' if gil_enabled else 'thread'
+    if executor_type not in ('process', 'thread'):
+        raise ValueError(f'Unknown diff executor {executor_type!r}, choices are: auto, process, thread')
+    return executor_type
+
+
+def _init_diff_worker():
+    if not apps.ready:
+        django.setup()
+
+
+def get_diff_executor() -> Executor | None:
+    """
+    Returns the shared diff executor or None if disabled via settings.REVERSION_COMPARE_DIFF_WORKERS = 0
+    """
+    global _diff_executor
+
+    max_workers = get_diff_workers()
+    if not max_workers:
+        return None
+
+    with _diff_executor_lock:
+        if _diff_executor is None:
+            if get_diff_executor_type() == 'process':
+                _diff_executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_diff_worker,
+                )
+            else:
+                _diff_executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix='reversion_compare_diff'
+                )
+        return _diff_executor
+
+
+def shutdown_diff_executor() -> None:
+    global _diff_executor
+
+    with _diff_executor_lock:
+        if _diff_executor is not None:
+            _diff_executor.shutdown(wait=False, cancel_futures=True)
+            _diff_executor = None
+
+
+@receiver(setting_changed)
+def shutdown_executor_on_setting_changed(*, setting, **kwargs):
+    if setting == 'REVERSION_COMPARE_ASYNC_WORKERS':
+        shutdown_compare_executor()
+    elif setting in ('REVERSION_COMPARE_DIFF_WORKERS', 'REVERSION_COMPARE_DIFF_EXECUTOR'):
+        shutdown_diff_executor()
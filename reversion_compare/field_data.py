@@ -0,0 +1,117 @@
+"""
+    field_data
+    ~~~~~~~~~~
+
+    Fast access to the field values of a Version.
+
+    django-reversion's Version.field_dict runs the complete Django deserializer:
+    It creates a model instance and resolves all relations. For the compare of
+    non-relational fields this is not needed: The values are taken directly from
+    the serialized JSON data. The model instance is only created if a relation
+    field really needs it.
+
+    The JSON decoder can be changed in settings, e.g.:
+
+        REVERSION_COMPARE_JSON_DECODER = 'orjson.loads'
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext
+from reversion import RevertError
+from reversion.models import Version
+
+
+# Dotted path to a function that decodes the serialized data of a version:
+JSON_DECODER = 'json.loads'
+
+
+def get_json_decoder():
+    return import_string(getattr(settings, 'REVERSION_COMPARE_JSON_DECODER', JSON_DECODER))
+
+
+def is_plain_field(model, field) -> bool:
+    """
+    Is the field value stored unchanged on the model instance?
+    Relation fields and fields with own descriptors (e.g. FileField) are not.
+    """
+    if field.is_relation or not field.concrete:
+        return False
+    return type(getattr(model, field.attname, None)) is DeferredAttribute
+
+
+class VersionFieldData:
+    """
+    The field values of one Version, parsed once from the serialized data.
+    Values of non-plain fields are read from Version.field_dict, which deserializes the version.
+    """
+
+    def __init__(self, version: Version):
+        self.version = version
+        self.model = version._model
+        self.values = self._load()  # {attname: value} of all plain fields or None
+
+    def _load(self) -> dict | None:
+        if self.version.format != 'json' or self.model is None:
+            return None
+
+        opts = self.model._meta
+        values = {}
+        try:
+            data = get_json_decoder()(self.version.serialized_data)
+            if len(data) != 1:
+                return None
+            data = data[0]
+
+            if 'pk' in data and is_plain_field(self.model, opts.pk):
+                values[opts.pk.attname] = opts.pk.to_python(data['pk'])
+
+            for field_name, raw_value in data['fields'].items():
+                try:
+                    field = opts.get_field(field_name)
+                except FieldDoesNotExist:
+                    continue  # The field was removed from the model
+                if field.model is opts.concrete_model and is_plain_field(self.model, field):
+                    values[field.attname] = field.to_python(raw_value)
+        except Exception as err:
+            # Raise the same error as django-reversion on deserialization errors:
+            raise RevertError(
+                gettext('Could not load %(object_repr)s version - incompatible version data.')
+                % {'object_repr': self.version.object_repr}
+            ) from err
+        return values
+
+    def get(self, name, default=None):
+        """
+        Returns the value of the field (attname) like Version.field_dict.get()
+        """
+        if self.values is not None and name in self.values:
+            return self.values[name]
+        return self.version.field_dict.get(name, default)
+
+
+def get_unchanged_fields(field_data1: VersionFieldData, field_data2: VersionFieldData) -> set:
+    """
+    Returns the attnames of all plain fields with the same value in both versions.
+    All other fields must be compared with CompareObjects.
+    """
+    values1, values2 = field_data1.values, field_data2.values
+    if values1 is None or values2 is None:
+        return set()
+    return {name for name, value in values1.items() if name in values2 and values2[name] == value}
+
+
+def get_field_data(version: Version) -> VersionFieldData:
+    """
+    Returns the VersionFieldData of the version, it's cached on the Version instance.
+    """
+    try:
+        return version._compare_field_data
+    except AttributeError:
+        version._compare_field_data = field_data = VersionFieldData(version)
+        return field_data
@@ -15,15 +15,29 @@
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
 
+import contextlib
+import contextvars
+import dataclasses
 import difflib
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 from diff_match_patch import diff_match_patch
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.admin.sites import NotRegistered
+from django.core.cache import caches
+from django.template.defaultfilters import filesizeformat
 from django.utils.encoding import force_str
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
+from django.utils.translation import gettext as _
+
+from reversion_compare.timing import phase
 
 
 logger = logging.getLogger(__name__)
@@ -35,9 +49,211 @@ EFFICIENCY = 2
 # Change from diff-match-patch to ndiff if old/new values are less than X characters:
 CHANGE_DIFF_THRESHOLD = 20
 
+# Default diff engine, see DIFF_ENGINES and html_diff():
+DIFF_ENGINE = 'auto'
+
+# SequenceMatcher engine: Refine changed lines at character level only up to this size:
+SEQUENCE_MATCHER_REFINE_SIZE = 10_000
+
+# Histogram engine: Ignore lines that occur more often than this in the old value:
+HISTOGRAM_MAX_CHAIN = 64
+
+
+# Default number of rendered diffs that will be memorized in process by html_diff():
+DIFF_MEMO_SIZE = 256
+
+# Default max. characters of all rendered diffs, that will be memorized in process (0 == no limit):
+DIFF_MEMO_MAX_LENGTH = 10_000_000
+
+
+# Default limits for the diff generation, see DiffBudget and html_diff():
+DIFF_MAX_SIZE = 1_000_000  # Max. characters of one value, bigger values are not diffed
+DIFF_TIMEOUT = 1.0  # Seconds for one diff (0 == no limit)
+DIFF_TIME_BUDGET = 10.0  # Seconds for all diffs of one compare (0 == no limit)
+
+
+_current_diff_budget = contextvars.ContextVar('reversion_compare_diff_budget', default=None)
+_current_diff_engine = contextvars.ContextVar('reversion_compare_diff_engine', default=None)
+_current_parallel_diffs = contextvars.ContextVar('reversion_compare_parallel_diffs', default=None)
+
+
+class DiffBudget:
+    """
+    Time budget for all diffs of one compare, set via settings.REVERSION_COMPARE_DIFF_TIME_BUDGET
+
+    html_diff() uses the budget, that is activated in the current context.
+    If the budget is exceeded, the diffs will be degraded and marked as truncated.
+    """
+
+    def __init__(self, seconds=None):
+        if seconds is None:
+            seconds = getattr(settings, 'REVERSION_COMPARE_DIFF_TIME_BUDGET', DIFF_TIME_BUDGET)
+        self.deadline = time.monotonic() + seconds if seconds else None
+        self.truncated = False
+
+    def remaining(self) -> float | None:
+        if self.deadline is not None:
+            return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @contextlib.contextmanager
+    def activate(self):
+        """
+        Use this budget for all html_diff() calls in the block.
+        The truncated flag will be reset, so it's only set if a diff in this block was truncated.
+        """
+        self.truncated = False
+        token = _current_diff_budget.set(self)
+        try:
+            yield self
+        finally:
+            _current_diff_budget.reset(token)
 
-# https://github.com/google/diff-match-patch
-dmp = diff_match_patch()
+
+def get_diff_budget() -> DiffBudget | None:
+    return _current_diff_budget.get()
+
+
+def get_diff_timeout() -> float:
+    """
+    Returns the diff-match-patch Diff_Timeout: settings.REVERSION_COMPARE_DIFF_TIMEOUT
+    limited by the remaining time of the current DiffBudget. (0 == no limit)
+    """
+    timeout = getattr(settings, 'REVERSION_COMPARE_DIFF_TIMEOUT', DIFF_TIMEOUT)
+    budget = get_diff_budget()
+    if budget is not None and (remaining := budget.remaining()) is not None:
+        timeout = min(timeout, remaining) if timeout else remaining
+    return timeout
+
+
+@dataclasses.dataclass
+class DiffMemoInfo:
+    hits: int  # Found in process
+    cache_hits: int  # Found in the Django cache tier
+    misses: int  # Not found -> diff was generated
+    size: int  # Current number of in process entries
+    maxsize: int
+
+
+class DiffMemo:
+    """
+    Bounded LRU memo of the rendered html_diff() results, keyed on a hash of the values.
+
+    Optional second tier: A Django cache, set via settings.REVERSION_COMPARE_DIFF_MEMO_CACHE
+    The in process size can be changed via settings.REVERSION_COMPARE_DIFF_MEMO_SIZE (0 == disabled)
+    and the characters of all in process entries via settings.REVERSION_COMPARE_DIFF_MEMO_MAX_LENGTH
+    A diff, that is bigger than this limit, is not memorized in process.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._length = 0  # Characters of all entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.cache_hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return getattr(settings, 'REVERSION_COMPARE_DIFF_MEMO_SIZE', DIFF_MEMO_SIZE)
+
+    @property
+    def max_length(self) -> int:
+        return getattr(settings, 'REVERSION_COMPARE_DIFF_MEMO_MAX_LENGTH', DIFF_MEMO_MAX_LENGTH)
+
+    @property
+    def length(self) -> int:
+        """
+        Characters of all in process entries.
+        """
+        with self._lock:
+            return self._length
+
+    @property
+    def cache(self):
+        alias = getattr(settings, 'REVERSION_COMPARE_DIFF_MEMO_CACHE', None)
+        if alias:
+            return caches[alias]
+
+    @staticmethod
+    def make_key(value1: str, value2: str, cleanup, engine: str) -> str:
+        hash_obj = hashlib.sha256()
+        for part in (engine, repr(cleanup), value1, value2):
+            data = part.encode('utf-8', errors='surrogatepass')
+            # Add the length, so that the parts can't be shifted to the same key:
+            hash_obj.update(len(data).to_bytes(8, 'big'))
+            hash_obj.update(data)
+        return hash_obj.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+
+        if cache := self.cache:
+            html = cache.get(f'reversion_compare:diff:{key}')
+            if html is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                self._store(key, html)
+                return html
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        """
+        In process entry exists? Doesn't change the LRU order and the counters.
+        """
+        with self._lock:
+            return key in self._entries
+
+    def set(self, key: str, html: str) -> None:
+        self._store(key, html)
+        if cache := self.cache:
+            cache.set(f'reversion_compare:diff:{key}', html)
+
+    def _store(self, key: str, html: str) -> None:
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+        max_length = self.max_length
+        if max_length and len(html) > max_length:
+            return
+        with self._lock:
+            if (old_html := self._entries.pop(key, None)) is not None:
+                self._length -= len(old_html)
+            self._entries[key] = html
+            self._length += len(html)
+            while len(self._entries) > maxsize or (max_length and self._length > max_length):
+                __, removed_html = self._entries.popitem(last=False)
+                self._length -= len(removed_html)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._length = 0
+            self.hits = self.cache_hits = self.misses = 0
+
+    def info(self) -> DiffMemoInfo:
+        with self._lock:
+            return DiffMemoInfo(
+                hits=self.hits,
+                cache_hits=self.cache_hits,
+                misses=self.misses,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+
+diff_memo = DiffMemo()
 
 
 def highlight_diff(diff_text):
@@ -140,51 +356,499 @@ def diff_match_patch_pretty_html(diff):
     return "".join(html)
 
 
-def generate_dmp_diff(value1, value2, cleanup=SEMANTIC):
+def _merge_ops(ops):
     """
-    Generate the diff with Google diff-match-patch
+    Join successive diff operations of the same type.
+    """
+    result = []
+    for op, data in ops:
+        if not data:
+            continue
+        if result and result[-1][0] == op:
+            result[-1] = (op, result[-1][1] + data)
+        else:
+            result.append((op, data))
+    return result
+
+
+def dmp_char_diff(value1, value2, timeout=DIFF_TIMEOUT):
+    """
+    Character level diff with Google diff-match-patch
     """
-    diff = dmp.diff_main(
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = timeout
+    return dmp.diff_main(
         value1, value2,
         checklines=True  # run a line-level diff first to identify the changed areas
     )
-    if cleanup == SEMANTIC:
-        dmp.diff_cleanupSemantic(diff)
-    elif cleanup == EFFICIENCY:
-        dmp.diff_cleanupEfficiency(diff)
-    elif cleanup is not None:
-        raise ValueError("cleanup parameter should be one of SEMANTIC, EFFICIENCY or None.")
 
-    html = diff_match_patch_pretty_html(diff)
 
-    return html
+def dmp_line_diff(value1, value2, timeout=DIFF_TIMEOUT):
+    """
+    Line-level only diff with Google diff-match-patch
+    """
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = timeout
+    chars1, chars2, line_array = dmp.diff_linesToChars(value1, value2)
+    diff = dmp.diff_main(chars1, chars2, checklines=False)
+    dmp.diff_charsToLines(diff, line_array)
+    return diff
+
+
+def _get_deadline(timeout) -> float | None:
+    if timeout:
+        return time.monotonic() + timeout
+
+
+def _out_of_time(deadline) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def sequence_matcher_diff(value1, value2, timeout=DIFF_TIMEOUT):
+    """
+    Line diff with difflib.SequenceMatcher (with the "autojunk" heuristic),
+    changed lines are refined at character level.
+    If the timeout is reached, the remaining changed lines will not be refined.
+    """
+    deadline = _get_deadline(timeout)
+    lines1 = value1.splitlines(keepends=True)
+    lines2 = value2.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, lines1, lines2, autojunk=True)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        text1 = ''.join(lines1[i1:i2])
+        text2 = ''.join(lines2[j1:j2])
+        if tag == 'equal':
+            ops.append((diff_match_patch.DIFF_EQUAL, text1))
+        elif (
+            tag == 'replace'
+            and max(len(text1), len(text2)) <= SEQUENCE_MATCHER_REFINE_SIZE
+            and not _out_of_time(deadline)
+        ):
+            char_matcher = difflib.SequenceMatcher(None, text1, text2, autojunk=True)
+            for char_tag, k1, k2, m1, m2 in char_matcher.get_opcodes():
+                if char_tag == 'equal':
+                    ops.append((diff_match_patch.DIFF_EQUAL, text1[k1:k2]))
+                else:
+                    ops.extend(
+                        ((diff_match_patch.DIFF_DELETE, text1[k1:k2]), (diff_match_patch.DIFF_INSERT, text2[m1:m2]))
+                    )
+        else:
+            ops.extend(((diff_match_patch.DIFF_DELETE, text1), (diff_match_patch.DIFF_INSERT, text2)))
+    return _merge_ops(ops)
+
+
+def histogram_diff(value1, value2, timeout=DIFF_TIMEOUT):
+    """
+    Line diff similar to the "histogram" diff of git: A extension of the "patience" diff,
+    that split the values at the longest common region around the rarest common line.
+    Results in readable diffs of source code like values.
+    If the timeout is reached, the remaining regions will be shown as deleted and inserted.
+    """
+    deadline = _get_deadline(timeout)
+    lines1 = value1.splitlines(keepends=True)
+    lines2 = value2.splitlines(keepends=True)
+    ops = []
+
+    # Process the regions in order: (start1, end1, start2, end2) or a finished diff operation
+    stack = [(0, len(lines1), 0, len(lines2))]
+    while stack:
+        item = stack.pop()
+        if isinstance(item[1], str):
+            ops.append(item)
+            continue
+
+        start1, end1, start2, end2 = item
+        if _out_of_time(deadline):
+            ops.extend(
+                (
+                    (diff_match_patch.DIFF_DELETE, ''.join(lines1[start1:end1])),
+                    (diff_match_patch.DIFF_INSERT, ''.join(lines2[start2:end2])),
+                )
+            )
+            continue
+
+        while start1 < end1 and start2 < end2 and lines1[start1] == lines2[start2]:
+            ops.append((diff_match_patch.DIFF_EQUAL, lines1[start1]))
+            start1 += 1
+            start2 += 1
+        suffix = []
+        while start1 < end1 and start2 < end2 and lines1[end1 - 1] == lines2[end2 - 1]:
+            end1 -= 1
+            end2 -= 1
+            suffix.append((diff_match_patch.DIFF_EQUAL, lines1[end1]))
+        stack.extend(suffix)
+
+        occurrences = {}
+        for index in range(start1, end1):
+            occurrences.setdefault(lines1[index], []).append(index)
+
+        best = None  # (occurrence count, -length, start1, start2, length)
+        index2 = start2
+        while index2 < end2 and not _out_of_time(deadline):
+            positions = occurrences.get(lines2[index2])
+            next_index2 = index2 + 1
+            if positions and len(positions) <= HISTOGRAM_MAX_CHAIN:
+                for index1 in positions:
+                    match1, match2 = index1, index2
+                    while match1 > start1 and match2 > start2 and lines1[match1 - 1] == lines2[match2 - 1]:
+                        match1 -= 1
+                        match2 -= 1
+                    length = index1 - match1 + 1
+                    while (
+                        match1 + length < end1
+                        and match2 + length < end2
+                        and lines1[match1 + length] == lines2[match2 + length]
+                    ):
+                        length += 1
+                    candidate = (len(positions), -length, match1, match2, length)
+                    if best is None or candidate < best:
+                        best = candidate
+                    next_index2 = max(next_index2, match2 + length)
+            index2 = next_index2
+
+        # Push in reversed order, because the stack is processed from the end:
+        if best is None:
+            stack.extend(
+                (
+                    (diff_match_patch.DIFF_INSERT, ''.join(lines2[start2:end2])),
+                    (diff_match_patch.DIFF_DELETE, ''.join(lines1[start1:end1])),
+                )
+            )
+        else:
+            __, __, match1, match2, length = best
+            stack.extend(
+                (
+                    (match1 + length, end1, match2 + length, end2),
+                    (diff_match_patch.DIFF_EQUAL, ''.join(lines1[match1 : match1 + length])),
+                    (start1, match1, start2, match2),
+                )
+            )
+
+    return _merge_ops(ops)
+
+
+@dataclasses.dataclass(frozen=True)
+class DiffEngine:
+    func: callable  # (value1, value2, timeout) -> list of diff_match_patch operations, should respect the timeout
+    char_level: bool  # Apply the cleanup on the diff?
+
+
+# All diff engines, that can be selected via settings.REVERSION_COMPARE_DIFF_ENGINE
+# or CompareMixin.diff_engines. Special engines: "ndiff" and "auto" (ndiff for small values, else "dmp")
+DIFF_ENGINES = {
+    'dmp': DiffEngine(func=dmp_char_diff, char_level=True),
+    'dmp-lines': DiffEngine(func=dmp_line_diff, char_level=False),
+    'sequencematcher': DiffEngine(func=sequence_matcher_diff, char_level=True),
+    'histogram': DiffEngine(func=histogram_diff, char_level=False),
+}
+
+# The engines, that exist in every new process, e.g. in the workers of the diff process pool:
+_BUILTIN_DIFF_ENGINES = dict(DIFF_ENGINES)
+
+
+def is_builtin_diff_engine(name) -> bool:
+    """
+    Is the engine not added or replaced via register_diff_engine()?
+    """
+    return name in _BUILTIN_DIFF_ENGINES and DIFF_ENGINES.get(name) is _BUILTIN_DIFF_ENGINES[name]
+
+
+def register_diff_engine(name, func, char_level=False):
+    """
+    Add a own diff engine, e.g.:
+        register_diff_engine('my-engine', my_diff_func)
+    """
+    DIFF_ENGINES[name] = DiffEngine(func=func, char_level=char_level)
+
+
+@contextlib.contextmanager
+def use_diff_engine(name):
+    """
+    Use the given diff engine for all html_diff() calls in the block. (None == use settings)
+    """
+    token = _current_diff_engine.set(name)
+    try:
+        yield
+    finally:
+        _current_diff_engine.reset(token)
 
 
-def generate_ndiff(value1, value2):
-    value1 = value1.splitlines()
-    value2 = value2.splitlines()
-    diff = difflib.ndiff(value1, value2)
+def get_diff_engine_name(value1, value2, engine=None) -> str:
+    """
+    Returns the name of the diff engine to use: The given one, the one activated via use_diff_engine()
+    or settings.REVERSION_COMPARE_DIFF_ENGINE. "auto" will be resolved to "ndiff" or "dmp"
+    """
+    engine = engine or _current_diff_engine.get() or getattr(settings, 'REVERSION_COMPARE_DIFF_ENGINE', DIFF_ENGINE)
+    if engine == 'auto':
+        if len(value1) > CHANGE_DIFF_THRESHOLD or len(value2) > CHANGE_DIFF_THRESHOLD:
+            # Bigger values -> use Google diff-match-patch
+            return 'dmp'
+        # For small content use ndiff
+        return 'ndiff'
+    if engine != 'ndiff' and engine not in DIFF_ENGINES:
+        raise ValueError(f'Unknown diff engine {engine!r}, choices are: auto, ndiff, {", ".join(DIFF_ENGINES)}')
+    return engine
+
+
+def _engine_diff(value1, value2, engine, timeout) -> tuple[list, bool]:
+    """
+    Returns the diff operations of the engine and if the engine finished within the timeout.
+    Only the engine itself is timed, not the cleanup and rendering.
+    """
+    start_time = time.monotonic()
+    diff = DIFF_ENGINES[engine].func(value1, value2, timeout=timeout)
+    return diff, not timeout or time.monotonic() - start_time < timeout
+
+
+def _render_diff(diff, engine, cleanup) -> str:
+    if DIFF_ENGINES[engine].char_level:
+        dmp = diff_match_patch()
+        if cleanup == SEMANTIC:
+            dmp.diff_cleanupSemantic(diff)
+        elif cleanup == EFFICIENCY:
+            dmp.diff_cleanupEfficiency(diff)
+        elif cleanup is not None:
+            raise ValueError("cleanup parameter should be one of SEMANTIC, EFFICIENCY or None.")
+
+    return diff_match_patch_pretty_html(diff)
+
+
+def generate_diff(value1, value2, engine='dmp', cleanup=SEMANTIC, timeout=DIFF_TIMEOUT):
+    """
+    Generate the html diff with one of the DIFF_ENGINES
+    """
+    diff, __ = _engine_diff(value1, value2, engine, timeout)
+    return _render_diff(diff, engine, cleanup)
+
+
+def generate_dmp_diff(value1, value2, cleanup=SEMANTIC, timeout=DIFF_TIMEOUT):
+    """
+    Generate the diff with Google diff-match-patch
+    """
+    return generate_diff(value1, value2, engine='dmp', cleanup=cleanup, timeout=timeout)
+
+
+def generate_dmp_line_diff(value1, value2, timeout=DIFF_TIMEOUT):
+    """
+    Generate a line-level only diff with Google diff-match-patch
+    """
+    return generate_diff(value1, value2, engine='dmp-lines', timeout=timeout)
+
+
+def generate_size_summary(value1, value2):
+    """
+    Last resort, if values can't be diffed within the limits.
+    """
+    size1 = filesizeformat(len(value1.encode('utf-8', errors='replace')))
+    size2 = filesizeformat(len(value2.encode('utf-8', errors='replace')))
+    summary = _('values differ (%(size1)s → %(size2)s)') % {'size1': size1, 'size2': size2}
+    return f'<p class="highlight diff-summary">{escape(summary)}</p>'
+
+
+class _NdiffTimeout(Exception):
+    pass
+
+
+def ndiff_lines(value1, value2, timeout=DIFF_TIMEOUT) -> tuple[list, bool]:
+    """
+    difflib.ndiff() with a timeout: Returns the diff lines and if ndiff finished within the timeout.
+    The slow part of ndiff is the search for similar lines, that calls the character junk
+    function for every line: The deadline is checked there and for every diff line.
+    """
+    deadline = _get_deadline(timeout)
+
+    def charjunk(char):
+        if _out_of_time(deadline):
+            raise _NdiffTimeout
+        return difflib.IS_CHARACTER_JUNK(char)
+
+    lines = []
+    try:
+        for line in difflib.ndiff(value1.splitlines(), value2.splitlines(), charjunk=charjunk):
+            if _out_of_time(deadline):
+                return lines, False
+            lines.append(line)
+    except _NdiffTimeout:
+        return lines, False
+    return lines, True
+
+
+def generate_ndiff(value1, value2, timeout=0):
+    diff, __ = ndiff_lines(value1, value2, timeout=timeout)
     diff_text = "\n".join(diff)
     html = highlight_diff(diff_text)
     return html
 
 
-def html_diff(value1, value2, cleanup=SEMANTIC):
+def _generate_limited_diff(value1, value2, cleanup, engine) -> tuple[str, bool]:
+    """
+    Generate the diff within the size and time limits. Degrade step by step:
+
+        1. the requested diff
+        2. line-level only diff, if diff-match-patch or ndiff runs out of time
+        3. only the sizes of the values, if they are too big or the time budget is exceeded
+
+    Returns the html and if the diff is complete.
+    """
+    max_size = getattr(settings, 'REVERSION_COMPARE_DIFF_MAX_SIZE', DIFF_MAX_SIZE)
+    if max_size and max(len(value1), len(value2)) > max_size:
+        return generate_size_summary(value1, value2), False
+
+    budget = get_diff_budget()
+    if budget is not None and budget.exhausted:
+        return generate_size_summary(value1, value2), False
+
+    if engine == 'ndiff':
+        diff, in_time = ndiff_lines(value1, value2, timeout=get_diff_timeout())
+        if in_time:
+            return highlight_diff('\n'.join(diff)), True
+        # ndiff ran out of time -> use a line-level diff:
+        html, __ = _generate_timed_diff(value1, value2, cleanup, 'dmp-lines', get_timeout=get_diff_timeout)
+        return html or generate_size_summary(value1, value2), False
+
+    html, complete = _generate_timed_diff(value1, value2, cleanup, engine, get_timeout=get_diff_timeout)
+    if html is None:
+        html = generate_size_summary(value1, value2)
+    return html, complete
+
+
+def _generate_timed_diff(value1, value2, cleanup, engine, get_timeout) -> tuple[str | None, bool]:
+    """
+    The time limited part of _generate_limited_diff(): Returns None as html,
+    if only the sizes of the values can be shown.
+    """
+    diff, in_time = _engine_diff(value1, value2, engine, get_timeout())
+    if in_time:
+        return _render_diff(diff, engine, cleanup), True
+    if engine == 'dmp-lines':
+        return None, False
+    if engine != 'dmp':
+        # Keep the finished diff: The other engines degrade themselves, if they run out of time.
+        return _render_diff(diff, engine, cleanup), False
+
+    # diff-match-patch ran out of time and returns a not minimal diff -> use a line-level diff:
+    diff, in_time = _engine_diff(value1, value2, 'dmp-lines', get_timeout())
+    if in_time:
+        return _render_diff(diff, 'dmp-lines', cleanup), False
+
+    return None, False
+
+
+def _generate_parallel_diff(value1, value2, cleanup, engine, timeout) -> tuple[str | None, bool]:
+    """
+    Runs in a worker of the diff executor (maybe in a other process): Don't use settings or the context here.
+    """
+    return _generate_timed_diff(value1, value2, cleanup, engine, get_timeout=lambda: timeout)
+
+
+class ParallelDiffs:
+    """
+    Generate the diffs of big values in parallel on the diff executor, see: reversion_compare.executor
+
+    The diffs are submitted before the fields are compared. html_diff() uses the result,
+    if the diff of the same values was submitted and this instance is activated.
+    """
+
+    def __init__(self, executor=None, min_size=0):
+        self.executor = executor
+        self.min_size = min_size
+        self.futures = {}  # {diff memo key: Future}
+
+    def submit(self, value1, value2, cleanup=SEMANTIC, engine=None) -> bool:
+        """
+        Submit the diff of the values, if it's big enough. Returns True if submitted.
+        Must be called with the same arguments as the html_diff() call that will use the result.
+        """
+        if self.executor is None:
+            return False
+
+        value1 = force_str(value1, errors='replace')
+        value2 = force_str(value2, errors='replace')
+        if len(value1) + len(value2) < self.min_size:
+            return False
+
+        engine = get_diff_engine_name(value1, value2, engine)
+        if engine == 'ndiff':
+            return False
+        if isinstance(self.executor, ProcessPoolExecutor) and not is_builtin_diff_engine(engine):
+            # Only the engine name is sent to the worker process: Engines registered at runtime don't exist there
+            return False
+
+        max_size = getattr(settings, 'REVERSION_COMPARE_DIFF_MAX_SIZE', DIFF_MAX_SIZE)
+        if max_size and max(len(value1), len(value2)) > max_size:
+            return False
+        budget = get_diff_budget()
+        if budget is not None and budget.exhausted:
+            return False
+
+        key = diff_memo.make_key(value1, value2, cleanup, engine)
+        if key in self.futures or key in diff_memo:
+            return False
+
+        self.futures[key] = self.executor.submit(
+            _generate_parallel_diff, value1, value2, cleanup, engine, get_diff_timeout()
+        )
+        return True
+
+    def pop(self, key):
+        return self.futures.pop(key, None)
+
+    def cancel(self) -> None:
+        """
+        Cancel all diffs, that are not used.
+        """
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+    @contextlib.contextmanager
+    def activate(self):
+        token = _current_parallel_diffs.set(self)
+        try:
+            yield self
+        finally:
+            _current_parallel_diffs.reset(token)
+
+
+def html_diff(value1, value2, cleanup=SEMANTIC, engine=None):
     """
     Generates a diff used google-diff-match-patch is exist or ndiff as fallback
 
     The cleanup parameter can be SEMANTIC, EFFICIENCY or None to clean up the diff
     for greater human readibility.
+
+    The engine parameter can be one of DIFF_ENGINES, "ndiff" or "auto",
+    see get_diff_engine_name() for the default.
+
+    The rendered diffs are memorized via diff_memo, see diff_memo.info() for hit/miss counters.
+
+    The diff is limited by settings.REVERSION_COMPARE_DIFF_MAX_SIZE, REVERSION_COMPARE_DIFF_TIMEOUT
+    and the current DiffBudget. A degraded diff will not be memorized and marks the budget as truncated.
+
+    The diff may be generated in parallel before, see: ParallelDiffs
     """
     value1 = force_str(value1, errors='replace')
     value2 = force_str(value2, errors='replace')
 
-    if len(value1) > CHANGE_DIFF_THRESHOLD or len(value2) > CHANGE_DIFF_THRESHOLD:
-        # Bigger values -> use Google diff-match-patch
-        html = generate_dmp_diff(value1, value2, cleanup)
-    else:
-        # For small content use ndiff
-        html = generate_ndiff(value1, value2)
+    engine = get_diff_engine_name(value1, value2, engine)
+
+    memo_key = diff_memo.make_key(value1, value2, cleanup, engine)
+    html = diff_memo.get(memo_key)
+    if html is None:
+        parallel_diffs = _current_parallel_diffs.get()
+        future = parallel_diffs.pop(memo_key) if parallel_diffs is not None else None
+        with phase('diff'):
+            if future is None:
+                html, complete = _generate_limited_diff(value1, value2, cleanup, engine)
+            else:
+                html, complete = future.result()
+                if html is None:
+                    html = generate_size_summary(value1, value2)
+        if complete:
+            diff_memo.set(memo_key, html)
+        elif budget := get_diff_budget():
+            budget.truncated = True
 
     html = mark_safe(html)
     return html
@@ -0,0 +1,71 @@
+"""
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import logging
+
+from django.core.management import BaseCommand
+from reversion.errors import RevertError
+from reversion.models import Version
+
+from reversion_compare.changed_fields import get_indexed_expression, store_changed_fields
+from reversion_compare.management.utils import get_compare_instance
+from reversion_compare.models import ChangedField
+from reversion_compare.store import iter_version_pairs
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Store the changed fields of all versions of the models, that have none.'
+        ' Versions without changed fields are compared again on the next run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='+', metavar='app_label.ModelName', help='Models registered in the admin')
+        parser.add_argument(
+            '--chunk-size', type=int, default=100, help='Number of versions per query (default: %(default)s)'
+        )
+        parser.add_argument('--database', default=None, help='Database of the model instances')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the changed fields of the models first, e.g. after "compare_fields" was changed',
+        )
+
+    def handle(self, *args, **options):
+        for model, model_admin in [get_compare_instance(label) for label in options['models']]:
+            self.backfill(model, model_admin, options)
+
+    def backfill(self, model, model_admin, options):
+        database = options['database']
+
+        if options['clear']:
+            deleted, __ = ChangedField.objects.filter(
+                version__in=Version.objects.get_for_model(model, model_db=database).values('pk'),
+            ).delete()
+            self.stdout.write(f'{model._meta.label}: {deleted} changed fields deleted.')
+
+        indexed = errors = 0
+        for obj, version1, version2 in iter_version_pairs(
+            model, get_indexed_expression(), model_db=database, chunk_size=options['chunk_size']
+        ):
+            try:
+                field_names = store_changed_fields(model_admin, obj, version1, version2)
+            except RevertError:
+                logger.exception('Compare of version %s and %s failed', version1.pk, version2.pk)
+                errors += 1
+                continue
+
+            indexed += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{model._meta.label} {obj.pk}: {version2.pk} changed: {", ".join(field_names)}')
+
+        msg = f'{model._meta.label}: {indexed} versions indexed.'
+        if errors:
+            self.stdout.write(self.style.WARNING(f'{msg} {errors} compares failed.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(msg))
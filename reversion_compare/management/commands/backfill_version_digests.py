@@ -0,0 +1,54 @@
+"""
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+from django.core.management import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.functions import MD5
+from reversion.models import Version
+
+from reversion_compare.models import VersionDigest
+
+
+class Command(BaseCommand):
+    help = 'Store the VersionDigest of all versions, that have none (e.g. created before reversion_compare was updated)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000, help='Number of versions per query (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS, help='Database of the versions (default: %(default)s)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        database = options['database']
+
+        # The digests are created in the database, so the serialized data is not transferred:
+        queryset = (
+            Version.objects.using(database)
+            .filter(compare_digest__isnull=True)
+            .annotate(digest=MD5('serialized_data'))
+            .order_by('pk')
+        )
+
+        created = 0
+        last_pk = None
+        while True:
+            batch_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch_queryset.values_list('pk', 'digest')[:batch_size])
+            if not batch:
+                break
+
+            VersionDigest.objects.using(database).bulk_create(
+                [VersionDigest(version_id=pk, digest=digest) for pk, digest in batch],
+                ignore_conflicts=True,
+            )
+            created += len(batch)
+            last_pk = batch[-1][0]
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{created} digests created...')
+
+        self.stdout.write(self.style.SUCCESS(f'{created} version digests created.'))
@@ -0,0 +1,121 @@
+"""
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import contextlib
+import logging
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone, translation
+from reversion.errors import RevertError
+
+from reversion_compare.cache import get_compare_config_key
+from reversion_compare.management.utils import get_compare_instance
+from reversion_compare.store import delete_stale_results, get_stored_expression, iter_version_pairs
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def override_locale(language, time_zone):
+    with translation.override(language), timezone.override(time_zone):
+        yield
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare every version of the models with its previous version and store the results.'
+        ' Existing results are skipped, so the command can be stopped and resumed at any time.'
+        ' The results contain rendered html, so they are stored and used per language and timezone.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='+', metavar='app_label.ModelName', help='Models registered in the admin')
+        parser.add_argument(
+            '--chunk-size', type=int, default=100, help='Number of versions per query (default: %(default)s)'
+        )
+        parser.add_argument('--database', default=None, help='Database of the model instances')
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help=f'Store the results for this language, can be repeated (default: {settings.LANGUAGE_CODE})',
+        )
+        parser.add_argument(
+            '--all-languages', action='store_true', help='Store the results for all languages of settings.LANGUAGES'
+        )
+        parser.add_argument(
+            '--timezone',
+            action='append',
+            dest='timezones',
+            help=f'Store the results for this timezone, can be repeated (default: {settings.TIME_ZONE})',
+        )
+        parser.add_argument(
+            '--delete-stale',
+            action='store_true',
+            help='Delete the results of the models, that were created with another package version or config',
+        )
+
+    def handle(self, *args, **options):
+        compare_instances = [get_compare_instance(label) for label in options['models']]
+
+        if options['all_languages']:
+            languages = [code for code, __ in settings.LANGUAGES]
+        else:
+            languages = options['languages'] or [settings.LANGUAGE_CODE]
+        time_zones = options['timezones'] or [settings.TIME_ZONE]
+        locales = [(language, time_zone) for language in languages for time_zone in time_zones]
+
+        for model, model_admin in compare_instances:
+            self.store_results(model, model_admin, locales, options)
+
+    def store_results(self, model, model_admin, locales, options):
+        database = options['database']
+        verbose = options['verbosity'] > 1
+
+        config_keys = {}
+        for locale in locales:
+            with override_locale(*locale):
+                config_keys[locale] = get_compare_config_key(model_admin, model())
+
+        if options['delete_stale']:
+            deleted = delete_stale_results(model, config_keys.values(), model_db=database)
+            self.stdout.write(f'{model._meta.label}: {deleted} stale compare results deleted.')
+
+        stored = errors = truncated = 0
+        for locale, config_key in config_keys.items():
+            with override_locale(*locale):
+                for obj, version1, version2 in iter_version_pairs(
+                    model, get_stored_expression(config_key), model_db=database, chunk_size=options['chunk_size']
+                ):
+                    try:
+                        result = model_admin.compare(obj, version1, version2)
+                    except RevertError:
+                        logger.exception('Compare of version %s and %s failed', version1.pk, version2.pk)
+                        errors += 1
+                        continue
+
+                    if result.truncated:
+                        # Not stored, so the next run will try again:
+                        truncated += 1
+                        continue
+
+                    model_admin.store_compare_result(obj, version1, version2, result)
+                    stored += 1
+                    if verbose:
+                        self.stdout.write(
+                            f'{model._meta.label} {obj.pk}: {version1.pk} -> {version2.pk} stored ({", ".join(locale)})'
+                        )
+
+        msg = f'{model._meta.label}: {stored} compare results stored.'
+        if truncated:
+            msg += f' {truncated} truncated compare results skipped.'
+        if errors:
+            self.stdout.write(self.style.WARNING(f'{msg} {errors} compares failed.'))
+        elif truncated:
+            self.stdout.write(self.style.WARNING(msg))
+        else:
+            self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,26 @@
+"""
+    Helpers for the management commands.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+from django.apps import apps
+from django.core.management import CommandError
+
+from reversion_compare.plan import get_compare_admin
+
+
+def get_compare_instance(label):
+    """
+    Returns the model and its compare ModelAdmin of the "app_label.ModelName" label.
+    """
+    try:
+        model = apps.get_model(label)
+    except (LookupError, ValueError) as err:
+        raise CommandError(f'Unknown model {label!r}: {err}')
+
+    model_admin = get_compare_admin(model)
+    if model_admin is None:
+        raise CommandError(f'Model {label!r} is not registered with a compare admin.')
+    return model, model_admin
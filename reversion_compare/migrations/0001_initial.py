@@ -0,0 +1,27 @@
+# Generated by Django 6.1.2 on 2026-10-18 01:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reversion', '0002_add_index_on_version_for_content_type_and_db'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionDigest',
+            fields=[
+                ('version', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='compare_digest', serialize=False, to='reversion.version', verbose_name='version')),
+                ('digest', models.CharField(help_text='MD5 of the serialized data', max_length=32, verbose_name='digest')),
+            ],
+            options={
+                'verbose_name': 'version digest',
+                'verbose_name_plural': 'version digests',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.1.2 on 2026-10-18 01:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reversion', '0002_add_index_on_version_for_content_type_and_db'),
+        ('reversion_compare', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredCompareResult',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_key', models.CharField(db_index=True, help_text='Hash of the package version and the compare configuration', max_length=64, verbose_name='config key')),
+                ('package_version', models.CharField(db_index=True, max_length=32, verbose_name='package version')),
+                ('data', models.JSONField(help_text='The dumped compare result', verbose_name='data')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('previous_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reversion.version', verbose_name='previous version')),
+                ('version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reversion.version', verbose_name='version')),
+            ],
+            options={
+                'verbose_name': 'stored compare result',
+                'verbose_name_plural': 'stored compare results',
+                'constraints': [models.UniqueConstraint(fields=('version', 'previous_version', 'config_key'), name='reversion_compare_unique_stored_result')],
+            },
+        ),
+    ]
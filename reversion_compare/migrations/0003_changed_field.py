@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-18 01:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reversion', '0002_add_index_on_version_for_content_type_and_db'),
+        ('reversion_compare', '0002_stored_compare_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangedField',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(max_length=255, verbose_name='field name')),
+                ('version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compare_changed_fields', to='reversion.version', verbose_name='version')),
+            ],
+            options={
+                'verbose_name': 'changed field',
+                'verbose_name_plural': 'changed fields',
+                'indexes': [models.Index(fields=['field_name', 'version'], name='reversion_compare_field_name')],
+                'constraints': [models.UniqueConstraint(fields=('version', 'field_name'), name='reversion_compare_unique_changed_field')],
+            },
+        ),
+    ]
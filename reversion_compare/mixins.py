@@ -12,15 +12,39 @@ import dataclasses
 
 from django.conf import settings
 from django.db import models
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.http import Http404, QueryDict
 from django.template.loader import render_to_string
 from django.utils.encoding import force_str
-from django.utils.http import urlencode
-
-from reversion_compare.compare import CompareObjects
+from django.utils.safestring import mark_safe
+from reversion import RevertError
+
+from reversion_compare.blame import FieldBlame, blame_lines, split_lines
+from reversion_compare.cache import (
+    get_blame_cache_key,
+    get_compare_cache,
+    get_compare_cache_key,
+    get_compare_cache_timeout,
+    get_compare_config_key,
+)
+from reversion_compare.changed_fields import (
+    CHANGED_FIELD_PARAMETER,
+    any_changed_field,
+    filter_changed_field,
+    get_changed_fields_enabled,
+)
+from reversion_compare.compare import CompareObjects, RelatedVersionsPrefetch
+from reversion_compare.executor import get_diff_executor, get_diff_parallel_min_size, run_in_compare_executor
+from reversion_compare.field_data import get_field_data, get_unchanged_fields
 from reversion_compare.forms import SelectDiffForm
-from reversion_compare.helpers import html_diff
+from reversion_compare.helpers import DiffBudget, ParallelDiffs, html_diff, use_diff_engine
+from reversion_compare.plan import get_compare_method, get_compare_method_names, get_compare_plan
+from reversion_compare.set_diff import chunked
+from reversion_compare.store import get_compare_store, get_stored_data, store_data
+from reversion_compare.timing import field_phase, phase
+
+
+# Default number of versions on one history page:
+HISTORY_PAGE_SIZE = 100
 
 
 @dataclasses.dataclass
@@ -28,6 +52,49 @@ class CompareResult:
     diff: list
     has_unfollowed_fields: bool
 
+    @property
+    def truncated(self) -> bool:
+        """
+        Was a diff degraded by the diff limits? Such results are not cached or stored.
+        """
+        return any(item.get('truncated', False) for item in self.diff)
+
+
+@dataclasses.dataclass
+class HistoryPage:
+    versions: list  # [Version] in display order
+    is_latest: bool  # Contains the newest versions?
+    newer_url: str | None = None
+    older_url: str | None = None
+    cursor: dict = dataclasses.field(default_factory=dict)  # e.g.: {'before': pk} of the current page
+    changed_field: str | None = None  # Only versions with changes of this field, see: changed_fields
+    unindexed_changed_field: str | None = None  # Requested filter, that can't be used: No changed fields stored
+
+
+def run_queries(steps):
+    """
+    Run a generator that yields querysets and gets the results back as lists.
+    The same generator can be used in sync and async code, see: arun_queries()
+    """
+    try:
+        queryset = next(steps)
+        while True:
+            queryset = steps.send(list(queryset))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def arun_queries(steps):
+    """
+    Async version of run_queries(): evaluate the querysets with the async ORM.
+    """
+    try:
+        queryset = next(steps)
+        while True:
+            queryset = steps.send([item async for item in queryset])
+    except StopIteration as stop:
+        return stop.value
+
 
 class CompareMixin:
     """A mixin to add comparison capabilities to your views"""
@@ -41,12 +108,143 @@ class CompareMixin:
     # sort from new to old as default, see: https://github.com/etianen/django-reversion/issues/77
     history_latest_first = True
 
+    # Number of versions on one history page. None -> use settings.REVERSION_COMPARE_HISTORY_PAGE_SIZE
+    # Set the setting to 0 to display all versions on one page.
+    history_page_size = None
+
+    # Diff engine per field name or internal field type, e.g.: {'title': 'dmp', 'TextField': 'histogram'}
+    # see reversion_compare.helpers.DIFF_ENGINES for all engines. Other fields: settings.REVERSION_COMPARE_DIFF_ENGINE
+    diff_engines = None
+
+    # Stream the compare page field by field. None -> use settings.REVERSION_COMPARE_STREAMING
+    # The streaming view uses iter_compare(), so overwrite this method instead of compare()
+    compare_streaming = None
+
+    # Use the stored compare results, see: reversion_compare.store. None -> use settings.REVERSION_COMPARE_STORE
+    compare_store = None
+
     def _order_version_queryset(self, queryset):
         """Applies the correct ordering to the given version queryset."""
         if self.history_latest_first:
             return queryset.order_by("-pk")
         return queryset.order_by("pk")
 
+    def _lean_version_queryset(self, queryset):
+        """
+        Returns the version queryset without the serialized data.
+        Use it for all lists and lookups that never deserialize the versions.
+        """
+        return queryset.defer('serialized_data')
+
+    def get_history_page_size(self) -> int:
+        if self.history_page_size is not None:
+            return self.history_page_size
+        return getattr(settings, 'REVERSION_COMPARE_HISTORY_PAGE_SIZE', HISTORY_PAGE_SIZE)
+
+    def get_compare_streaming(self) -> bool:
+        if self.compare_streaming is not None:
+            return self.compare_streaming
+        return getattr(settings, 'REVERSION_COMPARE_STREAMING', False)
+
+    def get_compare_store(self) -> bool:
+        if self.compare_store is not None:
+            return self.compare_store
+        return get_compare_store()
+
+    def _get_history_page(self, request_GET, queryset) -> HistoryPage:
+        """
+        Keyset pagination of the versions by pk.
+
+        The pages are always counted from the newest version, so the first page contains
+        the newest versions, independent of the history_latest_first ordering.
+        Use "?before=<pk>" for older and "?after=<pk>" for newer versions.
+        "?changed_field=<field name>" displays only the versions with changes of the field.
+        """
+        return run_queries(self._history_page_steps(request_GET, queryset))
+
+    async def _aget_history_page(self, request_GET, queryset) -> HistoryPage:
+        """
+        Async version of _get_history_page()
+        """
+        return await arun_queries(self._history_page_steps(request_GET, queryset))
+
+    def _history_page_steps(self, request_GET, queryset):
+        queryset = self._lean_version_queryset(queryset)
+        changed_field = request_GET.get(CHANGED_FIELD_PARAMETER) or None
+        unindexed_changed_field = None
+        if changed_field is not None:
+            # Without stored changed fields, the filter would silently display no versions:
+            if get_changed_fields_enabled() and (yield any_changed_field(queryset)):
+                queryset = filter_changed_field(queryset, changed_field)
+            else:
+                changed_field, unindexed_changed_field = None, changed_field
+
+        page_size = self.get_history_page_size()
+        if not page_size:
+            versions = yield self._order_version_queryset(queryset)
+            return HistoryPage(
+                versions=versions,
+                is_latest=True,
+                changed_field=changed_field,
+                unindexed_changed_field=unindexed_changed_field,
+            )
+
+        def get_pk(key):
+            try:
+                return int(request_GET[key])
+            except (KeyError, ValueError):
+                return None
+
+        def build_url(key, pk):
+            query = request_GET.copy()
+            query.pop('before', None)
+            query.pop('after', None)
+            query[key] = pk
+            return f'?{query.urlencode()}'
+
+        versions = None
+        before_pk = get_pk('before')
+        after_pk = get_pk('after')
+        if after_pk is not None:
+            versions = yield queryset.filter(pk__gt=after_pk).order_by('pk')[: page_size + 1]
+            if len(versions) > page_size:
+                versions = versions[:page_size]
+                versions.reverse()
+                has_newer, has_older = True, True
+            else:
+                # We reached the newest versions -> display the first page
+                versions = None
+                before_pk = None
+
+        if versions is None:
+            if before_pk is not None:
+                queryset = queryset.filter(pk__lt=before_pk)
+            versions = yield queryset.order_by('-pk')[: page_size + 1]
+            has_older = len(versions) > page_size
+            versions = versions[:page_size]
+            has_newer = before_pk is not None
+
+        history_page = HistoryPage(
+            versions=versions,
+            is_latest=not has_newer,
+            changed_field=changed_field,
+            unindexed_changed_field=unindexed_changed_field,
+        )
+        if after_pk is not None and has_newer:
+            history_page.cursor = {'after': after_pk}
+        elif before_pk is not None:
+            history_page.cursor = {'before': before_pk}
+        if versions:
+            if has_newer:
+                history_page.newer_url = build_url('after', versions[0].pk)
+            if has_older:
+                history_page.older_url = build_url('before', versions[-1].pk)
+
+        if not self.history_latest_first:
+            versions.reverse()
+
+        return history_page  # noqa: B901 - result of run_queries()
+
     def _annotate_action_list(self, action_list: list) -> None:
         if len(action_list) >= 2:
             # for pre selecting the compare radio buttons depend on the ordering:
@@ -66,22 +264,33 @@ class CompareMixin:
             3. compare_{internal_type}
             4. Fallback to: self.fallback_compare()
         """
+        if obj_compare.plan is not None:
+            method_names = obj_compare.plan.compare_method_names
+        else:
+            is_reversed = obj_compare.field in reverse_fields
+            method_names = get_compare_method_names(obj_compare.field, obj_compare.field_name, is_reversed)
+        return get_compare_method(self, method_names)(obj_compare)
 
-        candidates = [obj_compare.field_name]  # -> compare_{field_name}
-        if obj_compare.field in reverse_fields:
-            candidates.append('ManyToOneRel')  # -> compare_ManyToOneRel
-        candidates.append(
-            obj_compare.field.get_internal_type()  # -> compare_{internal_type}
-        )
+    def get_diff_engine(self, obj_compare) -> str | None:
+        """
+        Returns the diff engine for the field from self.diff_engines or None to use the default.
+        """
+        if self.diff_engines:
+            engine = self.diff_engines.get(obj_compare.field_name)
+            if engine is None:
+                engine = self.diff_engines.get(obj_compare.field.get_internal_type())
+            return engine
 
-        for suffix in candidates:
-            func = getattr(self, f'compare_{suffix}', None)
-            if callable(func):
-                return func(obj_compare)
+    def _resolve_versions_and_navigation(self, request_GET, queryset):
+        return run_queries(self._resolve_versions_and_navigation_steps(request_GET, queryset))
 
-        return self.fallback_compare(obj_compare)
+    async def _aresolve_versions_and_navigation(self, request_GET, queryset):
+        """
+        Async version of _resolve_versions_and_navigation()
+        """
+        return await arun_queries(self._resolve_versions_and_navigation_steps(request_GET, queryset))
 
-    def _resolve_versions_and_navigation(self, request_GET, queryset):
+    def _resolve_versions_and_navigation_steps(self, request_GET, queryset):
         form = SelectDiffForm(request_GET)
         if not form.is_valid():
             msg = 'Wrong version IDs.'
@@ -96,49 +305,66 @@ class CompareMixin:
             # Compare always the newest one (#2) with the older one (#1)
             version_id1, version_id2 = version_id2, version_id1
 
-        version1 = get_object_or_404(queryset, pk=version_id1)
-        version2 = get_object_or_404(queryset, pk=version_id2)
+        # Fetch both versions and the ids of their neighbours with one query.
+        # Only these two versions will be deserialized.
+        pk_queryset = queryset.values_list('pk', flat=True)
+        versions = yield (
+            queryset.filter(pk__in=(version_id1, version_id2))
+            .select_related('revision')
+            .annotate(
+                next_version_id=models.Subquery(pk_queryset.filter(pk__gt=models.OuterRef('pk')).order_by('pk')[:1]),
+                prev_version_id=models.Subquery(pk_queryset.filter(pk__lt=models.OuterRef('pk')).order_by('-pk')[:1]),
+            )
+        )
+        versions = {version.pk: version for version in versions}
+        try:
+            version1 = versions[version_id1]
+            version2 = versions[version_id2]
+        except KeyError:
+            raise Http404('No Version matches the given query.')
 
         result = {'version1': version1, 'version2': version2}
 
-        next_version = queryset.filter(pk__gt=version_id2).last()
-        prev_version = queryset.filter(pk__lt=version_id1).first()
+        next_version_id = version2.next_version_id
+        prev_version_id = version1.prev_version_id
 
-        if next_version:
-            result['next_url'] = '?' + urlencode({'version_id1': version2.id, 'version_id2': next_version.id})
-        if prev_version:
-            result['prev_url'] = '?' + urlencode({'version_id1': prev_version.id, 'version_id2': version1.id})
+        def build_url(version_id1, version_id2):
+            # Keep the other parameters, e.g. the history page and the changed_field filter:
+            query = QueryDict(mutable=True)
+            query['version_id1'] = version_id1
+            query['version_id2'] = version_id2
+            for key, values in request_GET.lists():
+                if key not in query:
+                    query.setlist(key, values)
+            return f'?{query.urlencode()}'
 
-        return result
-
-    def compare(self, obj, version1, version2) -> CompareResult:
-        """
-        Create a generic html diff from the obj between version1 and version2:
+        if next_version_id is not None:
+            result['next_url'] = build_url(version2.id, next_version_id)
+        if prev_version_id is not None:
+            result['prev_url'] = build_url(prev_version_id, version1.id)
 
-            A diff of every changes field values.
+        return result  # noqa: B901 - result of run_queries()
 
-        This method should be overwritten, to create a nice diff view
-        coordinated with the model.
+    def _get_compare_fields(self, obj) -> tuple[list, list]:
+        """
+        Returns [(field, field_name), ...] of all fields to compare and the list of reverse fields.
         """
-        diff = []
-
         # Create a list of all normal fields and append many-to-many fields
-        fields = [field for field in obj._meta.fields]
+        all_fields = [field for field in obj._meta.fields]
         concrete_model = obj._meta.concrete_model
-        fields += concrete_model._meta.many_to_many
+        all_fields += concrete_model._meta.many_to_many
 
         # This gathers the related reverse ForeignKey fields, so we can do ManyToOne compares
         reverse_fields = []
         for field in obj._meta.get_fields(include_hidden=True):
             f = getattr(field, "field", None)
-            if isinstance(f, models.ForeignKey) and f not in fields:
+            if isinstance(f, models.ForeignKey) and f not in all_fields:
                 reverse_fields.append(f.remote_field)
 
-        fields += reverse_fields
+        all_fields += reverse_fields
 
-        has_unfollowed_fields = False
-
-        for field in fields:
+        fields = []
+        for field in all_fields:
             # logger.debug("%s %s %s", field, field.db_type, field.get_internal_type())
             try:
                 field_name = field.name
@@ -151,23 +377,385 @@ class CompareMixin:
             if self.compare_exclude and field_name in self.compare_exclude:
                 continue
 
-            is_reversed = field in reverse_fields
-            obj_compare = CompareObjects(field, field_name, obj, version1, version2, is_reversed)
-            # obj_compare.debug()
+            fields.append((field, field_name))
+
+        return fields, reverse_fields
+
+    def get_compare_result(self, obj, version1, version2) -> CompareResult:
+        """
+        Returns the compare() result of the two versions.
+        Use the compare result cache, if activated via settings.REVERSION_COMPARE_CACHE
+        and the stored compare results, if activated via settings.REVERSION_COMPARE_STORE
+        Only the diffs of the plain fields are cached and stored, the relation fields are always compared.
+        """
+        result = self.get_cached_compare_result(obj, version1, version2)
+        if result is None:
+            result = self.compare(obj, version1, version2)
+            self.set_cached_compare_result(obj, version1, version2, result)
+        return result
+
+    async def aget_compare_result(self, obj, version1, version2) -> CompareResult:
+        """
+        Async version of get_compare_result(): The compare runs in the bounded compare executor.
+        """
+        return await run_in_compare_executor(self.get_compare_result, obj, version1, version2)
+
+    def get_cached_compare_result(self, obj, version1, version2) -> CompareResult | None:
+        cache_key = get_compare_cache_key(self, obj, version1, version2)
+        if cache_key is not None:
+            cached_data = get_compare_cache().get(cache_key)
+            if cached_data is not None:
+                return self._load_compare_result(obj, version1, version2, cached_data)
+        return self.get_stored_compare_result(obj, version1, version2)
+
+    def get_stored_compare_result(self, obj, version1, version2) -> CompareResult | None:
+        if not self.get_compare_store():
+            return None
+
+        stored_data = get_stored_data(get_compare_config_key(self, obj), version1, version2)
+        if stored_data is None:
+            return None
+        return self._load_compare_result(obj, version1, version2, stored_data)
+
+    def store_compare_result(self, obj, version1, version2, result: CompareResult) -> None:
+        """
+        Save the compare result of version2 and its previous version1, see: "store_compare_results" command
+        A truncated result is not saved.
+        """
+        if result.truncated:
+            return
+        store_data(get_compare_config_key(self, obj), version1, version2, self._dump_compare_result(result))
+
+    def set_cached_compare_result(self, obj, version1, version2, result: CompareResult) -> None:
+        if result.truncated:
+            # Don't keep a degraded diff, e.g. from a slow request under load
+            return
+        cache_key = get_compare_cache_key(self, obj, version1, version2)
+        if cache_key is not None:
+            get_compare_cache().set(cache_key, self._dump_compare_result(result), timeout=get_compare_cache_timeout())
+
+    def _dump_compare_result(self, result: CompareResult) -> dict:
+        return {
+            'diff': [
+                {
+                    'field_name': item['field'].name,
+                    'is_related': item['is_related'],
+                    'follow': item['follow'],
+                    'diff': str(item['diff']),
+                    'truncated': item.get('truncated', False),
+                }
+                for item in result.diff
+                if not item['is_related']
+            ],
+        }
+
+    def _load_compare_result(self, obj, version1, version2, data: dict) -> CompareResult | None:
+        """
+        Returns the compare result with the cached diffs of the plain fields.
+        The relation fields are compared with the live related objects (e.g. their __str__),
+        so they are never cached and compared again.
+        """
+        plan = get_compare_plan(self, type(obj))
+        fields = {field_plan.field.name: field_plan.field for field_plan in plan.fields}
+        diff = []
+        for item in data['diff']:
+            if item['is_related']:
+                # Stored by an older version: The relation fields are compared on every request
+                continue
+            field = fields.get(item['field_name'])
+            if field is None:
+                # The model was changed since the result was cached
+                return None
+            diff.append(
+                {
+                    'field': field,
+                    'is_related': item['is_related'],
+                    'follow': item['follow'],
+                    'diff': mark_safe(item['diff']),
+                    'truncated': item.get('truncated', False),
+                }
+            )
+        result = CompareResult(diff=diff, has_unfollowed_fields=False)
+        related_diff = list(self.iter_compare(obj, version1, version2, result, related=True))
+        if related_diff:
+            field_order = {field_plan.field: index for index, field_plan in enumerate(plan.fields)}
+            result.diff = sorted(diff + related_diff, key=lambda item: field_order[item['field']])
+        return result
+
+    def compare(self, obj, version1, version2) -> CompareResult:
+        """
+        Create a generic html diff from the obj between version1 and version2:
+
+            A diff of every changes field values.
+
+        This method should be overwritten, to create a nice diff view
+        coordinated with the model.
+        """
+        result = CompareResult(diff=[], has_unfollowed_fields=False)
+        result.diff.extend(self.iter_compare(obj, version1, version2, result))
+        return result
+
+    def _get_compare_objects(self, obj, version1, version2, related: bool | None = None) -> list:
+        """
+        Returns [(FieldPlan, CompareObjects)] of all fields, that may be changed.
+        Only the relation fields (related=True) or the plain fields (related=False), if given.
+        The related versions of all relation fields are prefetched.
+        """
+        plan = get_compare_plan(self, type(obj))
+
+        with phase('deserialize'):
+            # Skip all plain fields without changes, before the CompareObjects are created:
+            unchanged_fields = get_unchanged_fields(get_field_data(version1), get_field_data(version2))
+
+        with phase('prefetch'):
+            # Collect the related versions of all relation fields, so they can be loaded
+            # with one query per revision instead of one query per field and version:
+            prefetch1 = RelatedVersionsPrefetch(version1.revision)
+            prefetch2 = RelatedVersionsPrefetch(version2.revision)
+
+            compare_objects = []
+            for field_plan in plan.fields:
+                if field_plan.attname in unchanged_fields:
+                    continue
+                if related is not None and field_plan.is_related != related:
+                    continue
+                obj_compare = CompareObjects(
+                    field_plan.field,
+                    field_plan.field_name,
+                    obj,
+                    version1,
+                    version2,
+                    field_plan.is_reversed,
+                    prefetch1=prefetch1,
+                    prefetch2=prefetch2,
+                    plan=field_plan,
+                )
+                if obj_compare.is_related:
+                    obj_compare.collect_prefetch()
+                compare_objects.append((field_plan, obj_compare))
+
+            prefetch1.load()
+            prefetch2.load()
+
+        return compare_objects
+
+    def get_changed_fields(self, obj, version1, version2) -> list:
+        """
+        Returns the names of all changed fields, without creating the diffs.
+        """
+        return [
+            field_plan.field_name
+            for field_plan, obj_compare in self._get_compare_objects(obj, version1, version2)
+            if obj_compare.changed()
+        ]
+
+    def _get_field_plan(self, obj, field_name):
+        for field_plan in get_compare_plan(self, type(obj)).fields:
+            if field_plan.field_name == field_name:
+                return field_plan
+        raise Http404(f'Unknown field {field_name!r}')
+
+    def get_field_timeline(self, obj, field_name, versions) -> list:
+        """
+        Returns all changes of one field over the given versions (ordered by pk) as list of:
+            {'version':..., 'revision':..., 'diff':..., 'truncated':..., 'previous_version':...}
+
+        The first entry contains the initial value as 'value' and no diff, the other entries the
+        diffs of all versions with changes of the field. Every version is deserialized only once:
+        The previous version is carried forward to the next compare.
+        A version, that can't be loaded, gets an entry with the 'error' and is skipped.
+        """
+        field_plan = self._get_field_plan(obj, field_name)
+        reverse_fields = get_compare_plan(self, type(obj)).reverse_fields
+
+        def get_compare_objects(version1, version2):
+            return CompareObjects(
+                field_plan.field,
+                field_plan.field_name,
+                obj,
+                version1,
+                version2,
+                field_plan.is_reversed,
+                plan=field_plan,
+            )
+
+        timeline = []
+        budget = DiffBudget()
+        previous_version = None
+        for version in versions:
+            entry = {'version': version, 'revision': version.revision, 'diff': None, 'truncated': False}
+            try:
+                if previous_version is None:
+                    entry['value'] = get_compare_objects(version, version).compare_obj1.to_string()
+                else:
+                    obj_compare = get_compare_objects(previous_version, version)
+                    if not obj_compare.changed():
+                        previous_version = version
+                        continue
+                    with budget.activate(), use_diff_engine(self.get_diff_engine(obj_compare)):
+                        entry['diff'] = self._get_compare(obj_compare, reverse_fields)
+                    entry['truncated'] = budget.truncated
+                    entry['previous_version'] = previous_version
+            except RevertError as err:
+                entry['error'] = err
+                timeline.append(entry)
+                continue
+
+            timeline.append(entry)
+            previous_version = version
+        return timeline
 
-            is_related = obj_compare.is_related
-            follow = obj_compare.follow
-            if is_related and not follow:
-                has_unfollowed_fields = True
+    def get_field_blame(self, obj, field_name, queryset) -> FieldBlame:
+        """
+        Returns every line of the field value of the newest version with the version, that changed it last:
+            FieldBlame(lines=[{'number':..., 'line':..., 'version':..., 'revision':..., 'first':...}, ...])
+        'first' is True for the first line of a block of lines with the same version.
 
-            if not obj_compare.changed():
-                # Skip all fields that aren't changed
+        The blame starts at the newest version with cached line owners: A new version
+        costs only one line diff. Versions, that can't be loaded, are skipped.
+        Approximate line owners (a diff ran out of time) are not cached.
+        """
+        field = self._get_field_plan(obj, field_name).field
+        if field.is_relation:
+            raise Http404(f'No blame for the relation field {field_name!r}')
+
+        version_pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        if not version_pks:
+            return []
+
+        cache_keys = {pk: get_blame_cache_key(pk, field.attname) for pk in version_pks}
+        cached_owners = {}
+        if cache_keys[version_pks[0]] is not None:
+            cached_owners = get_compare_cache().get_many(list(cache_keys.values()))
+
+        # Replay the versions from the newest version with cached owners:
+        start_pk = version_pks[0]
+        for pk in reversed(version_pks):
+            if cache_keys[pk] in cached_owners:
+                start_pk = pk
+                break
+
+        def iter_versions():
+            # Only the versions of the first query: Versions committed in between have no cache key
+            for chunk in chunked(version_pks[version_pks.index(start_pk) :], size=100):
+                yield from queryset.filter(pk__in=chunk).order_by('pk')
+
+        text = owners = None
+        approximate = False
+        new_owners = {}
+        for version in iter_versions():
+            try:
+                value = get_field_data(version).get(field.attname)
+            except RevertError:
                 continue
+            version_text = '' if value is None else force_str(value)
 
-            html = self._get_compare(obj_compare, reverse_fields)
-            diff.append({"field": field, "is_related": is_related, "follow": follow, "diff": html})
+            if owners is None and cache_keys[version.pk] in cached_owners:
+                version_owners = cached_owners[cache_keys[version.pk]]
+            else:
+                if owners is None:
+                    version_owners = [version.pk] * len(split_lines(version_text))
+                else:
+                    version_owners, exact = blame_lines(text, owners, version_text, version.pk)
+                    # The following versions build on these owners, so they are approximate, too:
+                    approximate = approximate or not exact
+                if not approximate:
+                    new_owners[cache_keys[version.pk]] = version_owners
+            text, owners = version_text, version_owners
+
+        if owners is None:
+            return FieldBlame(lines=[])
+        if new_owners and cache_keys[version_pks[0]] is not None:
+            get_compare_cache().set_many(new_owners, timeout=get_compare_cache_timeout())
+
+        versions = queryset.filter(pk__in=set(owners)).select_related('revision__user').defer('serialized_data')
+        versions = {version.pk: version for version in versions}
+        blame = []
+        previous_owner = None
+        for number, (line, owner) in enumerate(zip(split_lines(text), owners), start=1):
+            version = versions.get(owner)  # None, if the version was deleted
+            blame.append(
+                {
+                    'number': number,
+                    'line': line.rstrip('\n'),
+                    'version': version,
+                    'revision': version.revision if version else None,
+                    'first': owner != previous_owner,
+                }
+            )
+            previous_owner = owner
+        return FieldBlame(lines=blame, approximate=approximate)
+
+    def iter_compare(self, obj, version1, version2, result: CompareResult, related: bool | None = None):
+        """
+        Generator version of compare(): yields the diff of every changed field, one after another.
+        result.has_unfollowed_fields is set while iterating, the diff entries are not added to result.
+        Only the relation fields (related=True) or the plain fields (related=False), if given.
+        Used for the streaming compare view, too.
+        """
+        compare_objects = self._get_compare_objects(obj, version1, version2, related=related)
+        reverse_fields = get_compare_plan(self, type(obj)).reverse_fields
+
+        # Limit the time of all diffs:
+        budget = DiffBudget()
+
+        parallel_diffs = self.submit_parallel_diffs(compare_objects, budget)
+        try:
+            for field_plan, obj_compare in compare_objects:
+                # obj_compare.debug()
+                field = obj_compare.field
+
+                is_related = obj_compare.is_related
+                follow = obj_compare.follow
+                if is_related and not follow:
+                    result.has_unfollowed_fields = True
+
+                with field_phase(obj_compare.field_name):
+                    if not obj_compare.changed():
+                        # Skip all fields that aren't changed
+                        continue
+
+                    with (
+                        budget.activate(),
+                        use_diff_engine(self.get_diff_engine(obj_compare)),
+                        parallel_diffs.activate(),
+                    ):
+                        html = self._get_compare(obj_compare, reverse_fields)
+                yield {
+                    "field": field,
+                    "is_related": is_related,
+                    "follow": follow,
+                    "diff": html,
+                    "truncated": budget.truncated,
+                }
+        finally:
+            parallel_diffs.cancel()
+
+    def submit_parallel_diffs(self, compare_objects, budget: DiffBudget) -> ParallelDiffs:
+        """
+        Submit the diffs of all big fields, that are compared via fallback_compare(), to the diff executor.
+        The fields are compared in order afterwards and fallback_compare() uses the submitted diffs.
+        Only if more than one diff is big enough, otherwise all diffs are generated inline.
+        """
+        parallel_diffs = ParallelDiffs(executor=get_diff_executor(), min_size=get_diff_parallel_min_size())
+        if parallel_diffs.executor is None:
+            return parallel_diffs
+
+        candidates = []
+        for field_plan, obj_compare in compare_objects:
+            func = get_compare_method(self, field_plan.compare_method_names)
+            if getattr(func, '__func__', None) is not CompareMixin.fallback_compare:
+                continue
+            value1, value2 = obj_compare.to_string()
+            if len(value1) + len(value2) >= parallel_diffs.min_size and obj_compare.changed():
+                candidates.append((obj_compare, value1, value2))
 
-        return CompareResult(diff=diff, has_unfollowed_fields=has_unfollowed_fields)
+        if len(candidates) > 1:
+            with phase('submit-diffs'), budget.activate():
+                for obj_compare, value1, value2 in candidates:
+                    with use_diff_engine(self.get_diff_engine(obj_compare)):
+                        parallel_diffs.submit(value1, value2)
+        return parallel_diffs
 
     def fallback_compare(self, obj_compare):
         """
@@ -182,15 +770,19 @@ class CompareMixin:
 class CompareMethodsMixin:
     """A mixin to add prepared compare methods."""
 
+    def render_compare_template(self, template_name, context):
+        with phase('template'):
+            return render_to_string(template_name, context)
+
     def generic_add_remove(self, raw_value1, raw_value2, value1, value2):
         if raw_value1 is None:
             # a new values was added:
             context = {"value": value2}
-            return render_to_string("reversion-compare/compare_generic_add.html", context)
+            return self.render_compare_template("reversion-compare/compare_generic_add.html", context)
         elif raw_value2 is None:
             # the existing value was removed:
             context = {"value": value1}
-            return render_to_string("reversion-compare/compare_generic_remove.html", context)
+            return self.render_compare_template("reversion-compare/compare_generic_remove.html", context)
         else:
             html = html_diff(value1, value2)
             return html
@@ -212,13 +804,13 @@ class CompareMethodsMixin:
     def compare_ManyToOneRel(self, obj_compare):
         change_info = obj_compare.get_m2o_change_info()
         context = {"change_info": change_info}
-        return render_to_string("reversion-compare/compare_generic_many_to_many.html", context)
+        return self.render_compare_template("reversion-compare/compare_generic_many_to_many.html", context)
 
     def compare_ManyToManyField(self, obj_compare):
         """ create a table for m2m compare """
         change_info = obj_compare.get_m2m_change_info()
         context = {"change_info": change_info}
-        return render_to_string("reversion-compare/compare_generic_many_to_many.html", context)
+        return self.render_compare_template("reversion-compare/compare_generic_many_to_many.html", context)
 
     # compare_ManyToManyField = simple_compare_ManyToManyField
 
@@ -233,11 +825,11 @@ class CompareMethodsMixin:
     def compare_DateTimeField(self, obj_compare):
         """ compare all model datetime field in ISO format """
         context = {"date1": obj_compare.value1, "date2": obj_compare.value2}
-        return render_to_string("reversion-compare/compare_DateTimeField.html", context)
+        return self.render_compare_template("reversion-compare/compare_DateTimeField.html", context)
 
     def compare_BooleanField(self, obj_compare):
         """ compare booleans as a complete field, rather than as a string """
         context = {"bool1": obj_compare.value1, "bool2": obj_compare.value2}
-        return render_to_string("reversion-compare/compare_BooleanField.html", context)
+        return self.render_compare_template("reversion-compare/compare_BooleanField.html", context)
 
     compare_NullBooleanField = compare_BooleanField
@@ -1 +1,123 @@
-# needed for unittest
+"""
+    models
+    ~~~~~~
+
+    Compare data, that is stored for every Version.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import hashlib
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from reversion.models import Version
+
+
+def compute_digest(serialized_data: str) -> str:
+    """
+    Same as the MD5() database function on the serialized data.
+    """
+    return hashlib.md5(serialized_data.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+class VersionDigest(models.Model):
+    """
+    Digest of the serialized data of a Version: Two versions with the same digest have the same data.
+
+    Created via reversion_compare.signals.store_version_digests() for new versions
+    and via the "backfill_version_digests" management command for existing versions.
+    """
+
+    version = models.OneToOneField(
+        Version,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='compare_digest',
+        verbose_name=_('version'),
+    )
+    digest = models.CharField(max_length=32, verbose_name=_('digest'), help_text=_('MD5 of the serialized data'))
+
+    class Meta:
+        verbose_name = _('version digest')
+        verbose_name_plural = _('version digests')
+
+    def __str__(self):
+        return f'{self.version_id}: {self.digest}'
+
+
+class StoredCompareResult(models.Model):
+    """
+    The precomputed compare result of a Version and its previous version of the same object.
+
+    Created via the "store_compare_results" management command and used by the compare view,
+    if activated via settings.REVERSION_COMPARE_STORE, see: reversion_compare.store
+    The config key contains the package version and the compare configuration, so that
+    outdated results are never used and can be deleted in bulk.
+    """
+
+    version = models.ForeignKey(
+        Version,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('version'),
+    )
+    previous_version = models.ForeignKey(
+        Version,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('previous version'),
+    )
+    config_key = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name=_('config key'),
+        help_text=_('Hash of the package version and the compare configuration'),
+    )
+    package_version = models.CharField(max_length=32, db_index=True, verbose_name=_('package version'))
+    data = models.JSONField(verbose_name=_('data'), help_text=_('The dumped compare result'))
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_('created'))
+
+    class Meta:
+        verbose_name = _('stored compare result')
+        verbose_name_plural = _('stored compare results')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('version', 'previous_version', 'config_key'),
+                name='reversion_compare_unique_stored_result',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.previous_version_id} -> {self.version_id}'
+
+
+class ChangedField(models.Model):
+    """
+    A field, that was changed in a Version compared to the previous version of the same object.
+
+    Used to filter the history by a changed field with one indexed query.
+    Created via reversion_compare.signals.store_changed_fields() for new versions,
+    if activated via settings.REVERSION_COMPARE_CHANGED_FIELDS and via the
+    "backfill_changed_fields" management command for existing versions.
+    """
+
+    version = models.ForeignKey(
+        Version,
+        on_delete=models.CASCADE,
+        related_name='compare_changed_fields',
+        verbose_name=_('version'),
+    )
+    field_name = models.CharField(max_length=255, verbose_name=_('field name'))
+
+    class Meta:
+        verbose_name = _('changed field')
+        verbose_name_plural = _('changed fields')
+        constraints = (
+            models.UniqueConstraint(fields=('version', 'field_name'), name='reversion_compare_unique_changed_field'),
+        )
+        indexes = (models.Index(fields=('field_name', 'version'), name='reversion_compare_field_name'),)
+
+    def __str__(self):
+        return f'{self.version_id}: {self.field_name}'
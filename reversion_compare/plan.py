@@ -0,0 +1,179 @@
+"""
+    plan
+    ~~~~
+
+    The compare plan: Everything about the compared fields of one model, that doesn't
+    depend on the compared versions. It's created once per compare class and model
+    and used for every compare.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import dataclasses
+import logging
+import types
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import models
+from django.dispatch import receiver
+from reversion import is_registered
+from reversion.revisions import _get_options
+
+
+logger = logging.getLogger(__name__)
+
+_compare_plans = {}  # {(compare class, model, compare_fields, compare_exclude, follow): ComparePlan}
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldPlan:
+    field: models.Field
+    field_name: str
+    attname: str | None  # None for reverse relations
+    is_reversed: bool
+    is_related: bool
+    follow: bool | None  # None for non-relation fields
+    flatchoices: types.MappingProxyType  # {value: label} of the field choices
+    compare_method_names: tuple[str, ...]  # Candidates of the compare method, see: get_compare_method()
+    compare_foreign_objects_as_id: bool
+    ignore_not_registered: bool
+
+
+@dataclasses.dataclass(frozen=True)
+class ComparePlan:
+    fields: tuple[FieldPlan, ...]
+    reverse_fields: tuple  # All reverse ForeignKey fields of the model
+
+
+def get_compare_method_names(field, field_name, is_reversed) -> tuple[str, ...]:
+    """
+    Returns the names of the compare methods for the field, in order:
+        1. compare_{field_name}
+        2. compare_ManyToOneRel  (reverse fields only)
+        3. compare_{internal_type}
+    """
+    candidates = [field_name]
+    if is_reversed:
+        candidates.append('ManyToOneRel')
+    candidates.append(field.get_internal_type())
+    return tuple(f'compare_{suffix}' for suffix in candidates)
+
+
+def get_compare_method(compare_instance, method_names) -> Callable:
+    """
+    Returns the first existing bound compare method of the compare instance (e.g. the ModelAdmin)
+    or the fallback_compare() method. The plan is shared by all instances, so only the names
+    are stored in the plan: compare_* methods set on an instance are used, too.
+    """
+    for method_name in method_names:
+        func = getattr(compare_instance, method_name, None)
+        if callable(func):
+            return func
+    return compare_instance.fallback_compare
+
+
+def get_follow_fields(model) -> tuple:
+    """
+    Returns the "follow" fields of the current django-reversion registration of the model.
+    """
+    return tuple(_get_options(model).follow) if is_registered(model) else ()
+
+
+def build_compare_plan(compare_instance, model) -> ComparePlan:
+    fields, reverse_fields = compare_instance._get_compare_fields(model)
+    follow_fields = get_follow_fields(model)
+    compare_foreign_objects_as_id = getattr(settings, 'REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID', False)
+    ignore_not_registered = getattr(settings, 'REVERSION_COMPARE_IGNORE_NOT_REGISTERED', False)
+
+    field_plans = []
+    for field, field_name in fields:
+        is_reversed = field in reverse_fields
+        is_related = getattr(field, 'related_model', None) is not None
+        if not is_related:
+            follow = None
+        else:
+            follow = field_name in follow_fields
+
+        field_plans.append(
+            FieldPlan(
+                field=field,
+                field_name=field_name,
+                attname=getattr(field, 'attname', None),
+                is_reversed=is_reversed,
+                is_related=is_related,
+                follow=follow,
+                flatchoices=types.MappingProxyType(dict(getattr(field, 'flatchoices', None) or ())),
+                compare_method_names=get_compare_method_names(field, field_name, is_reversed),
+                compare_foreign_objects_as_id=compare_foreign_objects_as_id,
+                ignore_not_registered=ignore_not_registered,
+            )
+        )
+    return ComparePlan(fields=tuple(field_plans), reverse_fields=tuple(reverse_fields))
+
+
+def _as_key(value):
+    if isinstance(value, (list, set)):
+        return tuple(value)
+    return value
+
+
+def get_compare_plan(compare_instance, model) -> ComparePlan:
+    """
+    Returns the cached compare plan of the compare class (e.g. the ModelAdmin) and model.
+    The "follow" fields are part of the key, so a changed django-reversion registration creates a new plan.
+    """
+    key = (
+        type(compare_instance),
+        model,
+        _as_key(compare_instance.compare_fields),
+        _as_key(compare_instance.compare_exclude),
+        get_follow_fields(model),
+    )
+    try:
+        return _compare_plans[key]
+    except KeyError:
+        plan = _compare_plans[key] = build_compare_plan(compare_instance, model)
+        return plan
+
+
+def get_compare_admin(model, admin_site=None):
+    """
+    Returns the registered compare ModelAdmin of the model or None
+    """
+    from django.contrib import admin
+
+    from reversion_compare.mixins import CompareMixin
+
+    admin_site = admin_site or admin.site
+    model_admin = admin_site._registry.get(model)
+    if isinstance(model_admin, CompareMixin):
+        return model_admin
+    return None
+
+
+def warm_compare_plans(admin_site=None) -> None:
+    """
+    Create the compare plans of all compare ModelAdmins of the admin site.
+    """
+    from django.contrib import admin
+
+    from reversion_compare.mixins import CompareMixin
+
+    admin_site = admin_site or admin.site
+    for model, model_admin in admin_site._registry.items():
+        if isinstance(model_admin, CompareMixin):
+            get_compare_plan(model_admin, model)
+    logger.debug('%i compare plans created', len(_compare_plans))
+
+
+def clear_compare_plans() -> None:
+    _compare_plans.clear()
+
+
+@receiver(setting_changed)
+def clear_compare_plans_on_setting_changed(*, setting, **kwargs):
+    if setting.startswith('REVERSION_COMPARE_'):
+        clear_compare_plans()
@@ -0,0 +1,211 @@
+"""
+    set_diff
+    ~~~~~~~~
+
+    Memory bounded compare of huge many-to-many and reverse relation sets.
+
+    If a relation has more items than settings.REVERSION_COMPARE_RELATION_DIGEST_SIZE
+    the related versions are not loaded: The items are compared via a digest of the
+    serialized data: The stored VersionDigest (if activated via
+    settings.REVERSION_COMPARE_VERSION_DIGESTS) or created in the database.
+    All queries use chunked id lists.
+    Only the first items (settings.REVERSION_COMPARE_RELATION_PAGE_SIZE) of every
+    category (changed, removed, added etc.) are loaded and shown, with the number of
+    the other items.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import dataclasses
+import heapq
+import itertools
+
+from django.conf import settings
+from django.db.models import CharField
+from django.db.models.functions import MD5, Coalesce
+from django.utils.encoding import force_str
+
+from reversion_compare.models import compute_digest
+
+
+# Default max. number of related items, that are compared with the full version data:
+RELATION_DIGEST_SIZE = 1000
+
+# Default number of shown items of every change category in the digest mode:
+RELATION_PAGE_SIZE = 100
+
+# Max. number of ids in one "IN" query, e.g. SQLite has a limit of query parameters:
+QUERY_CHUNK_SIZE = 500
+
+# Store and use the digests of the versions? Disabled by default, because it needs our own table:
+VERSION_DIGESTS = False
+
+
+def get_version_digests_enabled() -> bool:
+    return getattr(settings, 'REVERSION_COMPARE_VERSION_DIGESTS', VERSION_DIGESTS)
+
+
+def get_relation_digest_size() -> int:
+    return getattr(settings, 'REVERSION_COMPARE_RELATION_DIGEST_SIZE', RELATION_DIGEST_SIZE)
+
+
+def get_relation_page_size() -> int:
+    return getattr(settings, 'REVERSION_COMPARE_RELATION_PAGE_SIZE', RELATION_PAGE_SIZE)
+
+
+def use_digests(*id_sets) -> bool:
+    """
+    Compare the relation via digests? (0 == never)
+    """
+    digest_size = get_relation_digest_size()
+    return bool(digest_size) and any(len(ids) > digest_size for ids in id_sets)
+
+
+def chunked(ids, size=QUERY_CHUNK_SIZE):
+    iterator = iter(ids)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def id_sort_key(object_id: str):
+    """
+    Sort numeric ids by value and before all other ids.
+    """
+    if object_id.isdigit():
+        return 0, int(object_id), ''
+    return 1, 0, object_id
+
+
+def annotate_digests(queryset):
+    """
+    Annotate the digest of the serialized data as "compare_digest_value", created in the database.
+    Uses the stored VersionDigest, if activated.
+    """
+    if get_version_digests_enabled():
+        digest = Coalesce('compare_digest__digest', MD5('serialized_data'), output_field=CharField())
+    else:
+        digest = MD5('serialized_data')
+    return queryset.annotate(compare_digest_value=digest)
+
+
+def with_digests(queryset):
+    """
+    Use the stored VersionDigest instead of loading the serialized data, if activated.
+    Otherwise the queryset is unchanged: Hashing every related version in the database
+    on every compare is more expensive than loading the serialized data.
+    """
+    if not get_version_digests_enabled():
+        return queryset
+    return annotate_digests(queryset.defer('serialized_data'))
+
+
+def get_version_digest(version) -> str:
+    """
+    Returns the digest of the serialized data, see: annotate_digests()
+    """
+    digest = getattr(version, 'compare_digest_value', None)
+    if digest is None:
+        digest = compute_digest(version.serialized_data)
+    return digest
+
+
+def same_version_data(version1, version2) -> bool:
+    """
+    Have both versions the same serialized data? Uses the digests, if annotated via with_digests()
+    """
+    if hasattr(version1, 'compare_digest_value') and hasattr(version2, 'compare_digest_value'):
+        return version1.compare_digest_value == version2.compare_digest_value
+    return version1.serialized_data == version2.serialized_data
+
+
+def get_version_digests(revision, content_type, object_ids) -> dict:
+    """
+    Returns {object_id: digest of the serialized data} of the versions in the revision.
+    """
+    digests = {}
+    for chunk in chunked(object_ids):
+        digests.update(
+            annotate_digests(revision.version_set.filter(content_type=content_type, object_id__in=chunk))
+            .order_by()
+            .values_list('object_id', 'compare_digest_value')
+        )
+    return digests
+
+
+def get_versions(revision, content_type, object_ids) -> dict:
+    """
+    Returns {object_id: Version} of the versions in the revision.
+    """
+    versions = {}
+    for chunk in chunked(object_ids):
+        for version in revision.version_set.filter(content_type=content_type, object_id__in=chunk):
+            versions[version.object_id] = version
+    return versions
+
+
+def get_existing_ids(model, object_ids, using=None) -> set:
+    """
+    Returns the ids of all existing objects.
+    """
+    queryset = model._default_manager.using(using)
+    existing_ids = set()
+    for chunk in chunked(object_ids):
+        existing_ids.update(map(force_str, queryset.filter(pk__in=chunk).values_list('pk', flat=True)))
+    return existing_ids
+
+
+def get_objects(model, object_ids) -> dict:
+    """
+    Returns {object_id: model instance} of the existing objects.
+    """
+    objects = {}
+    for chunk in chunked(object_ids):
+        objects.update((force_str(obj.pk), obj) for obj in model.objects.filter(pk__in=chunk))
+    return objects
+
+
+@dataclasses.dataclass
+class RelationSetDiff:
+    """
+    The object ids of every change category of a relation, see: diff_digests()
+    """
+
+    changed_items: set
+    removed_items: set
+    added_items: set
+    same_items: set
+    same_missing_objects: set
+    removed_missing_objects: set
+    added_missing_objects: set
+
+
+def diff_digests(digests1: dict, digests2: dict, missing_ids1: set, missing_ids2: set) -> RelationSetDiff:
+    """
+    Split the object ids into the change categories, in the same way as CompareObjects.get_m2s_change_info()
+
+    digests1/digests2: {object_id: digest} of the related versions
+    missing_ids1/missing_ids2: ids of the existing, but not followed objects
+    """
+    removed_items = digests1.keys() - digests2.keys()
+    both = digests1.keys() & digests2.keys()
+
+    # Removed from the versions, but still a not followed object -> same:
+    moved_ids = removed_items & (missing_ids2 - missing_ids1)
+
+    return RelationSetDiff(
+        changed_items={object_id for object_id in both if digests1[object_id] != digests2[object_id]},
+        removed_items=removed_items - moved_ids,
+        added_items=digests2.keys() - digests1.keys(),
+        same_items={object_id for object_id in both if digests1[object_id] == digests2[object_id]},
+        same_missing_objects=(missing_ids1 & missing_ids2) | moved_ids,
+        removed_missing_objects=missing_ids1 - missing_ids2,
+        added_missing_objects=missing_ids2 - missing_ids1 - moved_ids,
+    )
+
+
+def first_ids(object_ids, count) -> list:
+    """
+    Returns the first ids in a stable order.
+    """
+    return heapq.nsmallest(count, object_ids, key=id_sort_key)
@@ -0,0 +1,73 @@
+"""
+    signals
+    ~~~~~~~
+
+    Signal receivers, connected in AppConfig.ready()
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import logging
+from functools import partial
+
+from django.db import transaction
+
+from reversion_compare.changed_fields import get_changed_fields_enabled, get_previous_version, store_changed_fields
+from reversion_compare.models import VersionDigest, compute_digest
+from reversion_compare.plan import get_compare_admin
+from reversion_compare.set_diff import get_version_digests_enabled
+
+
+logger = logging.getLogger(__name__)
+
+
+def store_version_digests(sender, revision, versions, **kwargs):
+    """
+    post_revision_commit receiver: Store the VersionDigest of all versions of the revision.
+    Must be activated via settings.REVERSION_COMPARE_VERSION_DIGESTS = True
+    """
+    if not get_version_digests_enabled():
+        return
+
+    VersionDigest.objects.using(revision._state.db).bulk_create(
+        [VersionDigest(version=version, digest=compute_digest(version.serialized_data)) for version in versions],
+        ignore_conflicts=True,
+    )
+
+
+def store_changed_fields_receiver(sender, revision, versions, **kwargs):
+    """
+    post_revision_commit receiver: Store the changed fields of all versions of the revision,
+    that have a compare ModelAdmin. Must be activated via settings.REVERSION_COMPARE_CHANGED_FIELDS = True
+
+    The fields are stored after the revision transaction is committed,
+    so a failed compare can't roll back the saved revision.
+    """
+    if not get_changed_fields_enabled():
+        return
+
+    transaction.on_commit(partial(store_changed_fields_of_versions, versions), using=revision._state.db)
+
+
+def store_changed_fields_of_versions(versions):
+    for version in versions:
+        model = version._model
+        compare_admin = get_compare_admin(model)
+        if compare_admin is None:
+            continue
+
+        try:
+            previous_version = get_previous_version(version)
+            if previous_version is None:
+                continue  # A new object: Nothing to compare
+
+            obj = model._default_manager.using(version.db).filter(pk=version.object_id).first()
+            if obj is None:
+                continue
+
+            store_changed_fields(compare_admin, obj, previous_version, version)
+        except Exception:
+            # e.g.: The previous version can't be loaded after a model migration.
+            # The index is incomplete, but the "backfill_changed_fields" command can fill the gap.
+            logger.exception('Changed fields of version %s not stored', version.pk)
@@ -0,0 +1,93 @@
+"""
+    store
+    ~~~~~
+
+    Materialized compare results of every Version and its previous version.
+
+    The results are created ahead of time via the "store_compare_results" management
+    command and stored in the database, e.g. for the busiest models. The compare view
+    uses a stored result, if it exists. Like the cache, only the diffs of the plain fields
+    are stored: relation fields are compared on every request. Disabled by default, activate it in settings:
+
+        REVERSION_COMPARE_STORE = True
+
+    Every result is saved with the compare config key (see: cache.get_compare_config_key())
+    So a changed configuration or a package update never uses outdated results.
+    The config key contains the language and timezone: A request with a language or timezone,
+    that was not given to the command, doesn't use the stored results.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from reversion.models import Version
+
+import reversion_compare
+from reversion_compare.models import StoredCompareResult
+
+
+def get_compare_store() -> bool:
+    return getattr(settings, 'REVERSION_COMPARE_STORE', False)
+
+
+def get_stored_data(config_key: str, version1, version2) -> dict | None:
+    """
+    Returns the stored compare result data of version2 and its previous version1 or None
+    """
+    return (
+        StoredCompareResult.objects.using(version2._state.db)
+        .filter(version=version2.pk, previous_version=version1.pk, config_key=config_key)
+        .values_list('data', flat=True)
+        .first()
+    )
+
+
+def store_data(config_key: str, version1, version2, data: dict) -> None:
+    StoredCompareResult.objects.using(version2._state.db).update_or_create(
+        version_id=version2.pk,
+        previous_version_id=version1.pk,
+        config_key=config_key,
+        defaults={'package_version': reversion_compare.__version__, 'data': data},
+    )
+
+
+def iter_version_pairs(model, is_done, model_db=None, chunk_size=100):
+    """
+    Yields (object, previous version, version) of all versions of the existing model instances.
+    Skips the versions, that are already done: is_done is a boolean expression, e.g. Exists()
+    The versions are fetched in chunks, so only the current pair is hold in memory.
+    """
+    queryset = (
+        Version.objects.get_for_model(model, model_db=model_db)
+        .select_related('revision')
+        .annotate(is_done=is_done)
+        .order_by('object_id', 'pk')
+    )
+    manager = model._default_manager.using(model_db)
+    previous_version = obj = None
+    for version in queryset.iterator(chunk_size=chunk_size):
+        if previous_version is None or previous_version.object_id != version.object_id:
+            obj = manager.filter(pk=version.object_id).first()
+        elif obj is not None and not version.is_done:
+            yield obj, previous_version, version
+        previous_version = version
+
+
+def get_stored_expression(config_key: str):
+    """
+    Is a result with the config key stored for the version? see: iter_version_pairs()
+    """
+    return Exists(StoredCompareResult.objects.filter(version=OuterRef('pk'), config_key=config_key))
+
+
+def delete_stale_results(model, config_keys, model_db=None) -> int:
+    """
+    Delete all stored results of the model, that were created with another config.
+    """
+    queryset = StoredCompareResult.objects.filter(
+        version__in=Version.objects.get_for_model(model, model_db=model_db).values('pk'),
+    ).exclude(config_key__in=list(config_keys))
+    deleted, __ = queryset.delete()
+    return deleted
@@ -0,0 +1,142 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.admin import AdminSite
+from django.test import override_settings
+from django.urls import path
+from reversion.models import Version
+
+from reversion_compare import executor, helpers
+from reversion_compare.admin import AsyncCompareVersionAdmin
+from reversion_compare.views import AsyncHistoryCompareDetailView
+from reversion_compare_project.models import SimpleModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class SimpleModelAsyncHistoryCompareView(AsyncHistoryCompareDetailView):
+    model = SimpleModel
+
+
+async_admin_site = AdminSite()
+async_admin_site.register(SimpleModel, AsyncCompareVersionAdmin)
+
+urlpatterns = [
+    path("test_view/<path:pk>/", SimpleModelAsyncHistoryCompareView.as_view(), name='test_view'),
+    path("admin/", async_admin_site.urls),
+]
+
+
+# The TestCase transaction is not visible in other threads, so compare in the request thread:
+@override_settings(ROOT_URLCONF=__name__, REVERSION_COMPARE_ASYNC_WORKERS=0)
+class AsyncViewsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        __, self.item = Fixtures(verbose=False).create_Simple_data()
+        self.version_ids = list(Version.objects.get_for_object(self.item).values_list('pk', flat=True))
+
+    def test_admin_history(self):
+        response = self.client.get(f'/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/')
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="submit" value="compare">',
+                '<input type="radio" name="version_id1" value="7" style="visibility:hidden" />',
+                '<input type="radio" name="version_id1" value="6" checked="checked" />',
+            ),
+        )
+
+    def test_admin_compare(self):
+        response = self.client.get(
+            f'/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/compare/',
+            data={'version_id1': self.version_ids[1], 'version_id2': self.version_ids[0]},
+        )
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<del>- v3</del>',
+                '<ins>+ v4</ins>',
+            ),
+        )
+
+        response = self.client.get(
+            f'/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/compare/',
+            data={'version_id1': 999, 'version_id2': self.version_ids[0]},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_login_required(self):
+        self.client.logout()
+        response = self.client.get(f'/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/')
+        self.assertRedirects(
+            response,
+            f'/admin/login/?next=/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/',
+            fetch_redirect_response=False,
+        )
+
+    def test_detail_view(self):
+        response = self.client.get(f'/test_view/{self.item.pk}/')
+        self.assert_html_parts(
+            response,
+            parts=('<input type="radio" name="version_id1" value="6" checked="checked" />',),
+        )
+        self.assertNotContains(response, '<ins>')
+
+        response = self.client.get(
+            f'/test_view/{self.item.pk}/',
+            data={'version_id1': self.version_ids[1], 'version_id2': self.version_ids[0]},
+        )
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<del>- v3</del>',
+                '<ins>+ v4</ins>',
+            ),
+        )
+
+        response = self.client.get('/test_view/999/')
+        self.assertEqual(response.status_code, 404)
+
+
+class CompareExecutorTestCase(BaseTestCase):
+    def tearDown(self):
+        super().tearDown()
+        executor.shutdown_compare_executor()
+
+    @override_settings(REVERSION_COMPARE_ASYNC_WORKERS=2)
+    def test_bounded_executor(self):
+        compare_executor = executor.get_compare_executor()
+        self.assertEqual(compare_executor._max_workers, 2)
+        self.assertIs(executor.get_compare_executor(), compare_executor)
+
+        thread_name = async_to_sync(executor.run_in_compare_executor)(lambda: threading.current_thread().name)
+        self.assertTrue(thread_name.startswith('reversion_compare'), thread_name)
+
+    def test_setting_changed(self):
+        compare_executor = executor.get_compare_executor()
+        with override_settings(REVERSION_COMPARE_ASYNC_WORKERS=0):
+            self.assertIsNone(executor.get_compare_executor())
+            with mock.patch.object(executor, 'sync_to_async', wraps=executor.sync_to_async) as sync_to_async:
+                self.assertEqual(async_to_sync(executor.run_in_compare_executor)(sum, [1, 2]), 3)
+            sync_to_async.assert_called_once_with(sum)
+        self.assertIsNot(executor.get_compare_executor(), compare_executor)
+
+
+class DiffExecutorTestCase(BaseTestCase):
+    def tearDown(self):
+        super().tearDown()
+        executor.shutdown_diff_executor()
+
+    @override_settings(REVERSION_COMPARE_DIFF_WORKERS=1, REVERSION_COMPARE_DIFF_EXECUTOR='process')
+    def test_process_pool_uses_spawn(self):
+        diff_executor = executor.get_diff_executor()
+        self.assertIsInstance(diff_executor, ProcessPoolExecutor)
+        self.assertEqual(diff_executor._mp_context.get_start_method(), 'spawn')
+
+        # Only the engine name and the values are sent to the worker:
+        future = diff_executor.submit(helpers._generate_parallel_diff, 'one', 'two', helpers.SEMANTIC, 'dmp', 10)
+        html, complete = future.result(timeout=60)
+        self.assertIn('<del>one</del><ins>two</ins>', html)
+        self.assertIs(complete, True)
@@ -0,0 +1,155 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from reversion import create_revision, set_comment
+from reversion.models import Version
+
+from reversion_compare import blame, mixins
+from reversion_compare import cache as cache_module
+from reversion_compare.admin import CompareVersionAdmin
+from reversion_compare.blame import blame_lines, split_lines
+from reversion_compare_project.models import SimpleModel
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class BlameLinesTestCase(SimpleTestCase):
+    def test_split_lines(self):
+        self.assertEqual(split_lines(''), [])
+        self.assertEqual(split_lines('one'), ['one'])
+        self.assertEqual(split_lines('one\ntwo\n'), ['one\n', 'two\n'])
+        self.assertEqual(split_lines('one\n\ntwo'), ['one\n', '\n', 'two'])
+
+    def test_blame_lines(self):
+        self.assertEqual(blame_lines('', [], 'one\ntwo\n', 1), ([1, 1], True))
+        self.assertEqual(blame_lines('one\ntwo\n', [1, 2], 'zero\none\nTWO\n', 3), ([3, 1, 3], True))
+        self.assertEqual(blame_lines('a\nb\nc\n', [1, 2, 3], 'a\nc\n', 4), ([1, 3], True))
+        self.assertEqual(blame_lines('a\nb\n', [1, 2], '', 3), ([], True))
+
+    def test_blame_lines_timeout(self):
+        with mock.patch.object(blame.time, 'monotonic', side_effect=[0, 100]):
+            owners, exact = blame_lines('one\ntwo\n', [1, 2], 'zero\none\nTWO\n', 3)
+        self.assertFalse(exact)
+        self.assertEqual(len(owners), 3)
+
+        with override_settings(REVERSION_COMPARE_DIFF_TIMEOUT=0), mock.patch.object(
+            blame.time, 'monotonic', side_effect=[0, 100]
+        ):
+            self.assertEqual(blame_lines('one\n', [1], 'one\ntwo\n', 2), ([1, 2], True))
+
+
+class FieldBlameTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.texts = (
+            'one\ntwo\nthree\n',
+            'one\n2\nthree\n',
+            'zero\none\n2\nthree\nfour\n',
+        )
+        for text in self.texts:
+            self.create_version(text)
+        cache.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def create_version(self, text):
+        with create_revision():
+            if not hasattr(self, 'item'):
+                self.item = SimpleModel.objects.create(text=text)
+            else:
+                self.item.text = text
+                self.item.save()
+            set_comment(f'set {text!r}')
+
+    def get_blame(self):
+        compare_admin = CompareVersionAdmin(SimpleModel, admin_site=None)
+        blame = compare_admin.get_field_blame(self.item, 'text', Version.objects.get_for_object(self.item))
+        return [(line['number'], line['line'], line['version'].pk, line['first']) for line in blame.lines]
+
+    def test_get_field_blame(self):
+        v1, v2, v3 = Version.objects.get_for_object(self.item).order_by('pk').values_list('pk', flat=True)
+        self.assertEqual(
+            self.get_blame(),
+            [
+                (1, 'zero', v3, True),
+                (2, 'one', v1, True),
+                (3, '2', v2, True),
+                (4, 'three', v1, True),
+                (5, 'four', v3, True),
+            ],
+        )
+
+    @override_settings(REVERSION_COMPARE_CACHE='default')
+    def test_cached_owners(self):
+        with mock.patch.object(mixins, 'blame_lines', wraps=blame_lines) as m:
+            blame = self.get_blame()
+        self.assertEqual(m.call_count, 2)
+
+        # Same result from the cache:
+        with mock.patch.object(mixins, 'blame_lines', wraps=blame_lines) as m:
+            self.assertEqual(self.get_blame(), blame)
+        m.assert_not_called()
+
+        # One new version -> only one diff:
+        self.create_version('zero\none\n2\nthree\nfour\nfive\n')
+        with mock.patch.object(mixins, 'blame_lines', wraps=blame_lines) as m:
+            blame = self.get_blame()
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(len(blame), 6)
+        self.assertEqual(blame[-1][1:], ('five', Version.objects.get_for_object(self.item).first().pk, True))
+
+    @override_settings(REVERSION_COMPARE_CACHE='default')
+    def test_approximate_owners_are_not_cached(self):
+        def inexact_blame_lines(*args):
+            owners, __ = blame_lines(*args)
+            return owners, False
+
+        compare_admin = CompareVersionAdmin(SimpleModel, admin_site=None)
+        queryset = Version.objects.get_for_object(self.item)
+        with mock.patch.object(mixins, 'blame_lines', side_effect=inexact_blame_lines) as m:
+            blame = compare_admin.get_field_blame(self.item, 'text', queryset)
+        self.assertEqual(m.call_count, 2)
+        self.assertTrue(blame.approximate)
+
+        # Only the owners of the first version are cached, the others are created again:
+        with mock.patch.object(mixins, 'blame_lines', wraps=blame_lines) as m:
+            blame = compare_admin.get_field_blame(self.item, 'text', queryset)
+        self.assertEqual(m.call_count, 2)
+        self.assertFalse(blame.approximate)
+
+    def test_approximate_admin_view(self):
+        url = f'/en/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/blame/text/'
+        self.assertNotContains(self.client.get(url), 'The blame is approximate')
+        with mock.patch.object(mixins, 'blame_lines', return_value=([1, 1, 1, 1, 1], False)):
+            self.assertContains(self.client.get(url), 'The blame is approximate')
+
+    def test_version_committed_in_between(self):
+        def get_blame_cache_key(version_pk, attname):
+            if not hasattr(self, 'new_version'):
+                # A version is committed after the version pks are fetched:
+                self.create_version('one\n')
+                self.new_version = Version.objects.get_for_object(self.item).first()
+            return cache_module.get_blame_cache_key(version_pk, attname)
+
+        with (
+            override_settings(REVERSION_COMPARE_CACHE='default'),
+            mock.patch.object(mixins, 'get_blame_cache_key', side_effect=get_blame_cache_key),
+        ):
+            blame = self.get_blame()
+        self.assertEqual([line[1] for line in blame], ['zero', 'one', '2', 'three', 'four'])
+
+    def test_admin_view(self):
+        url = f'/en/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/blame/'
+        response = self.client.get(f'{url}text/')
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<title>Reversion Compare Test | Blame of text</title>',
+                '<td><pre class="highlight">zero</pre></td>',
+                f'<td>set {self.texts[2]!r}</td>',
+            ),
+        )
+        response = self.client.get(f'{url}foo/')
+        self.assertEqual(response.status_code, 404)
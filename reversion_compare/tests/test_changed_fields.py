@@ -0,0 +1,125 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from reversion import create_revision
+from reversion.models import Version
+
+from reversion_compare.mixins import CompareMixin
+from reversion_compare.models import ChangedField
+from reversion_compare_project.models import Person, Pet, SimpleModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+@override_settings(REVERSION_COMPARE_CHANGED_FIELDS=True)
+class ChangedFieldsTestCase(BaseTestCase):
+    def create_data(self):
+        # The changed fields are stored after the transaction is committed:
+        with self.captureOnCommitCallbacks(execute=True):
+            with create_revision():
+                pets = [Pet.objects.create(name=f'pet {no}') for no in range(2)]
+                person = Person.objects.create(name='person')
+                person.pets.set(pets[:1])
+            with create_revision():
+                person.name = 'person changed'
+                person.save()
+            with create_revision():
+                person.pets.set(pets)
+                person.save()
+        return person
+
+    def get_changed_fields(self, obj):
+        queryset = ChangedField.objects.order_by('field_name').values_list('field_name', flat=True)
+        versions = Version.objects.get_for_object(obj).order_by('pk')
+        return [list(queryset.filter(version=version)) for version in versions]
+
+    def test_post_revision_commit(self):
+        person = self.create_data()
+        self.assertEqual(self.get_changed_fields(person), [[], ['name', 'workplace'], ['pets', 'workplace']])
+        # The pets are not changed:
+        self.assertFalse(ChangedField.objects.exclude(version__object_id=person.pk).exists())
+
+    def test_compare_error(self):
+        with (
+            mock.patch.object(CompareMixin, 'get_changed_fields', side_effect=ValueError('compare failed')),
+            self.assertLogs('reversion_compare.signals', level='ERROR') as logs,
+        ):
+            person = self.create_data()  # The revisions are saved
+        self.assertEqual(Version.objects.get_for_object(person).count(), 3)
+        self.assertFalse(ChangedField.objects.exists())
+        self.assertIn('ValueError: compare failed', logs.output[0])
+
+    def test_disabled_and_backfill(self):
+        with override_settings(REVERSION_COMPARE_CHANGED_FIELDS=False):
+            person = self.create_data()
+        self.assertFalse(ChangedField.objects.exists())
+
+        output = StringIO()
+        call_command('backfill_changed_fields', 'reversion_compare_project.Person', chunk_size=2, stdout=output)
+        self.assertEqual(output.getvalue(), 'reversion_compare_project.Person: 2 versions indexed.\n')
+        self.assertEqual(self.get_changed_fields(person), [[], ['name', 'workplace'], ['pets', 'workplace']])
+
+        # Resume: Only the versions without changed fields:
+        ChangedField.objects.filter(version=Version.objects.get_for_object(person).first()).delete()
+        output = StringIO()
+        call_command('backfill_changed_fields', 'reversion_compare_project.Person', stdout=output)
+        self.assertEqual(output.getvalue(), 'reversion_compare_project.Person: 1 versions indexed.\n')
+        self.assertEqual(self.get_changed_fields(person), [[], ['name', 'workplace'], ['pets', 'workplace']])
+
+    def test_admin_history_filter(self):
+        person = self.create_data()
+        version_ids = list(Version.objects.get_for_object(person).values_list('pk', flat=True))
+        with self.assertNumQueries(6):  # session, user, index check, versions, object, LogEntry count
+            response = self.client.get(
+                f'/en/admin/reversion_compare_project/person/{person.pk}/history/', data={'changed_field': 'name'}
+            )
+        self.assertContains(response, 'Only versions with changes of the field "name".')
+        self.assertContains(response, '<input type="hidden" name="changed_field" value="name">', html=True)
+        self.assertContains(response, '<th scope="row">', count=1)
+        self.assertContains(response, f'/history/{version_ids[1]}/')
+
+    def test_history_filter_without_index(self):
+        person = self.create_data()
+        url = f'/en/admin/reversion_compare_project/person/{person.pk}/history/'
+        message = (
+            'The versions can\'t be filtered by changes of the field "name":'
+            ' The changed fields of these versions are not stored. All versions are displayed.'
+        )
+
+        # Not activated: Display all versions instead of none:
+        with override_settings(REVERSION_COMPARE_CHANGED_FIELDS=False):
+            response = self.client.get(url, data={'changed_field': 'name'})
+        self.assertContains(response, message)
+        self.assertNotContains(response, 'Only versions with changes')
+        self.assertContains(response, '<th scope="row">', count=3)
+
+        # Activated, but not backfilled:
+        ChangedField.objects.all().delete()
+        response = self.client.get(url, data={'changed_field': 'name'})
+        self.assertContains(response, message)
+        self.assertContains(response, '<th scope="row">', count=3)
+
+        call_command('backfill_changed_fields', 'reversion_compare_project.Person', stdout=StringIO())
+        response = self.client.get(url, data={'changed_field': 'name'})
+        self.assertNotContains(response, message)
+        self.assertContains(response, '<th scope="row">', count=1)
+
+    def test_cbv_history_filter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            item1, __ = Fixtures(verbose=False).create_Simple_data()
+            version_ids = list(Version.objects.get_for_object(item1).values_list('pk', flat=True))
+            with create_revision():
+                SimpleModel.objects.filter(pk=item1.pk).first().save()  # Nothing changed
+
+        response = self.client.get(f'/en/test_view/{item1.pk}/', data={'changed_field': 'text'})
+        self.assertContains(response, '<th scope="row">', count=1)
+        self.assertContains(response, '<td>simply change the CharField text.</td>')
+        self.assertNotContains(response, '<ins>')  # Not a compare request
+
+        response = self.client.get(
+            f'/en/test_view/{item1.pk}/',
+            data={'changed_field': 'text', 'version_id1': version_ids[1], 'version_id2': version_ids[0]},
+        )
+        self.assert_html_parts(response, parts=('<ins>+ version two</ins>',))
@@ -0,0 +1,120 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from reversion.models import Version
+
+from reversion_compare import cache as cache_module
+from reversion_compare.admin import CompareVersionAdmin
+from reversion_compare.cache import get_compare_cache_key
+from reversion_compare.helpers import diff_memo
+from reversion_compare.mixins import CompareMixin
+from reversion_compare_project.models import Factory, SimpleModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+@override_settings(REVERSION_COMPARE_CACHE='default')
+class CompareCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.item1, self.item2 = Fixtures(verbose=False).create_Simple_data()
+        self.version_ids = Version.objects.get_for_object(self.item1).values_list('pk', flat=True)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def get_compare(self):
+        return self.client.get(
+            f'/en/admin/reversion_compare_project/simplemodel/{self.item1.pk}/history/compare/',
+            data={'version_id2': self.version_ids[0], 'version_id1': self.version_ids[1]},
+        )
+
+    def assert_diff(self, response):
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<del>- version one</del>',
+                '<ins>+ version two</ins>',
+                '<blockquote>simply change the CharField text.</blockquote>',
+            ),
+        )
+
+    def test_admin_compare_view(self):
+        with mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m:
+            self.assert_diff(self.get_compare())
+            self.assertEqual(m.call_count, 1)
+
+            # Second request is served from the cache:
+            self.assert_diff(self.get_compare())
+            self.assertEqual(m.call_count, 1)
+
+        # Changed settings -> other cache key:
+        with (
+            override_settings(REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID=True),
+            mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m,
+        ):
+            self.assert_diff(self.get_compare())
+            self.assertEqual(m.call_count, 1)
+
+    def test_truncated_result_not_cached(self):
+        diff_memo.clear()  # The complete diff may be memorized by other tests
+        with (
+            override_settings(REVERSION_COMPARE_DIFF_MAX_SIZE=5),
+            mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m,
+        ):
+            for _ in range(2):
+                self.assertContains(self.get_compare(), 'values differ')
+            self.assertEqual(m.call_count, 2)
+
+        # The full diff is not hidden by the degraded one:
+        self.assert_diff(self.get_compare())
+
+    def test_cbv(self):
+        with mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m:
+            for _ in range(2):
+                response = self.client.get(
+                    f'/en/test_view/{self.item1.pk}/',
+                    data={'version_id2': self.version_ids[0], 'version_id1': self.version_ids[1]},
+                )
+                self.assert_diff(response)
+            self.assertEqual(m.call_count, 1)
+
+    def test_cache_key(self):
+        compare_admin = CompareVersionAdmin(SimpleModel, admin_site=None)
+        version1, version2 = Version.objects.get_for_object(self.item1).order_by('pk')
+        key = get_compare_cache_key(compare_admin, self.item1, version1, version2)
+        self.assertRegex(key, rf'^reversion_compare:compare:[0-9a-f]{{64}}:{version1.pk}:{version2.pk}$')
+
+        compare_admin.compare_exclude = ('text',)
+        self.assertNotEqual(get_compare_cache_key(compare_admin, self.item1, version1, version2), key)
+
+        # Settings, that don't change the result, don't change the key:
+        key = get_compare_cache_key(compare_admin, self.item1, version1, version2)
+        with override_settings(REVERSION_COMPARE_TIMING=True, REVERSION_COMPARE_CACHE_TIMEOUT=1):
+            self.assertEqual(get_compare_cache_key(compare_admin, self.item1, version1, version2), key)
+
+        # Stable key for callables instead of dotted paths:
+        with override_settings(REVERSION_COMPARE_JSON_DECODER=json.loads):
+            self.assertIn(
+                ('REVERSION_COMPARE_JSON_DECODER', 'json.loads'), cache_module.get_reversion_compare_settings()
+            )
+
+        with override_settings(REVERSION_COMPARE_CACHE=None):
+            self.assertIsNone(get_compare_cache_key(compare_admin, self.item1, version1, version2))
+
+    def test_live_related_objects(self):
+        car = Fixtures(verbose=False).create_FactoryCar_data()
+        version_ids = Version.objects.get_for_object(car).values_list('pk', flat=True)
+        data = {'version_id2': version_ids[1], 'version_id1': version_ids[2]}
+        url = f'/en/admin/reversion_compare_project/car/{car.pk}/history/compare/'
+        self.assertContains(self.client.get(url, data=data), 'always the same supplier<sup class="follow">*</sup>')
+
+        # The relation fields are compared with the live related objects, so they are not cached:
+        Factory.objects.filter(name='always the same supplier').update(name='renamed supplier')
+        response = self.client.get(url, data=data)
+        self.assertContains(response, '    renamed supplier<sup class="follow">*</sup>')
+        self.assertNotContains(response, 'always the same supplier<sup class="follow">*</sup>')
@@ -0,0 +1,136 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from reversion import create_revision
+from reversion.models import Version
+
+from reversion_compare.helpers import diff_memo
+from reversion_compare.mixins import CompareMixin
+from reversion_compare.models import StoredCompareResult
+from reversion_compare_project.models import SimpleModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+@override_settings(REVERSION_COMPARE_STORE=True)
+class CompareStoreTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.item1, self.item2 = Fixtures(verbose=False).create_Simple_data()
+        self.version_ids = Version.objects.get_for_object(self.item1).values_list('pk', flat=True)
+
+    def store_results(self, *args, **kwargs):
+        output = StringIO()
+        call_command('store_compare_results', 'reversion_compare_project.SimpleModel', *args, stdout=output, **kwargs)
+        return output.getvalue()
+
+    def get_compare(self, language='en'):
+        return self.client.get(
+            f'/{language}/admin/reversion_compare_project/simplemodel/{self.item1.pk}/history/compare/',
+            data={'version_id2': self.version_ids[0], 'version_id1': self.version_ids[1]},
+        )
+
+    def assert_diff(self, response):
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<del>- version one</del>',
+                '<ins>+ version two</ins>',
+                '<blockquote>simply change the CharField text.</blockquote>',
+            ),
+        )
+
+    def test_store_and_compare_view(self):
+        # item1 has 2 and item2 has 5 versions:
+        output = self.store_results(chunk_size=2)
+        self.assertEqual(output, 'reversion_compare_project.SimpleModel: 5 compare results stored.\n')
+        self.assertEqual(StoredCompareResult.objects.count(), 5)
+
+        stored = StoredCompareResult.objects.get(version=self.version_ids[0])
+        self.assertEqual(stored.previous_version_id, self.version_ids[1])
+        self.assertEqual([item['field_name'] for item in stored.data['diff']], ['text'])
+
+        with mock.patch.object(CompareMixin, 'compare', autospec=True) as m:
+            self.assert_diff(self.get_compare())
+        m.assert_not_called()
+
+        # Disabled -> the stored results are not used:
+        with (
+            override_settings(REVERSION_COMPARE_STORE=False),
+            mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m,
+        ):
+            self.assert_diff(self.get_compare())
+        self.assertEqual(m.call_count, 1)
+
+    def test_resume(self):
+        self.store_results()
+        StoredCompareResult.objects.filter(version=self.version_ids[0]).delete()
+        with create_revision():
+            self.item2.text = 'v5'
+            self.item2.save()
+
+        self.assertEqual(self.store_results(), 'reversion_compare_project.SimpleModel: 2 compare results stored.\n')
+        self.assertEqual(StoredCompareResult.objects.count(), 6)
+
+        # Deleted objects have no compare view:
+        SimpleModel.objects.filter(pk=self.item1.pk).delete()
+        StoredCompareResult.objects.all().delete()
+        self.assertEqual(self.store_results(), 'reversion_compare_project.SimpleModel: 5 compare results stored.\n')
+
+    def test_truncated_results_not_stored(self):
+        diff_memo.clear()  # The complete diff may be memorized by other tests
+        with override_settings(REVERSION_COMPARE_DIFF_MAX_SIZE=1):
+            output = self.store_results()
+        self.assertEqual(
+            output,
+            'reversion_compare_project.SimpleModel: 0 compare results stored. 5 truncated compare results skipped.\n',
+        )
+        self.assertFalse(StoredCompareResult.objects.exists())
+
+        # Stored by the next run:
+        self.assertEqual(self.store_results(), 'reversion_compare_project.SimpleModel: 5 compare results stored.\n')
+
+    def test_config_changed(self):
+        self.store_results()
+        with override_settings(REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID=True):
+            # Stored results of the old config are not used:
+            with mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m:
+                self.assert_diff(self.get_compare())
+            self.assertEqual(m.call_count, 1)
+
+            output = self.store_results(delete_stale=True)
+            self.assertEqual(
+                output,
+                'reversion_compare_project.SimpleModel: 5 stale compare results deleted.\n'
+                'reversion_compare_project.SimpleModel: 5 compare results stored.\n',
+            )
+        self.assertEqual(StoredCompareResult.objects.count(), 5)
+
+    def test_languages(self):
+        self.store_results()
+
+        # Not stored for other languages -> compare on the fly:
+        with mock.patch.object(CompareMixin, 'compare', autospec=True, side_effect=CompareMixin.compare) as m:
+            self.assertContains(self.get_compare(language='de'), '<ins>+ version two</ins>', html=True)
+        self.assertEqual(m.call_count, 1)
+
+        output = self.store_results(languages=['de'], timezones=['UTC', 'Europe/Paris'])
+        self.assertEqual(output, 'reversion_compare_project.SimpleModel: 10 compare results stored.\n')
+        with mock.patch.object(CompareMixin, 'compare', autospec=True) as m:
+            self.assertContains(self.get_compare(language='de'), '<ins>+ version two</ins>', html=True)
+        m.assert_not_called()
+
+        # All results of the given languages and timezones are kept:
+        output = self.store_results(all_languages=True, delete_stale=True)
+        self.assertEqual(
+            output,
+            'reversion_compare_project.SimpleModel: 5 stale compare results deleted.\n'
+            'reversion_compare_project.SimpleModel: 0 compare results stored.\n',
+        )
+        self.assertEqual(StoredCompareResult.objects.count(), 10)
+
+    def test_unknown_model(self):
+        with self.assertRaisesMessage(CommandError, "Model 'reversion_compare.VersionDigest' is not registered"):
+            call_command('store_compare_results', 'reversion_compare.VersionDigest')
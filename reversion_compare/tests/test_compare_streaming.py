@@ -0,0 +1,75 @@
+import logging
+import re
+
+from django.core.cache import cache
+from django.test import override_settings
+from reversion.models import Version
+
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+def strip_csrf_token(content):
+    # The masked token is different on every render
+    return re.sub(r'name="csrfmiddlewaretoken" value="[^"]+"', '', content)
+
+
+class CompareStreamingTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        fixtures = Fixtures(verbose=False)
+        self.car = fixtures.create_FactoryCar_data()
+
+        queryset = Version.objects.get_for_object(self.car)
+        self.version_ids = queryset.values_list("pk", flat=True)
+        self.compare_url = f"/en/admin/reversion_compare_project/car/{self.car.pk}/history/compare/"
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def get_streaming_content(self, data):
+        with override_settings(REVERSION_COMPARE_STREAMING=True):
+            response = self.client.get(self.compare_url, data=data)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            return strip_csrf_token(b''.join(response.streaming_content).decode('utf-8'))
+
+    def test_same_html_as_without_streaming(self):
+        data = {"version_id2": self.version_ids[0], "version_id1": self.version_ids[1]}
+        content = self.get_streaming_content(data)
+        self.assertInHTML('<h4 class="follow">Note:</h4>', content)  # info for non-follow related information
+
+        response = self.client.get(self.compare_url, data=data)
+        self.assertFalse(response.streaming)
+        self.assertHTMLEqual(content, strip_csrf_token(response.content.decode('utf-8')))
+
+    def test_no_differences(self):
+        data = {"version_id2": self.version_ids[0], "version_id1": self.version_ids[0]}
+        content = self.get_streaming_content(data)
+        self.assertInHTML('<p><strong>There are no differences.</strong></p>', content)
+
+    @override_settings(REVERSION_COMPARE_CACHE='default')
+    def test_result_cache(self):
+        data = {"version_id2": self.version_ids[0], "version_id1": self.version_ids[1]}
+        streamed_content = self.get_streaming_content(data)
+
+        # The streamed result was stored in the cache -> the page is rendered directly:
+        with override_settings(REVERSION_COMPARE_STREAMING=True):
+            response = self.client.get(self.compare_url, data=data)
+        self.assertFalse(response.streaming)
+        self.assertHTMLEqual(streamed_content, strip_csrf_token(response.content.decode('utf-8')))
+
+
+class CompareStreamingFallbackTestCase(BaseTestCase):
+    @override_settings(REVERSION_COMPARE_STREAMING=True)
+    def test_compare_raw(self):
+        Fixtures(verbose=False).create_MigrationModel_data()
+
+        with self.assertLogs('reversion_compare', level=logging.WARNING):
+            response = self.client.get(
+                '/en/admin/reversion_compare_project/migrationmodel/1/history/compare/',
+                data={'version_id2': 3, 'version_id1': 2},
+            )
+        self.assertFalse(response.streaming)
+        self.assertTemplateUsed(response, 'reversion-compare/compare_raw.html')
@@ -12,13 +12,16 @@
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
 
+from unittest import mock
 
 from django.db import connection
 from django.test.utils import CaptureQueriesContext
 from reversion import is_registered, revisions, unregister
 from reversion.models import Revision, Version
 
-from reversion_compare_project.models import Car, Factory, Person
+from reversion_compare.compare import CompareObject, get_parent_models
+from reversion_compare.plan import clear_compare_plans
+from reversion_compare_project.models import Building, Car, Factory, Person
 from reversion_compare_project.utils.fixtures import Fixtures
 from reversion_compare_project.utils.test_cases import BaseTestCase
 
@@ -40,6 +43,7 @@ class FactoryCarReverseRelationModelTest(BaseTestCase):
         revisions.register(Factory, follow=["building_ptr", "cars", "workers"])
         revisions.register(Car)
         revisions.register(Person, follow=["pets"])
+        clear_compare_plans()
         super().setUp()
 
         fixtures = Fixtures(verbose=False)
@@ -112,3 +116,38 @@ class FactoryCarReverseRelationModelTest(BaseTestCase):
         # duplicate queries: 9
 
         self.assertLess(len(queries.captured_queries), 37 + 2)  # real+buffer
+
+    def test_related_versions_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/en/admin/reversion_compare_project/factory/{self.factory.pk}/history/compare/",
+                data={"version_id2": self.version_ids[1], "version_id1": self.version_ids[2]},
+            )
+            self.assert_diff1(response)
+
+        # The related versions of all relation fields are loaded with one query per revision:
+        related_version_queries = [
+            query['sql'] for query in queries.captured_queries if '"reversion_version"."object_id" IN (' in query['sql']
+        ]
+        self.assertEqual(len(related_version_queries), 2, related_version_queries)
+
+    def test_parent_relation(self):
+        self.assertEqual(get_parent_models(Factory), (Building,))
+        self.assertEqual(get_parent_models(Car), ())
+
+        # The "workers" relation is defined on the Building parent model.
+        # Only the existence of the parent version is checked, it's not deserialized:
+        with mock.patch.object(Version, '_object_version', new_callable=mock.PropertyMock) as object_version:
+            object_version.side_effect = AssertionError('Parent version deserialized')
+            obj_compare = CompareObject(
+                field=Factory._meta.get_field('workers'),
+                field_name='workers',
+                obj=self.factory,
+                version_record=Version.objects.get(pk=self.version_ids[1]),
+                follow=True,
+                compare_foreign_objects_as_id=False,
+                ignore_not_registered=False,
+            )
+            with self.assertNumQueries(2):
+                ids = obj_compare._get_parent_reverse_foreign_key_ids(self.factory)
+        self.assertEqual(ids, {str(person.pk) for person in Person.objects.filter(name='Bob Bobertson')})
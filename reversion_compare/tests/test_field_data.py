@@ -0,0 +1,91 @@
+import json
+from unittest import mock
+
+from django.contrib import admin
+from django.test import override_settings
+from reversion import RevertError
+from reversion.models import Version
+
+from reversion_compare.compare import CompareObjects
+from reversion_compare.field_data import VersionFieldData, get_field_data, get_unchanged_fields
+from reversion_compare_project.models import MigrationModel, VariantModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class VersionFieldDataTestCase(BaseTestCase):
+    def test_same_values_as_field_dict(self):
+        item, __ = Fixtures(verbose=False).create_VariantModel_data()
+        for version in Version.objects.get_for_object(item):
+            field_data = VersionFieldData(version)
+            self.assertNotIn('_object_version', version.__dict__)
+
+            # FileField has an own descriptor, so it's not a plain field:
+            self.assertNotIn('file_field', field_data.values)
+            self.assertIn('json_field', field_data.values)
+            for name, value in field_data.values.items():
+                self.assertEqual(value, version.field_dict[name], name)
+
+            # Other fields fall back to the field_dict:
+            self.assertEqual(field_data.get('file_field'), version.field_dict['file_field'])
+
+    def test_compare_without_deserialization(self):
+        item, __ = Fixtures(verbose=False).create_VariantModel_data()
+        queryset = Version.objects.get_for_object(item)
+        version1, version2 = queryset.last(), queryset.first()
+
+        model_admin = admin.site._registry[VariantModel]
+        with mock.patch.object(model_admin, 'compare_fields', ('char', 'text', 'integer', 'datetime', 'decimal')):
+            result = model_admin.compare(item, version1, version2)
+        changed_fields = [entry['field'].name for entry in result.diff]
+        self.assertEqual(changed_fields, ['char', 'text', 'integer', 'datetime', 'decimal'])
+
+        self.assertNotIn('_object_version', version1.__dict__)
+        self.assertNotIn('_object_version', version2.__dict__)
+
+    def test_relation_fields_deserialize_lazily(self):
+        car = Fixtures(verbose=False).create_FactoryCar_data()
+        version = Version.objects.get_for_object(car).first()
+        field_data = get_field_data(version)
+        self.assertIs(get_field_data(version), field_data)  # cached on the version
+
+        self.assertEqual(field_data.get('name'), car.name)
+        self.assertNotIn('_object_version', version.__dict__)
+
+        self.assertEqual(field_data.get('manufacturer_id'), car.manufacturer_id)
+        self.assertIn('_object_version', version.__dict__)
+
+    def test_json_decoder_setting(self):
+        car = Fixtures(verbose=False).create_FactoryCar_data()
+        version = Version.objects.get_for_object(car).first()
+
+        with (
+            override_settings(REVERSION_COMPARE_JSON_DECODER='json.loads'),
+            mock.patch('json.loads', wraps=json.loads) as loads,
+        ):
+            VersionFieldData(version)
+        loads.assert_called_once_with(version.serialized_data)
+
+    def test_incompatible_version_data(self):
+        Fixtures(verbose=False).create_MigrationModel_data()
+        version = Version.objects.get_for_model(MigrationModel).get(pk=2)
+        with self.assertRaisesMessage(RevertError, 'incompatible version data'):
+            VersionFieldData(version)
+
+    def test_prefilter_unchanged_fields(self):
+        item, __ = Fixtures(verbose=False).create_VariantModel_data()
+        queryset = Version.objects.get_for_object(item)
+        version1 = queryset.get(revision__comment="2 change: 'null_boolean' field.")
+        version2 = queryset.get(revision__comment="3 change: 'char' field.")
+        unchanged_fields = get_unchanged_fields(get_field_data(version1), get_field_data(version2))
+        self.assertIn('text', unchanged_fields)
+        self.assertNotIn('char', unchanged_fields)
+        self.assertNotIn('file_field', unchanged_fields)  # Not a plain field
+
+        # Only the changed field and the non-plain fields are compared via CompareObjects:
+        model_admin = admin.site._registry[VariantModel]
+        with mock.patch('reversion_compare.mixins.CompareObjects', wraps=CompareObjects) as compare_objects:
+            result = model_admin.compare(item, version1, version2)
+        self.assertEqual([entry['field'].name for entry in result.diff], ['char', 'file_field'])
+        compared_fields = [call.args[1] for call in compare_objects.call_args_list]
+        self.assertEqual(compared_fields, ['char', 'file_field'])
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from reversion import create_revision, set_comment
+from reversion.models import Version
+
+from reversion_compare.admin import CompareVersionAdmin
+from reversion_compare.field_data import VersionFieldData
+from reversion_compare_project.models import SimpleModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class FieldTimelineTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        __, self.item = Fixtures(verbose=False).create_Simple_data()
+        with create_revision():
+            self.item.save()  # Nothing changed
+            set_comment('unchanged')
+        with create_revision():
+            self.item.text = 'v5'
+            self.item.save()
+            set_comment('change to v5')
+        self.version_ids = list(Version.objects.get_for_object(self.item).order_by('pk').values_list('pk', flat=True))
+
+    def test_get_field_timeline(self):
+        compare_admin = CompareVersionAdmin(SimpleModel, admin_site=None)
+        versions = Version.objects.get_for_object(self.item).select_related('revision').order_by('pk')
+        with mock.patch.object(VersionFieldData, '_load', autospec=True, side_effect=VersionFieldData._load) as m:
+            timeline = compare_admin.get_field_timeline(self.item, 'text', versions)
+        self.assertEqual(m.call_count, 7)  # Every version is deserialized once
+
+        self.assertEqual(
+            [entry['version'].pk for entry in timeline],
+            [pk for pk in self.version_ids if pk != self.version_ids[5]],  # Without the unchanged version
+        )
+        self.assertEqual(timeline[0]['value'], 'v0')
+        self.assertNotIn('previous_version', timeline[0])
+        self.assertEqual(timeline[1]['previous_version'].pk, self.version_ids[0])
+        self.assertInHTML('<ins>+ v1</ins>', str(timeline[1]['diff']))
+
+        # The unchanged version is carried forward:
+        self.assertEqual(timeline[-1]['previous_version'].pk, self.version_ids[5])
+        self.assertInHTML('<ins>+ v5</ins>', str(timeline[-1]['diff']))
+
+    def test_admin_view(self):
+        url = f'/en/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/field/'
+        response = self.client.get(f'{url}text/')
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<title>Reversion Compare Test | Changes of text</title>',
+                '<pre class="highlight">v0</pre>',
+                '<del>- v4</del>',
+                '<ins>+ v5</ins>',
+                '<blockquote>change to v5</blockquote>',
+                (
+                    f'<a href="/en/admin/reversion_compare_project/simplemodel/{self.item.pk}/history/compare/'
+                    f'?version_id1={self.version_ids[5]}&amp;version_id2={self.version_ids[6]}">'
+                    'Compare all fields &rsaquo;</a>'
+                ),
+            ),
+        )
+        self.assertNotContains(response, '<blockquote>unchanged</blockquote>')
+
+        response = self.client.get(f'{url}foo/')
+        self.assertEqual(response.status_code, 404)
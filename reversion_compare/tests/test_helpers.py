@@ -1,15 +1,32 @@
+import random
+import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
 
 from diff_match_patch import diff_match_patch
+from django.core.cache import cache
+from django.test import override_settings
 
+from reversion_compare import helpers
 from reversion_compare.helpers import (
     EFFICIENCY,
     SEMANTIC,
+    DiffBudget,
+    DiffEngine,
+    DiffMemoInfo,
+    ParallelDiffs,
     diff2lines,
+    diff_memo,
+    dmp_char_diff,
+    generate_diff,
     generate_dmp_diff,
     generate_ndiff,
+    histogram_diff,
     html_diff,
     lines2html,
+    ndiff_lines,
+    sequence_matcher_diff,
 )
 
 
@@ -166,6 +183,314 @@ class HtmlDiffTestCase(unittest.TestCase):
         )
 
 
+class DiffMemoTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        diff_memo.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        diff_memo.clear()
+        cache.clear()
+
+    def test_repeated_pair_is_diffed_once(self):
+        value1 = 'more than 20 Characters or?'
+        value2 = 'More than 20 characters, or?'
+        with mock.patch.object(helpers, '_engine_diff', wraps=helpers._engine_diff) as m:
+            html1 = html_diff(value1, value2)
+            html2 = html_diff(value1, value2)
+            self.assertEqual(html1, html2)
+            self.assertEqual(m.call_count, 1)
+
+            # Other cleanup -> other key:
+            html_diff(value1, value2, cleanup=None)
+            self.assertEqual(m.call_count, 2)
+
+        self.assertEqual(diff_memo.info(), DiffMemoInfo(hits=1, cache_hits=0, misses=2, size=2, maxsize=256))
+
+    def test_key(self):
+        self.assertNotEqual(
+            diff_memo.make_key('ab', 'c', SEMANTIC, 'dmp'),
+            diff_memo.make_key('a', 'bc', SEMANTIC, 'dmp'),
+        )
+        self.assertNotEqual(
+            diff_memo.make_key('a', 'b', SEMANTIC, 'dmp'),
+            diff_memo.make_key('a', 'b', SEMANTIC, 'ndiff'),
+        )
+
+    def test_lru_size(self):
+        with override_settings(REVERSION_COMPARE_DIFF_MEMO_SIZE=2):
+            html_diff('one', 'two')
+            html_diff('one', 'three')
+            html_diff('one', 'two')  # -> hit, moved to the end
+            html_diff('one', 'four')  # -> 'one'/'three' will be removed
+            self.assertEqual(diff_memo.info(), DiffMemoInfo(hits=1, cache_hits=0, misses=3, size=2, maxsize=2))
+            html_diff('one', 'two')
+            html_diff('one', 'three')
+            self.assertEqual(diff_memo.info(), DiffMemoInfo(hits=2, cache_hits=0, misses=4, size=2, maxsize=2))
+
+        with override_settings(REVERSION_COMPARE_DIFF_MEMO_SIZE=0):
+            diff_memo.clear()
+            html_diff('one', 'two')
+            html_diff('one', 'two')
+            self.assertEqual(diff_memo.info(), DiffMemoInfo(hits=0, cache_hits=0, misses=2, size=0, maxsize=0))
+
+    def test_max_length(self):
+        html1 = html_diff('one', 'two')
+        html2 = html_diff('one', 'three')
+        self.assertEqual(diff_memo.length, len(html1) + len(html2))
+
+        with override_settings(REVERSION_COMPARE_DIFF_MEMO_MAX_LENGTH=len(html2) + 1):
+            html_diff('one', 'three')  # -> hit, moved to the end
+            html3 = html_diff('one', 'four')  # -> all older entries will be removed
+            self.assertEqual(diff_memo.info().size, 1)
+            self.assertEqual(diff_memo.length, len(html3))
+
+        with override_settings(REVERSION_COMPARE_DIFF_MEMO_MAX_LENGTH=len(html1) - 1):
+            diff_memo.clear()
+            html_diff('one', 'two')  # -> too big, not memorized
+            self.assertEqual(diff_memo.info().size, 0)
+            self.assertEqual(diff_memo.length, 0)
+
+    def test_django_cache_tier(self):
+        with override_settings(REVERSION_COMPARE_DIFF_MEMO_CACHE='default'):
+            html1 = html_diff('one', 'two')
+            diff_memo._entries.clear()  # e.g.: other process
+            html2 = html_diff('one', 'two')
+            self.assertEqual(html1, html2)
+            self.assertEqual(diff_memo.info(), DiffMemoInfo(hits=0, cache_hits=1, misses=1, size=1, maxsize=256))
+
+
+class DiffEnginesTestCase(unittest.TestCase):
+    value1 = 'def foo():\n    return 1\n\n\ndef bar():\n    return 2\n'
+    value2 = 'def foo():\n    return 1\n\n\ndef baz():\n    return 2\n\n\ndef bar():\n    return 2\n'
+
+    def setUp(self):
+        super().setUp()
+        diff_memo.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        diff_memo.clear()
+
+    def test_same_op_stream(self):
+        for func in (histogram_diff, sequence_matcher_diff):
+            with self.subTest(func=func):
+                diff = func(self.value1, self.value2)
+                self.assertEqual(''.join(data for op, data in diff if op != DIFF_INSERT), self.value1)
+                self.assertEqual(''.join(data for op, data in diff if op != DIFF_DELETE), self.value2)
+
+    def test_histogram_diff(self):
+        self.assertEqual(
+            histogram_diff(self.value1, self.value2),
+            [
+                (DIFF_EQUAL, 'def foo():\n    return 1\n\n\n'),
+                (DIFF_INSERT, 'def baz():\n    return 2\n\n\n'),
+                (DIFF_EQUAL, 'def bar():\n    return 2\n'),
+            ],
+        )
+        self.assertEqual(histogram_diff('a\nb\n', 'c\n'), [(DIFF_DELETE, 'a\nb\n'), (DIFF_INSERT, 'c\n')])
+        self.assertEqual(histogram_diff('', 'c'), [(DIFF_INSERT, 'c')])
+
+    def test_sequence_matcher_diff(self):
+        self.assertEqual(
+            sequence_matcher_diff('one\ntwo\n', 'one\ntwo!\n'),
+            [(DIFF_EQUAL, 'one\ntwo'), (DIFF_INSERT, '!'), (DIFF_EQUAL, '\n')],
+        )
+
+    def test_engine_selection(self):
+        self.assertEqual(
+            html_diff('one', 'two', engine='histogram'),
+            '<pre class="highlight">'
+            '<span class="diff-line diff-del diff-ins"><del>one</del><ins>two</ins></span>\n'
+            '</pre>',
+        )
+        with override_settings(REVERSION_COMPARE_DIFF_ENGINE='dmp'):
+            self.assertEqual(html_diff('one', 'two'), generate_dmp_diff('one', 'two'))
+            with helpers.use_diff_engine('histogram'):
+                self.assertEqual(html_diff('one', 'two'), generate_diff('one', 'two', engine='histogram'))
+
+        with self.assertRaisesRegex(ValueError, "Unknown diff engine 'foo'"):
+            html_diff('one', 'two', engine='foo')
+
+
+class DiffLimitsTestCase(unittest.TestCase):
+    value1 = 'more than 20 Characters or?'
+    value2 = 'More than 20 characters, or?'
+
+    def setUp(self):
+        super().setUp()
+        diff_memo.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        diff_memo.clear()
+
+    def test_max_size(self):
+        with override_settings(REVERSION_COMPARE_DIFF_MAX_SIZE=27), DiffBudget().activate() as budget:
+            html = html_diff(self.value1, self.value2 + ' ä')
+            self.assertEqual(html, '<p class="highlight diff-summary">values differ (27\xa0bytes → 31\xa0bytes)</p>')
+            self.assertTrue(budget.truncated)
+
+        with DiffBudget().activate() as budget:
+            html = html_diff(self.value1, self.value2)
+            self.assertIn('<del>m</del><ins>M</ins>ore', html)
+            self.assertFalse(budget.truncated)
+
+        # The degraded diff was not memorized:
+        self.assertEqual(diff_memo.info().size, 1)
+
+    def test_time_budget_exhausted(self):
+        with DiffBudget(seconds=0.001).activate() as budget:
+            time.sleep(0.002)
+            html = html_diff('one', 'two')
+            self.assertIn('values differ', html)
+            self.assertTrue(budget.truncated)
+
+    def test_line_level_fallback(self):
+        def slow_dmp_diff(value1, value2, timeout):
+            time.sleep(timeout)  # -> runs out of time
+            return dmp_char_diff(value1, value2, timeout=timeout)
+
+        with (
+            override_settings(REVERSION_COMPARE_DIFF_TIMEOUT=0.01),
+            mock.patch.dict(helpers.DIFF_ENGINES, {'dmp': DiffEngine(func=slow_dmp_diff, char_level=True)}),
+            DiffBudget().activate() as budget,
+        ):
+            html = html_diff(self.value1, self.value2)
+            self.assertTrue(budget.truncated)
+
+        self.assertEqual(
+            html,
+            '<pre class="highlight">'
+            '<span class="diff-line diff-del diff-ins"><del>more than 20 Characters or?</del>'
+            '<ins>More than 20 characters, or?</ins></span>\n'
+            '</pre>',
+        )
+
+    def test_engines_respect_the_timeout(self):
+        # No time left -> the changed lines are not refined:
+        self.assertEqual(
+            sequence_matcher_diff('one\ntwo\n', 'one\ntwo!\n', timeout=1e-9),
+            [(DIFF_EQUAL, 'one\n'), (DIFF_DELETE, 'two\n'), (DIFF_INSERT, 'two!\n')],
+        )
+        self.assertEqual(
+            histogram_diff('one\ntwo\n', 'one\ntwo!\n', timeout=1e-9),
+            [(DIFF_DELETE, 'one\ntwo\n'), (DIFF_INSERT, 'one\ntwo!\n')],
+        )
+
+        # Many changed lines, that can't be refined within the budget:
+        rnd = random.Random(0)
+        lines = [''.join(rnd.choices('abcdefghij ', k=rnd.randint(20, 80))) + '\n' for __ in range(300)]
+        value1 = ''.join(rnd.choices(lines, k=3000))
+        value2 = ''.join(rnd.choices(lines, k=3000))
+        for engine in ('sequencematcher', 'histogram'):
+            with (
+                self.subTest(engine=engine),
+                override_settings(REVERSION_COMPARE_DIFF_TIMEOUT=1.0),
+                DiffBudget(seconds=0.01).activate() as budget,
+                mock.patch.object(helpers, '_engine_diff', wraps=helpers._engine_diff) as m,
+            ):
+                html = html_diff(value1, value2, engine=engine)
+                self.assertTrue(budget.truncated)
+                # The degraded diff of the engine is used:
+                m.assert_called_once()
+                self.assertIn('<span class="diff-line diff-del">', html)
+                self.assertNotIn('values differ', html)
+
+    def test_ndiff_timeout(self):
+        # Many similar lines: ndiff searches the best matching pair of all lines
+        rnd = random.Random(0)
+        value1 = '\n'.join(''.join(rnd.choices('abcdefgh ', k=60)) for __ in range(1000))
+        value2 = '\n'.join(''.join(rnd.choices('abcdefgh ', k=60)) for __ in range(1000))
+        start_time = time.monotonic()
+        __, in_time = ndiff_lines(value1, value2, timeout=0.01)
+        self.assertLess(time.monotonic() - start_time, 1)
+        self.assertFalse(in_time)
+
+        self.assertEqual(ndiff_lines('one\ntwo', 'one\nthree', timeout=0), (['  one', '- two', '+ three'], True))
+
+        # ndiff runs out of time -> line-level diff:
+        with (
+            mock.patch.object(helpers, 'ndiff_lines', return_value=([], False)),
+            DiffBudget().activate() as budget,
+        ):
+            html = html_diff('one\ntwo', 'one\nthree', engine='ndiff')
+            self.assertTrue(budget.truncated)
+        self.assertEqual(
+            html,
+            '<pre class="highlight">'
+            'one\n'
+            '<span class="diff-line diff-del diff-ins"><del>two</del><ins>three</ins></span>\n'
+            '</pre>',
+        )
+
+
+class ParallelDiffsTestCase(unittest.TestCase):
+    value1 = 'more than 20 Characters or?'
+    value2 = 'More than 20 characters, or?'
+
+    def setUp(self):
+        super().setUp()
+        diff_memo.clear()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        super().tearDown()
+        diff_memo.clear()
+        self.executor.shutdown()
+
+    def test_use_submitted_diff(self):
+        parallel_diffs = ParallelDiffs(executor=self.executor, min_size=20)
+        self.assertIs(parallel_diffs.submit('small', 'values'), False)
+        self.assertIs(parallel_diffs.submit(self.value1, self.value2, engine='ndiff'), False)
+        self.assertIs(parallel_diffs.submit(self.value1, self.value2), True)
+        self.assertIs(parallel_diffs.submit(self.value1, self.value2), False)  # Already submitted
+        self.assertEqual(len(parallel_diffs.futures), 1)
+
+        with mock.patch.object(helpers, '_generate_limited_diff') as inline_diff, parallel_diffs.activate():
+            html = html_diff(self.value1, self.value2)
+        inline_diff.assert_not_called()
+        self.assertEqual(parallel_diffs.futures, {})
+        self.assertIn('<del>m</del><ins>M</ins>ore', html)
+
+        # The result was memorized:
+        self.assertEqual(html_diff(self.value1, self.value2), html)
+        self.assertEqual(diff_memo.info().hits, 1)
+
+    def test_size_summary(self):
+        parallel_diffs = ParallelDiffs(executor=self.executor)
+        with mock.patch.object(helpers, '_generate_parallel_diff', return_value=(None, False)):
+            parallel_diffs.submit(self.value1, self.value2)
+        with parallel_diffs.activate(), DiffBudget().activate() as budget:
+            html = html_diff(self.value1, self.value2)
+        self.assertIn('values differ', html)
+        self.assertTrue(budget.truncated)
+
+    def test_process_pool_engines(self):
+        executor = mock.Mock(spec=ProcessPoolExecutor)
+        parallel_diffs = ParallelDiffs(executor=executor)
+        self.assertIs(parallel_diffs.submit(self.value1, self.value2, engine='histogram'), True)
+
+        # Engines registered at runtime don't exist in the worker processes:
+        with mock.patch.dict(helpers.DIFF_ENGINES):
+            helpers.register_diff_engine('own', dmp_char_diff)
+            helpers.register_diff_engine('histogram', dmp_char_diff)
+            self.assertIs(parallel_diffs.submit(self.value1, self.value2, engine='own'), False)
+            self.assertIs(parallel_diffs.submit(self.value1, self.value2, engine='histogram'), False)
+        self.assertEqual(executor.submit.call_count, 1)
+
+        # Threads use the same engines:
+        with mock.patch.dict(helpers.DIFF_ENGINES):
+            helpers.register_diff_engine('own', dmp_char_diff)
+            self.assertIs(ParallelDiffs(executor=self.executor).submit(self.value1, self.value2, engine='own'), True)
+
+    def test_disabled(self):
+        parallel_diffs = ParallelDiffs()
+        self.assertIs(parallel_diffs.submit(self.value1, self.value2), False)
+        parallel_diffs.cancel()
+
+
 class Diff2LinesTestCase(unittest.TestCase):
     def test_basic(self):
         self.assertEqual(
@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.test import override_settings
+from reversion import revisions, unregister
+from reversion.models import Version
+
+from reversion_compare import plan
+from reversion_compare.admin import CompareVersionAdmin
+from reversion_compare.mixins import CompareMethodsMixin, CompareMixin
+from reversion_compare.plan import clear_compare_plans, get_compare_plan, warm_compare_plans
+from reversion_compare_project.models import Car, Factory, Person, SimpleModel, VariantModel
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class ComparePlanTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_compare_plans()
+
+    def test_plan(self):
+        car_admin = admin.site._registry[Car]
+        compare_plan = get_compare_plan(car_admin, Car)
+        self.assertIs(get_compare_plan(car_admin, Car), compare_plan)
+
+        field_plans = {field_plan.field_name: field_plan for field_plan in compare_plan.fields}
+        self.assertEqual(list(field_plans), ['id', 'name', 'manufacturer', 'supplier', 'Car_supplier+'])
+        self.assertIs(field_plans['Car_supplier+'].is_reversed, True)
+        self.assertIs(field_plans['Car_supplier+'].attname, None)
+
+        self.assertIs(field_plans['name'].follow, None)
+        self.assertEqual(field_plans['name'].compare_method_names, ('compare_name', 'compare_CharField'))
+        self.assertEqual(
+            field_plans['Car_supplier+'].compare_method_names,
+            ('compare_Car_supplier+', 'compare_ManyToOneRel', 'compare_ForeignKey'),
+        )
+        self.assertIs(field_plans['manufacturer'].follow, False)
+
+        methods = {
+            field_name: plan.get_compare_method(car_admin, field_plan.compare_method_names).__func__
+            for field_name, field_plan in field_plans.items()
+        }
+        self.assertIs(methods['name'], CompareMixin.fallback_compare)
+        self.assertIs(methods['manufacturer'], CompareMethodsMixin.compare_ForeignKey)
+        self.assertIs(methods['supplier'], CompareMethodsMixin.compare_ManyToManyField)
+
+        person_plan = get_compare_plan(admin.site._registry[Person], Person)
+        field_plans = {field_plan.field_name: field_plan for field_plan in person_plan.fields}
+        self.assertIs(field_plans['pets'].follow, True)
+
+    def test_flatchoices(self):
+        compare_plan = get_compare_plan(admin.site._registry[VariantModel], VariantModel)
+        field_plans = {field_plan.field_name: field_plan for field_plan in compare_plan.fields}
+        self.assertEqual(dict(field_plans['choices_char'].flatchoices), {'a': 'alpha', 'b': 'bravo'})
+        self.assertEqual(dict(field_plans['char'].flatchoices), {})
+
+    def test_own_compare_method(self):
+        class OwnCompareAdmin(CompareVersionAdmin):
+            def compare_name(self, obj_compare):
+                return 'own compare'
+
+        model_admin = OwnCompareAdmin(Car, admin.site)
+        field_plans = {field_plan.field_name: field_plan for field_plan in get_compare_plan(model_admin, Car).fields}
+        func = plan.get_compare_method(model_admin, field_plans['name'].compare_method_names)
+        self.assertIs(func.__func__, OwnCompareAdmin.compare_name)
+
+    def test_instance_compare_method(self):
+        item1, __ = Fixtures(verbose=False).create_Simple_data()
+        version1, version2 = Version.objects.get_for_object(item1).order_by('pk')
+
+        model_admin = CompareVersionAdmin(SimpleModel, admin.site)
+        result = model_admin.compare(item1, version1, version2)  # Creates the shared plan
+        self.assertNotEqual([item['diff'] for item in result.diff], ['instance text'])
+
+        # A compare method set on the instance (e.g. per request) is used with the same plan:
+        other_admin = CompareVersionAdmin(SimpleModel, admin.site)
+        other_admin.compare_text = lambda obj_compare: f'instance {obj_compare.field_name}'
+        result = other_admin.compare(item1, version1, version2)
+        self.assertEqual([item['diff'] for item in result.diff], ['instance text'])
+
+        result = model_admin.compare(item1, version1, version2)
+        self.assertNotEqual([item['diff'] for item in result.diff], ['instance text'])
+
+    def test_own_get_compare(self):
+        class OwnGetCompareAdmin(CompareVersionAdmin):
+            def _get_compare(self, obj_compare, reverse_fields):
+                return f'own {obj_compare.field_name}'
+
+        item1, __ = Fixtures(verbose=False).create_Simple_data()
+        version1, version2 = Version.objects.get_for_object(item1).order_by('pk')
+        result = OwnGetCompareAdmin(SimpleModel, admin.site).compare(item1, version1, version2)
+        self.assertEqual([item['diff'] for item in result.diff], ['own text'])
+
+    def test_compare_fields(self):
+        car_admin = admin.site._registry[Car]
+        compare_plan = get_compare_plan(car_admin, Car)
+        with mock.patch.object(car_admin, 'compare_exclude', ['supplier']):
+            other_plan = get_compare_plan(car_admin, Car)
+        self.assertIsNot(other_plan, compare_plan)
+        self.assertNotIn('supplier', [field_plan.field_name for field_plan in other_plan.fields])
+
+    def test_settings_changed(self):
+        car_admin = admin.site._registry[Car]
+        compare_plan = get_compare_plan(car_admin, Car)
+        self.assertIs(compare_plan.fields[0].compare_foreign_objects_as_id, False)
+        with override_settings(REVERSION_COMPARE_FOREIGN_OBJECTS_AS_ID=True):
+            other_plan = get_compare_plan(car_admin, Car)
+            self.assertIs(other_plan.fields[0].compare_foreign_objects_as_id, True)
+        self.assertIsNot(get_compare_plan(car_admin, Car), other_plan)
+
+    def test_registration_changed(self):
+        factory_admin = admin.site._registry[Factory]
+
+        def get_follow(field_name):
+            field_plans = {
+                field_plan.field_name: field_plan for field_plan in get_compare_plan(factory_admin, Factory).fields
+            }
+            return field_plans[field_name].follow
+
+        with mock.patch.dict(revisions._registered_models):  # Restore the registration
+            unregister(Factory)
+            revisions.register(Factory, follow=['building_ptr'])
+            self.assertIs(get_follow('cars'), False)
+
+            unregister(Factory)
+            revisions.register(Factory, follow=['building_ptr', 'cars'])
+            self.assertIs(get_follow('cars'), True)
+
+    def test_warm_compare_plans(self):
+        warm_compare_plans()
+        self.assertIn(
+            (type(admin.site._registry[Car]), Car, None, None, plan.get_follow_fields(Car)), plan._compare_plans
+        )
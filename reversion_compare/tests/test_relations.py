@@ -1,7 +1,21 @@
 import logging
+from unittest import mock
 
-from reversion.models import Version
+from django.contrib import admin
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from reversion import create_revision, revisions, unregister
+from reversion.models import Revision, Version
 
+from reversion_compare import compare, set_diff
+from reversion_compare.compare import CompareObjects, get_deleted_versions, get_latest_versions_before
+from reversion_compare.plan import clear_compare_plans, get_compare_plan
+from reversion_compare.set_diff import chunked, diff_digests, first_ids, get_existing_ids
+from reversion_compare_project.models import Car, Factory, Person, Pet
 from reversion_compare_project.utils.fixtures import Fixtures
 from reversion_compare_project.utils.test_cases import BaseTestCase
 
@@ -47,3 +61,228 @@ class RelationTestCase(BaseTestCase):
                 '<ins>+ Bar 2</ins>',
             ),
         )
+
+
+class UnfollowedRelationTestCase(BaseTestCase):
+    def setUp(self):
+        unregister(Factory)
+        revisions.register(Factory, follow=['building_ptr'])  # Don't follow the "cars" reverse relation
+        clear_compare_plans()
+        super().setUp()
+
+    def create_factory_data(self, car_count):
+        with create_revision():
+            factory = Factory.objects.create(name='factory', address='1 Fake Plaza')
+            for no in range(car_count):
+                Car.objects.create(name=f'car {no}', manufacturer=factory)
+
+        with create_revision():
+            factory.name = 'factory changed'
+            factory.save()
+        return factory
+
+    def test_latest_versions_before(self):
+        with create_revision():
+            factory = Factory.objects.create(name='factory', address='1 Fake Plaza')
+            car1 = Car.objects.create(name='car 1', manufacturer=factory)
+            car2 = Car.objects.create(name='car 2', manufacturer=factory)
+        with create_revision():
+            car2.name = 'car 2 changed'
+            car2.save()
+        with create_revision():
+            car3 = Car.objects.create(name='car 3', manufacturer=factory)
+        with create_revision():
+            car3.name = 'car 3 changed'
+            car3.save()
+
+        revisions = list(Revision.objects.order_by('pk'))
+        car_ids = [str(car.pk) for car in (car1, car2, car3)]
+        with self.assertNumQueries(1):
+            versions = get_latest_versions_before(Car, car_ids, revisions[3])
+        self.assertEqual(
+            {object_id: version.revision_id for object_id, version in versions.items()},
+            {car_ids[0]: revisions[0].pk, car_ids[1]: revisions[1].pk, car_ids[2]: revisions[2].pk},
+        )
+        self.assertEqual(get_latest_versions_before(Car, car_ids, revisions[0]), {})
+
+    def get_compare_queries(self, factory):
+        version2, version1 = Version.objects.get_for_object(factory)
+        model_admin = admin.site._registry[Factory]
+        with CaptureQueriesContext(connection) as queries:
+            result = model_admin.compare(factory, version1, version2)
+        self.assertTrue(result.has_unfollowed_fields)
+        return len(queries)
+
+    def test_unfollowed_reverse_relation_queries(self):
+        # The number of queries doesn't depend on the number of related objects
+        # (the first compare fills e.g. the ContentType cache):
+        queries = [self.get_compare_queries(self.create_factory_data(car_count=count)) for count in (1, 2, 6)]
+        self.assertEqual(queries[1], queries[2])
+
+
+class DeletedVersionsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with create_revision():
+            factory = Factory.objects.create(name='factory', address='1 Fake Plaza')
+            cars = [Car.objects.create(name=f'car {no}', manufacturer=factory) for no in range(3)]
+        with create_revision():
+            cars[1].name = 'car 1 changed'
+            cars[1].save()
+
+        cars[0].delete()
+        cars[1].delete()
+        self.revision1, self.revision2 = Revision.objects.order_by('pk')
+        self.car_content_type = ContentType.objects.get_for_model(Car)
+        self.factory_content_type = ContentType.objects.get_for_model(Factory)
+
+    def tearDown(self):
+        super().tearDown()
+        cache.clear()
+
+    def test_same_as_get_deleted(self):
+        for revision in (self.revision1, self.revision2):
+            deleted = get_deleted_versions(revision, [Car, Factory])
+            self.assertEqual(
+                deleted,
+                {
+                    self.car_content_type.pk: list(Version.objects.filter(revision=revision).get_deleted(Car)),
+                    self.factory_content_type.pk: [],
+                },
+            )
+        self.assertEqual(len(get_deleted_versions(self.revision1, [Car])[self.car_content_type.pk]), 2)
+        self.assertEqual(len(get_deleted_versions(self.revision2, [Car])[self.car_content_type.pk]), 1)
+
+    @override_settings(REVERSION_COMPARE_CACHE='default')
+    def test_cache(self):
+        deleted = get_deleted_versions(self.revision1, [Car, Factory])
+        self.assertEqual(len(deleted[self.car_content_type.pk]), 2)
+        with mock.patch.object(compare, 'get_existing_ids', wraps=get_existing_ids) as m:
+            self.assertEqual(get_deleted_versions(self.revision1, [Car, Factory]), deleted)
+        # The cached deleted cars are not checked again:
+        checked = {call.args[0]: sorted(call.args[1]) for call in m.call_args_list}
+        self.assertEqual(checked, {Car: [str(Car.objects.get().pk)], Factory: [str(Factory.objects.get().pk)]})
+
+        # Objects deleted after the result was cached are found:
+        Car.objects.all().delete()
+        self.assertEqual(len(get_deleted_versions(self.revision1, [Car, Factory])[self.car_content_type.pk]), 3)
+
+
+class DigestRelationTestCase(BaseTestCase):
+    def get_change_info(self, obj, field_name, **settings):
+        version2, version1 = Version.objects.get_for_object(obj)[:2]
+        model_admin = admin.site._registry[type(obj)]
+        field_plan = next(
+            field_plan for field_plan in get_compare_plan(model_admin, type(obj)).fields
+            if field_plan.field_name == field_name
+        )
+        with override_settings(**settings):
+            obj_compare = CompareObjects(
+                field_plan.field, field_name, obj, version1, version2, field_plan.is_reversed, plan=field_plan
+            )
+            if field_plan.is_reversed:
+                return obj_compare.get_m2o_change_info()
+            return obj_compare.get_m2m_change_info()
+
+    def assert_same_change_info(self, obj, field_name):
+        change_info = self.get_change_info(obj, field_name)
+        digest_change_info = self.get_change_info(obj, field_name, REVERSION_COMPARE_RELATION_DIGEST_SIZE=1)
+        self.assertEqual(digest_change_info.pop('more'), dict.fromkeys(digest_change_info, 0))
+        self.assertEqual(digest_change_info, change_info)
+        return change_info
+
+    def test_many_to_many(self):
+        with create_revision():
+            pets = [Pet.objects.create(name=f'pet {no}') for no in range(6)]
+            person = Person.objects.create(name='person')
+            person.pets.set(pets)
+        with create_revision():
+            pets[2].name = 'pet 2 changed'
+            pets[2].save()
+            person.pets.remove(pets[0])
+            person.pets.add(Pet.objects.create(name='pet 6'))
+            person.save()
+
+        change_info = self.assert_same_change_info(person, 'pets')
+        self.assertEqual([str(item) for item in change_info['removed_items']], ['pet 0'])
+        self.assertEqual([str(item) for item in change_info['added_items']], ['pet 6'])
+        self.assertEqual(len(change_info['changed_items']), 1)
+        self.assertEqual(len(change_info['same_items']), 4)
+
+        # Only the first items are loaded and the number of the others is returned:
+        change_info = self.get_change_info(
+            person, 'pets', REVERSION_COMPARE_RELATION_DIGEST_SIZE=1, REVERSION_COMPARE_RELATION_PAGE_SIZE=2
+        )
+        self.assertEqual([str(item) for item in change_info['same_items']], ['pet 1', 'pet 3'])
+        self.assertEqual(change_info['more']['same_items'], 2)
+
+        html = render_to_string(
+            'reversion-compare/compare_generic_many_to_many.html', {'change_info': change_info}
+        )
+        self.assertIn('&hellip; and 2 more<br />', html)
+
+    def test_unfollowed_reverse_relation(self):
+        unregister(Factory)
+        revisions.register(Factory, follow=['building_ptr'])  # Don't follow the "cars" reverse relation
+        clear_compare_plans()
+        with create_revision():
+            factory = Factory.objects.create(name='factory', address='1 Fake Plaza')
+            cars = [Car.objects.create(name=f'car {no}', manufacturer=factory) for no in range(4)]
+        with create_revision():
+            cars[1].name = 'car 1 changed'
+            cars[1].save()
+            Car.objects.create(name='car 4', manufacturer=factory)
+            factory.save()
+        deleted_car_id = str(cars[0].pk)
+        cars[0].delete()
+        cars[3].manufacturer = Factory.objects.create(name='other factory', address='2 Fake Plaza')
+        cars[3].save()
+
+        change_info = self.assert_same_change_info(factory, 'cars')
+        self.assertEqual([item.object_id for item in change_info['deleted_items']], [deleted_car_id])
+
+    def test_unfollowed_reverse_relation_missing_objects(self):
+        unregister(Factory)
+        revisions.register(Factory, follow=['building_ptr'])  # Don't follow the "cars" reverse relation
+        clear_compare_plans()
+        with create_revision():
+            factory = Factory.objects.create(name='factory', address='1 Fake Plaza')
+            cars = [Car.objects.create(name=f'car {no}', manufacturer=factory) for no in range(3)]
+        with create_revision():
+            car_between = Car.objects.create(name='car between', manufacturer=factory)  # Not in the factory revisions
+        with create_revision():
+            cars[1].name = 'car 1 changed'
+            cars[1].save()
+            factory.save()
+        Car.objects.create(name='car without version', manufacturer=factory)
+        deleted_car_id = str(cars[0].pk)
+        cars[0].delete()
+
+        # Both paths display only the missing objects with a previous version, with chunked "IN" lists:
+        with (
+            mock.patch.object(compare, 'chunked', side_effect=lambda ids: chunked(ids, size=2)),
+            mock.patch.object(set_diff, 'chunked', side_effect=lambda ids: chunked(ids, size=2)),
+        ):
+            change_info = self.assert_same_change_info(factory, 'cars')
+        self.assertEqual([item.object_id for item in change_info['added_missing_objects']], [str(car_between.pk)])
+        self.assertEqual([item.object_id for item in change_info['same_missing_objects']], [str(cars[2].pk)])
+        self.assertEqual([item.object_id for item in change_info['deleted_items']], [deleted_car_id])
+
+    def test_diff_digests(self):
+        set_diff = diff_digests(
+            digests1={'1': 'a', '2': 'b', '3': 'c'},
+            digests2={'1': 'a', '2': 'x', '4': 'd'},
+            missing_ids1={'5', '6'},
+            missing_ids2={'3', '5', '7'},
+        )
+        self.assertEqual(set_diff.same_items, {'1'})
+        self.assertEqual(set_diff.changed_items, {'2'})
+        self.assertEqual(set_diff.removed_items, set())
+        self.assertEqual(set_diff.added_items, {'4'})
+        self.assertEqual(set_diff.same_missing_objects, {'3', '5'})
+        self.assertEqual(set_diff.removed_missing_objects, {'6'})
+        self.assertEqual(set_diff.added_missing_objects, {'7'})
+
+    def test_helpers(self):
+        self.assertEqual(list(chunked(range(5), size=2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(first_ids(['10', 'b', '9', 'a', '100'], 4), ['9', '10', '100', 'a'])
@@ -12,10 +12,16 @@
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
 
+from unittest import mock
 
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from reversion import is_registered
 from reversion.models import Revision, Version
 
+from reversion_compare.helpers import diff_memo
+from reversion_compare_project.admin import SimpleModelAdmin
 from reversion_compare_project.models import SimpleModel
 from reversion_compare_project.utils.fixtures import Fixtures
 from reversion_compare_project.utils.test_cases import BaseTestCase
@@ -67,6 +73,65 @@ class SimpleModelTest(BaseTestCase):
             f'<input type="radio" name="version_id2" value="{self.version_ids1[1]:d}" />',
         )
 
+    @override_settings(REVERSION_COMPARE_HISTORY_PAGE_SIZE=2)
+    def test_history_pagination(self):
+        history_url = f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/"
+
+        # First page contains the newest versions and the preselected compare radio buttons:
+        response = self.client.get(history_url)
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="radio" name="version_id1" value="7" style="visibility:hidden" />',
+                '<input type="radio" name="version_id2" value="7" checked="checked" />',
+                '<input type="radio" name="version_id1" value="6" checked="checked" />',
+                '<input type="radio" name="version_id2" value="6" />',
+                '<a href="?before=6">older versions &rsaquo;</a>',
+            ),
+        )
+        self.assertContains(response, f'<a href="{history_url}7/">')
+        self.assertContains(response, f'<a href="{history_url}6/">')
+        self.assertNotContains(response, 'name="version_id1" value="5"')
+        self.assertNotContains(response, 'newer versions')
+
+        response = self.client.get(history_url, data={'before': 6})
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="radio" name="version_id1" value="5" />',
+                '<input type="radio" name="version_id2" value="5" />',
+                '<input type="radio" name="version_id1" value="4" />',
+                '<input type="radio" name="version_id2" value="4" />',
+                '<a href="?after=5">&lsaquo; newer versions</a>',
+                '<a href="?before=4">older versions &rsaquo;</a>',
+            ),
+        )
+        self.assertContains(response, f'<a href="{history_url}5/">')
+        self.assertNotContains(response, 'name="version_id1" value="6"')
+        self.assertNotContains(response, 'checked="checked"')
+
+        response = self.client.get(history_url, data={'before': 4})
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<td>create v0</td>',
+                '<a href="?after=3">&lsaquo; newer versions</a>',
+            ),
+        )
+        self.assertNotContains(response, 'older versions')
+
+        # Newer page that reached the newest versions -> first page:
+        response = self.client.get(history_url, data={'after': 5})
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="radio" name="version_id1" value="7" style="visibility:hidden" />',
+                '<input type="radio" name="version_id1" value="6" checked="checked" />',
+                '<a href="?before=6">older versions &rsaquo;</a>',
+            ),
+        )
+        self.assertNotContains(response, 'newer versions')
+
     def test_select_compare2(self):
         response = self.client.get(f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/")
         # debug_response(response) # from django-tools
@@ -99,6 +164,67 @@ class SimpleModelTest(BaseTestCase):
             "<blockquote>simply change the CharField text.</blockquote>",  # edit comment
         )
 
+    def test_serialized_data_only_loaded_for_compared_versions(self):
+        def get_data_queries(queries):
+            return [query['sql'] for query in queries if '"reversion_version"."serialized_data"' in query['sql']]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/")
+        self.assertContains(response, '<td>change to v3</td>', html=True)
+        self.assertEqual(get_data_queries(queries.captured_queries), [])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/compare/",
+                data={"version_id2": 5, "version_id1": 4},
+            )
+        self.assertContainsHtml(
+            response,
+            '<a href="?version_id1=3&amp;version_id2=4">&lsaquo; previous</a>',
+            '<a href="?version_id1=5&amp;version_id2=6">next &rsaquo;</a>',
+        )
+        # version1, version2 and the ids of the next/prev versions are fetched with one query:
+        data_queries = get_data_queries(queries.captured_queries)
+        self.assertEqual(len(data_queries), 1)
+        version_queries = [
+            query['sql'] for query in queries.captured_queries if 'FROM "reversion_version"' in query['sql']
+        ]
+        self.assertEqual(version_queries, data_queries)
+
+    def test_compare_foreign_version(self):
+        # version 1 is a version of item1
+        response = self.client.get(
+            f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/compare/",
+            data={"version_id2": 3, "version_id1": 1},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(REVERSION_COMPARE_DIFF_MAX_SIZE=5)
+    def test_diff_max_size(self):
+        diff_memo.clear()  # A memorized diff would be used
+        response = self.client.get(
+            f"/en/admin/reversion_compare_project/simplemodel/{self.item1.pk}/history/compare/",
+            data={"version_id2": self.version_ids1[0], "version_id1": self.version_ids1[1]},
+        )
+        self.assertContainsHtml(
+            response,
+            '<p class="highlight diff-summary">values differ (11\xa0bytes → 11\xa0bytes)</p>',
+            '<p class="help diff-truncated">'
+            'The diff was simplified, because the values are too big to compare them in time.'
+            '</p>',
+        )
+
+    def test_diff_engine_per_field(self):
+        with mock.patch.object(SimpleModelAdmin, 'diff_engines', {'text': 'histogram'}):
+            response = self.client.get(
+                f"/en/admin/reversion_compare_project/simplemodel/{self.item1.pk}/history/compare/",
+                data={"version_id2": self.version_ids1[0], "version_id1": self.version_ids1[1]},
+            )
+        self.assertContainsHtml(
+            response,
+            '<span class="diff-line diff-del diff-ins"><del>version one</del><ins>version two</ins></span>',
+        )
+
     def test_prev_next_buttons(self):
         base_url = f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/compare/"
         for i in range(4):
@@ -144,3 +270,15 @@ class SimpleModelTest(BaseTestCase):
                 self.assertContains(response, "previous")
                 self.assertContains(response, "next")
                 self.assertContainsHtml(response, prev, next)
+
+    def test_prev_next_buttons_keep_query(self):
+        # The history page and filter parameters are kept, only the version ids are replaced:
+        response = self.client.get(
+            f"/en/admin/reversion_compare_project/simplemodel/{self.item2.pk}/history/compare/",
+            data={"version_id2": 5, "version_id1": 4, "before": 7, "changed_field": "text"},
+        )
+        self.assertContainsHtml(
+            response,
+            '<a href="?version_id1=3&amp;version_id2=4&amp;before=7&amp;changed_field=text">&lsaquo; previous</a>',
+            '<a href="?version_id1=5&amp;version_id2=6&amp;before=7&amp;changed_field=text">next &rsaquo;</a>',
+        )
@@ -0,0 +1,104 @@
+import logging
+import time
+
+from django.test import override_settings
+from reversion.models import Version
+
+from reversion_compare.helpers import diff_memo
+from reversion_compare.timing import CompareTimings
+from reversion_compare_project.utils.fixtures import Fixtures
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+class CompareTimingTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        diff_memo.clear()
+        fixtures = Fixtures(verbose=False)
+        self.car = fixtures.create_FactoryCar_data()
+
+        queryset = Version.objects.get_for_object(self.car)
+        self.version_ids = queryset.values_list("pk", flat=True)
+        self.compare_url = f"/en/admin/reversion_compare_project/car/{self.car.pk}/history/compare/"
+        self.data = {"version_id2": self.version_ids[0], "version_id1": self.version_ids[1]}
+
+    def assert_timings(self, timings_data):
+        self.assertGreater(timings_data['queries'], 0)
+        for name in ('versions', 'deserialize', 'prefetch', 'compare', 'diff', 'render'):
+            self.assertIn(name, timings_data['phases'])
+        for field_name in ('name', 'manufacturer', 'supplier'):
+            self.assertIn(field_name, timings_data['fields'])
+        self.assertNotIn('id', timings_data['fields'])  # Unchanged plain fields are skipped
+        self.assertGreater(timings_data['fields']['supplier']['queries'], 0)
+
+    def test_nested_phases_total(self):
+        timings = CompareTimings()
+        with timings.activate():
+            with timings.phase('outer'), timings.phase('inner'):
+                time.sleep(0.01)
+            with timings.activate(), timings.phase('other'):
+                time.sleep(0.01)
+        phases_sum = sum(timing.duration for timing in timings.phases.values())
+        self.assertGreaterEqual(timings.duration, 0.02)
+        self.assertLess(timings.duration, phases_sum)  # The nested phases are not summed up
+
+        with self.assertLogs('reversion_compare.timing', level=logging.INFO) as logs:
+            timings.log('Compare')
+        self.assertEqual(logs.records[0].compare_timings['duration'], timings.duration)
+        self.assertIn(f'Compare: {timings.duration * 1000:.1f}ms', logs.records[0].getMessage())
+
+    def test_disabled(self):
+        response = self.client.get(self.compare_url, data=self.data)
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('compare_timings', response.context)
+
+    @override_settings(REVERSION_COMPARE_TIMING=True)
+    def test_admin_compare_view(self):
+        with self.assertLogs('reversion_compare.timing', level=logging.INFO) as logs:
+            response = self.client.get(self.compare_url, data=self.data)
+        self.assertContains(response, '<ins>+ motor-car II</ins>', html=True)
+
+        server_timing = response['Server-Timing']
+        self.assertIn('versions;dur=', server_timing)
+        self.assertIn('compare;dur=', server_timing)
+        self.assertIn('field-supplier;dur=', server_timing)
+        self.assertIn(' queries"', server_timing)
+
+        timings = response.context['compare_timings']
+        self.assertIsInstance(timings, CompareTimings)
+
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertIn(f'Compare reversion_compare_project.Car {self.car.pk}:', record.getMessage())
+        self.assert_timings(record.compare_timings)
+
+    @override_settings(REVERSION_COMPARE_TIMING=True, REVERSION_COMPARE_STREAMING=True)
+    def test_streaming_compare_view(self):
+        with self.assertLogs('reversion_compare.timing', level=logging.INFO) as logs:
+            response = self.client.get(self.compare_url, data=self.data)
+            self.assertIn('versions;dur=', response['Server-Timing'])
+            content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertInHTML('<ins>+ motor-car II</ins>', content)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assert_timings(logs.records[0].compare_timings)
+
+    @override_settings(REVERSION_COMPARE_TIMING=True)
+    def test_history_compare_detail_view(self):
+        fixtures = Fixtures(verbose=False)
+        __, item2 = fixtures.create_Simple_data()
+        version_ids = Version.objects.get_for_object(item2).values_list("pk", flat=True)
+        with self.assertLogs('reversion_compare.timing', level=logging.INFO) as logs:
+            response = self.client.get(
+                f"/en/test_view/{item2.pk}/",
+                data={"version_id2": version_ids[3], "version_id1": version_ids[4]},
+            )
+        self.assertContains(response, '<ins>+ v1</ins>', html=True)
+
+        server_timing = response['Server-Timing']
+        for name in ('history', 'versions', 'compare', 'render', 'field-text'):
+            self.assertIn(f'{name};dur=', server_timing)
+        self.assertIn('compare_timings', response.context)
+
+        timings_data = logs.records[0].compare_timings
+        self.assertEqual(timings_data['fields']['text']['count'], 1)
@@ -11,13 +11,19 @@
     :copyleft: 2012-2022 by the django-reversion-compare team, see AUTHORS for more details.
     :license: GNU GPL v3 or above, see LICENSE for more details.
 """
+from unittest import mock
+
 from bx_django_utils.test_utils.html_assertion import assert_html_response_snapshot, get_django_name_suffix
+from django.contrib import admin
+from django.test import override_settings
 from freezegun import freeze_time
 from override_storage import locmem_stats_override_storage
 from override_storage.utils import Stats
 from reversion import create_revision, is_registered
 from reversion.models import Revision, Version
 
+from reversion_compare import helpers
+from reversion_compare.executor import shutdown_diff_executor
 from reversion_compare_project.models import VariantModel
 from reversion_compare_project.utils.fixtures import Fixtures
 from reversion_compare_project.utils.test_cases import BaseTestCase
@@ -60,6 +66,37 @@ last line"""
         self.assertEqual(response.status_code, 200, response)
         self.assertContains(response, "<ins>added </ins>", msg_prefix=response.content.decode())
 
+    def test_parallel_diffs(self):
+        lines = [f'line {no}' for no in range(100)]
+        with create_revision():
+            item = VariantModel.objects.create(text='\n'.join(lines), char='\n'.join(lines))
+        with create_revision():
+            item.text = item.text.replace('line 10\n', 'line ten\n')
+            item.char = item.char.replace('line 50\n', '')
+            item.integer = 1
+            item.save()
+        version2, version1 = Version.objects.get_for_object(item)
+
+        model_admin = admin.site._registry[VariantModel]
+        helpers.diff_memo.clear()
+        expected = model_admin.compare(item, version1, version2).diff
+        self.assertEqual([entry['field'].name for entry in expected], ['char', 'text', 'integer'])
+
+        helpers.diff_memo.clear()
+        self.addCleanup(helpers.diff_memo.clear)
+        self.addCleanup(shutdown_diff_executor)
+        with (
+            override_settings(
+                REVERSION_COMPARE_DIFF_WORKERS=2,
+                REVERSION_COMPARE_DIFF_EXECUTOR='thread',
+                REVERSION_COMPARE_DIFF_PARALLEL_MIN_SIZE=1000,
+            ),
+            mock.patch.object(helpers, '_generate_parallel_diff', wraps=helpers._generate_parallel_diff) as worker,
+        ):
+            result = model_admin.compare(item, version1, version2)
+        self.assertEqual(worker.call_count, 2)  # Only the big "char" and "text" values
+        self.assertEqual(result.diff, expected)
+
 
 @locmem_stats_override_storage(name='storage_stats')
 class VariantModelWithDataTest(BaseTestCase):
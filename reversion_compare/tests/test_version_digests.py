@@ -0,0 +1,96 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from reversion import create_revision
+from reversion.models import Version
+
+from reversion_compare.compare import CompareObjects
+from reversion_compare.models import VersionDigest, compute_digest
+from reversion_compare.set_diff import annotate_digests, get_version_digest, with_digests
+from reversion_compare_project.models import Person, Pet
+from reversion_compare_project.utils.test_cases import BaseTestCase
+
+
+@override_settings(REVERSION_COMPARE_VERSION_DIGESTS=True)
+class VersionDigestTestCase(BaseTestCase):
+    def create_data(self):
+        with create_revision():
+            pets = [Pet.objects.create(name=f'pet {no}') for no in range(3)]
+            person = Person.objects.create(name='person')
+            person.pets.set(pets)
+        with create_revision():
+            pets[1].name = 'pet 1 changed'
+            pets[1].save()
+            person.save()
+        return person
+
+    def test_post_revision_commit(self):
+        self.create_data()
+        self.assertEqual(VersionDigest.objects.count(), Version.objects.count())
+        for version in Version.objects.select_related('compare_digest'):
+            self.assertEqual(version.compare_digest.digest, compute_digest(version.serialized_data))
+
+        # Same digest as created in the database:
+        for version in with_digests(Version.objects.all()):
+            self.assertEqual(version.compare_digest_value, version.compare_digest.digest)
+
+    @override_settings(REVERSION_COMPARE_VERSION_DIGESTS=False)
+    def test_disabled(self):
+        self.create_data()
+        self.assertEqual(VersionDigest.objects.count(), 0)
+
+        # The stored digests are not used and the serialized data is compared directly:
+        queryset = with_digests(Version.objects.all())
+        self.assertNotIn(VersionDigest._meta.db_table, str(queryset.query))
+        self.assertNotIn('MD5', str(queryset.query).upper())
+        for version in queryset:
+            self.assertEqual(version.get_deferred_fields(), set())
+            self.assertEqual(get_version_digest(version), compute_digest(version.serialized_data))
+
+        # The digests of huge relations are created in the database, without our own table:
+        queryset = annotate_digests(Version.objects.all())
+        self.assertNotIn(VersionDigest._meta.db_table, str(queryset.query))
+        for version in queryset:
+            self.assertEqual(version.compare_digest_value, compute_digest(version.serialized_data))
+
+    @override_settings(REVERSION_COMPARE_VERSION_DIGESTS=False)
+    def test_m2m_compare_disabled(self):
+        person = self.create_data()
+        version2, version1 = Version.objects.get_for_object(person).select_related('revision')
+        field = Person._meta.get_field('pets')
+        obj_compare = CompareObjects(field, 'pets', person, version1, version2, is_reversed=False)
+        with CaptureQueriesContext(connection) as queries:
+            change_info = obj_compare.get_m2m_change_info()
+        for query in queries.captured_queries:
+            self.assertNotIn(VersionDigest._meta.db_table, query['sql'])
+
+        self.assertEqual(len(change_info['changed_items']), 1)
+        self.assertEqual(len(change_info['same_items']), 2)
+
+    def test_backfill(self):
+        self.create_data()
+        VersionDigest.objects.filter(pk__in=list(VersionDigest.objects.values_list('pk', flat=True)[:3])).delete()
+        self.assertEqual(VersionDigest.objects.count(), Version.objects.count() - 3)
+
+        output = StringIO()
+        call_command('backfill_version_digests', batch_size=2, stdout=output)
+        self.assertEqual(output.getvalue(), '3 version digests created.\n')
+        self.assertEqual(VersionDigest.objects.count(), Version.objects.count())
+        for version in Version.objects.select_related('compare_digest'):
+            self.assertEqual(version.compare_digest.digest, compute_digest(version.serialized_data))
+
+    def test_m2m_compare_without_serialized_data(self):
+        person = self.create_data()
+        version2, version1 = Version.objects.get_for_object(person).select_related('revision')
+        field = Person._meta.get_field('pets')
+        obj_compare = CompareObjects(field, 'pets', person, version1, version2, is_reversed=False)
+        with self.assertNumQueries(2):  # The related versions of both revisions
+            change_info = obj_compare.get_m2m_change_info()
+
+        self.assertEqual(len(change_info['changed_items']), 1)
+        self.assertEqual(len(change_info['same_items']), 2)
+        for version in change_info['same_items']:
+            self.assertIn('serialized_data', version.get_deferred_fields())
@@ -10,6 +10,7 @@
 
 
 from django.db import connection
+from django.test import override_settings
 from django.test.utils import CaptureQueriesContext
 from reversion import is_registered
 from reversion.models import Version
@@ -132,6 +133,35 @@ class CBViewTest(BaseTestCase):
         # duplicate queries: 6
         self.assertLess(len(queries.captured_queries), 15 + 2 + 1)  # real+buffer+login
 
+    @override_settings(REVERSION_COMPARE_HISTORY_PAGE_SIZE=2)
+    def test_history_pagination(self):
+        base_url = f"/en/test_view/{self.item2.pk}/"
+        response = self.client.get(base_url, data={'before': 6})
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="radio" name="version_id2" value="5" />',
+                '<input type="radio" name="version_id2" value="4" />',
+                '<input type="hidden" name="before" value="6">',
+                '<a href="?after=5">&lsaquo; newer versions</a>',
+                '<a href="?before=4">older versions &rsaquo;</a>',
+            ),
+        )
+
+        # Compare versions on this page:
+        response = self.client.get(base_url, data={'version_id1': 4, 'version_id2': 5, 'before': 6})
+        self.assert_html_parts(
+            response,
+            parts=(
+                '<input type="radio" name="version_id1" value="4" checked="checked" />',
+                '<input type="radio" name="version_id2" value="5" checked="checked" />',
+                '<del>- v1</del>',
+                '<ins>+ v2</ins>',
+                '<a href="?version_id1=4&amp;version_id2=5&amp;after=5">&lsaquo; newer versions</a>',
+                '<a href="?version_id1=4&amp;version_id2=5&amp;before=4">older versions &rsaquo;</a>',
+            ),
+        )
+
     def test_prev_next_buttons(self):
         base_url = f"/en/test_view/{self.item2.pk}/"
         for i in range(4):
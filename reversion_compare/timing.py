@@ -0,0 +1,172 @@
+"""
+    timing
+    ~~~~~~
+
+    Per phase and per field timings of the compare views.
+
+    Activate it in settings, e.g.:
+
+        REVERSION_COMPARE_TIMING = True
+
+    The timings will be exposed as "Server-Timing" response header, as log record
+    (logger "reversion_compare.timing", the data is in the "compare_timings" attribute)
+    and as "compare_timings" template context variable.
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+# Max. number of field timings in the Server-Timing header, the slowest fields are used:
+SERVER_TIMING_MAX_FIELDS = 10
+
+_current_timings = contextvars.ContextVar('reversion_compare_timings', default=None)
+
+
+def is_timing_enabled() -> bool:
+    return getattr(settings, 'REVERSION_COMPARE_TIMING', False)
+
+
+@dataclasses.dataclass
+class PhaseTiming:
+    duration: float = 0.0  # Seconds
+    queries: int = 0
+    count: int = 0  # How often the phase was entered
+
+
+class CompareTimings:
+    """
+    Collect the timings and query counts of all phases and fields while activated.
+    Phases with the same name will be summed up. Phases can be nested, so e.g. the
+    "diff" time is part of the field times. The total duration is the wall time of
+    all activated blocks, not the sum of the (maybe nested) phases.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.fields = {}
+        self.query_count = 0
+        self.duration = 0.0  # Seconds of all activated blocks
+        self._active = 0
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.query_count += 1
+        return execute(sql, params, many, context)
+
+    @contextlib.contextmanager
+    def activate(self):
+        """
+        Collect the timings of all phase() calls in the block. Can be called more than once.
+        """
+        token = _current_timings.set(self)
+        start_time = time.perf_counter()
+        self._active += 1
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self._count_query))
+                yield self
+        finally:
+            self._active -= 1
+            if not self._active:
+                # Only the outermost block, the nested blocks are part of it:
+                self.duration += time.perf_counter() - start_time
+            _current_timings.reset(token)
+
+    @contextlib.contextmanager
+    def _measure(self, timings: dict, name: str):
+        start_time = time.perf_counter()
+        start_queries = self.query_count
+        try:
+            yield
+        finally:
+            timing = timings.setdefault(name, PhaseTiming())
+            timing.duration += time.perf_counter() - start_time
+            timing.queries += self.query_count - start_queries
+            timing.count += 1
+
+    def phase(self, name: str):
+        return self._measure(self.phases, name)
+
+    def field(self, field_name: str):
+        return self._measure(self.fields, field_name)
+
+    def as_dict(self) -> dict:
+        return {
+            'phases': {name: dataclasses.asdict(timing) for name, timing in self.phases.items()},
+            'fields': {name: dataclasses.asdict(timing) for name, timing in self.fields.items()},
+            'queries': self.query_count,
+            'duration': self.duration,
+        }
+
+    def get_server_timing(self) -> str:
+        """
+        Returns the value for the "Server-Timing" response header.
+        """
+        entries = [(name, timing) for name, timing in self.phases.items()]
+        slowest_fields = sorted(self.fields.items(), key=lambda item: item[1].duration, reverse=True)
+        entries += [(f'field-{name}', timing) for name, timing in slowest_fields[:SERVER_TIMING_MAX_FIELDS]]
+        return ', '.join(
+            f'{name};dur={timing.duration * 1000:.3f};desc="{timing.queries} queries"' for name, timing in entries
+        )
+
+    def log(self, message: str) -> None:
+        logger.info(
+            '%s: %.1fms, %i queries, %i fields',
+            message,
+            self.duration * 1000,
+            self.query_count,
+            len(self.fields),
+            extra={'compare_timings': self.as_dict()},
+        )
+
+    def add_to_response(self, response, message: str) -> None:
+        response['Server-Timing'] = self.get_server_timing()
+        self.log(message)
+
+
+def get_compare_timings() -> CompareTimings | None:
+    """
+    Returns a new CompareTimings instance or None if timing is disabled.
+    """
+    if is_timing_enabled():
+        return CompareTimings()
+
+
+def get_current_timings() -> CompareTimings | None:
+    return _current_timings.get()
+
+
+def activate(timings: CompareTimings | None):
+    if timings is None:
+        return contextlib.nullcontext()
+    return timings.activate()
+
+
+def phase(name: str):
+    """
+    Measure the time and queries of a phase, if timings are activated.
+    """
+    if (timings := _current_timings.get()) is None:
+        return contextlib.nullcontext()
+    return timings.phase(name)
+
+
+def field_phase(field_name: str):
+    """
+    Measure the time and queries of one compared field, if timings are activated.
+    """
+    if (timings := _current_timings.get()) is None:
+        return contextlib.nullcontext()
+    return timings.field(field_name)
@@ -1,6 +1,11 @@
-from django.views.generic.detail import DetailView
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils.translation import gettext as _
+from django.views.generic.detail import DetailView, SingleObjectMixin
 from reversion.models import Version
 
+from reversion_compare import timing
+from reversion_compare.changed_fields import CHANGED_FIELD_PARAMETER
 from reversion_compare.mixins import CompareMethodsMixin, CompareMixin
 
 
@@ -30,29 +35,37 @@ class HistoryCompareDetailView(CompareMixin, CompareMethodsMixin, DetailView):
         "HistoryCompareDetailView Examples:"
     """
 
+    def get(self, request, *args, **kwargs):
+        timings = timing.get_compare_timings()
+        if timings is None:
+            return super().get(request, *args, **kwargs)
+
+        with timings.activate():
+            response = super().get(request, *args, **kwargs)
+            with timing.phase('render'):
+                response.render()
+        timings.add_to_response(response, f'Compare {self.object._meta.label} {self.object.pk}')
+        return response
+
     def _get_action_list(self):
-        action_list = [
-            {"version": version, "revision": version.revision}
-            for version in self._order_version_queryset(
-                Version.objects.get_for_object(self.get_object()).select_related("revision__user")
-            )
-        ]
-        return action_list
+        history_page = self._get_history_page(
+            self.request.GET,
+            Version.objects.get_for_object(self.get_object()).select_related("revision__user"),
+        )
+        return self._build_action_list(history_page), history_page
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        action_list = self._get_action_list()
-        self._annotate_action_list(action_list)
+    def _build_action_list(self, history_page) -> list:
+        return [{"version": version, "revision": version.revision} for version in history_page.versions]
 
-        if self.request.GET:
-            obj = self.get_object()
-            queryset = Version.objects.get_for_object(obj)
-            nav = self._resolve_versions_and_navigation(self.request.GET, queryset)
-            version1 = nav['version1']
-            version2 = nav['version2']
+    def _is_compare_request(self) -> bool:
+        # Not only history page parameters:
+        return bool(self.request.GET.keys() - {'before', 'after', CHANGED_FIELD_PARAMETER})
 
-            result = self.compare(obj, version1, version2)
+    def _update_context(self, context, action_list, history_page, nav=None, result=None) -> dict:
+        if history_page.is_latest:
+            self._annotate_action_list(action_list)
 
+        if result is not None:
             context.update(
                 {
                     'compare_data': result.diff,
@@ -65,8 +78,78 @@ class HistoryCompareDetailView(CompareMixin, CompareMethodsMixin, DetailView):
         context.update(
             {
                 'action_list': action_list,
+                'history_page': history_page,
                 'comparable': len(action_list) >= 2,
                 'compare_view': True,
             }
         )
         return context
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        with timing.phase('history'):
+            action_list, history_page = self._get_action_list()
+
+        nav = result = None
+        if self._is_compare_request():
+            with timing.phase('versions'):
+                obj = self.get_object()
+                queryset = Version.objects.get_for_object(obj)
+                nav = self._resolve_versions_and_navigation(self.request.GET, queryset)
+                version1 = nav['version1']
+                version2 = nav['version2']
+
+            with timing.phase('compare'):
+                result = self.get_compare_result(obj, version1, version2)
+
+        context = self._update_context(context, action_list, history_page, nav, result)
+        if timings := timing.get_current_timings():
+            context['compare_timings'] = timings
+        return context
+
+
+class AsyncHistoryCompareDetailView(HistoryCompareDetailView):
+    """
+    HistoryCompareDetailView with an async get(), for running under ASGI.
+
+    The database lookups use the async ORM, the compare itself runs in a bounded
+    thread pool, see: settings.REVERSION_COMPARE_ASYNC_WORKERS
+    The compare timings are not supported here.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = await self.aget_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        """
+        Async version of get_object(), but only for lookups by primary key.
+        """
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if pk is None:
+            return await sync_to_async(self.get_object)()
+
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query') % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+
+    async def aget_context_data(self, **kwargs):
+        """
+        Async version of get_context_data()
+        """
+        context = SingleObjectMixin.get_context_data(self, **kwargs)
+        queryset = await sync_to_async(Version.objects.get_for_object)(self.object)
+        history_page = await self._aget_history_page(self.request.GET, queryset.select_related("revision__user"))
+        action_list = self._build_action_list(history_page)
+
+        nav = result = None
+        if self._is_compare_request():
+            nav = await self._aresolve_versions_and_navigation(self.request.GET, queryset)
+            result = await self.aget_compare_result(self.object, nav['version1'], nav['version2'])
+
+        return self._update_context(context, action_list, history_page, nav, result)
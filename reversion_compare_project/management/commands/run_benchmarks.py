@@ -0,0 +1,62 @@
+"""
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import dataclasses
+import json
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from reversion_compare_project.utils.benchmarks import TEXT_SIZES, BenchmarkResult, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Run the benchmarks of the diff and compare hot paths against a temporary test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default=','.join(str(size) for size in TEXT_SIZES),
+            help='Comma separated text sizes in bytes for the diff benchmarks (default: %(default)s)',
+        )
+        parser.add_argument(
+            '--scale', type=int, default=100, help='Number of versions/m2m items (default: %(default)s)'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs (default: %(default)s)')
+        parser.add_argument('--save-baseline', type=Path, help='Store the results as baseline into this JSON file')
+        parser.add_argument('--baseline', type=Path, help='Compare the results with this baseline JSON file')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = run_benchmarks(sizes=sizes, scale=options['scale'], repeat=options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(f'{"benchmark":<45} {"time":>12} {"allocations":>14} {"queries":>8}')
+        for result in results:
+            self.stdout.write(
+                f'{result.name:<45} {result.time * 1000:>10.3f}ms'
+                f' {result.allocations / 1024:>12.1f}KB {result.queries:>8}'
+            )
+
+        if baseline_path := options['save_baseline']:
+            data = [dataclasses.asdict(result) for result in results]
+            baseline_path.write_text(json.dumps(data, indent=4))
+            self.stdout.write(f'Baseline saved to: {baseline_path}')
+
+        if baseline_path := options['baseline']:
+            baseline = {item['name']: BenchmarkResult(**item) for item in json.loads(baseline_path.read_text())}
+            regressions = []
+            for result in results:
+                if result.name in baseline:
+                    for regression in result.get_regressions(baseline[result.name]):
+                        regressions.append(f'{result.name}: {regression}')
+            if regressions:
+                raise CommandError('Regressions found:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS(f'No regressions compared to: {baseline_path}'))
@@ -0,0 +1,119 @@
+# Generated by Django 6.1.2 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reversion_compare_project', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManyFieldsModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_000', models.CharField(blank=True, default='', max_length=100)),
+                ('field_001', models.CharField(blank=True, default='', max_length=100)),
+                ('field_002', models.CharField(blank=True, default='', max_length=100)),
+                ('field_003', models.CharField(blank=True, default='', max_length=100)),
+                ('field_004', models.CharField(blank=True, default='', max_length=100)),
+                ('field_005', models.CharField(blank=True, default='', max_length=100)),
+                ('field_006', models.CharField(blank=True, default='', max_length=100)),
+                ('field_007', models.CharField(blank=True, default='', max_length=100)),
+                ('field_008', models.CharField(blank=True, default='', max_length=100)),
+                ('field_009', models.CharField(blank=True, default='', max_length=100)),
+                ('field_010', models.CharField(blank=True, default='', max_length=100)),
+                ('field_011', models.CharField(blank=True, default='', max_length=100)),
+                ('field_012', models.CharField(blank=True, default='', max_length=100)),
+                ('field_013', models.CharField(blank=True, default='', max_length=100)),
+                ('field_014', models.CharField(blank=True, default='', max_length=100)),
+                ('field_015', models.CharField(blank=True, default='', max_length=100)),
+                ('field_016', models.CharField(blank=True, default='', max_length=100)),
+                ('field_017', models.CharField(blank=True, default='', max_length=100)),
+                ('field_018', models.CharField(blank=True, default='', max_length=100)),
+                ('field_019', models.CharField(blank=True, default='', max_length=100)),
+                ('field_020', models.CharField(blank=True, default='', max_length=100)),
+                ('field_021', models.CharField(blank=True, default='', max_length=100)),
+                ('field_022', models.CharField(blank=True, default='', max_length=100)),
+                ('field_023', models.CharField(blank=True, default='', max_length=100)),
+                ('field_024', models.CharField(blank=True, default='', max_length=100)),
+                ('field_025', models.CharField(blank=True, default='', max_length=100)),
+                ('field_026', models.CharField(blank=True, default='', max_length=100)),
+                ('field_027', models.CharField(blank=True, default='', max_length=100)),
+                ('field_028', models.CharField(blank=True, default='', max_length=100)),
+                ('field_029', models.CharField(blank=True, default='', max_length=100)),
+                ('field_030', models.CharField(blank=True, default='', max_length=100)),
+                ('field_031', models.CharField(blank=True, default='', max_length=100)),
+                ('field_032', models.CharField(blank=True, default='', max_length=100)),
+                ('field_033', models.CharField(blank=True, default='', max_length=100)),
+                ('field_034', models.CharField(blank=True, default='', max_length=100)),
+                ('field_035', models.CharField(blank=True, default='', max_length=100)),
+                ('field_036', models.CharField(blank=True, default='', max_length=100)),
+                ('field_037', models.CharField(blank=True, default='', max_length=100)),
+                ('field_038', models.CharField(blank=True, default='', max_length=100)),
+                ('field_039', models.CharField(blank=True, default='', max_length=100)),
+                ('field_040', models.CharField(blank=True, default='', max_length=100)),
+                ('field_041', models.CharField(blank=True, default='', max_length=100)),
+                ('field_042', models.CharField(blank=True, default='', max_length=100)),
+                ('field_043', models.CharField(blank=True, default='', max_length=100)),
+                ('field_044', models.CharField(blank=True, default='', max_length=100)),
+                ('field_045', models.CharField(blank=True, default='', max_length=100)),
+                ('field_046', models.CharField(blank=True, default='', max_length=100)),
+                ('field_047', models.CharField(blank=True, default='', max_length=100)),
+                ('field_048', models.CharField(blank=True, default='', max_length=100)),
+                ('field_049', models.CharField(blank=True, default='', max_length=100)),
+                ('field_050', models.CharField(blank=True, default='', max_length=100)),
+                ('field_051', models.CharField(blank=True, default='', max_length=100)),
+                ('field_052', models.CharField(blank=True, default='', max_length=100)),
+                ('field_053', models.CharField(blank=True, default='', max_length=100)),
+                ('field_054', models.CharField(blank=True, default='', max_length=100)),
+                ('field_055', models.CharField(blank=True, default='', max_length=100)),
+                ('field_056', models.CharField(blank=True, default='', max_length=100)),
+                ('field_057', models.CharField(blank=True, default='', max_length=100)),
+                ('field_058', models.CharField(blank=True, default='', max_length=100)),
+                ('field_059', models.CharField(blank=True, default='', max_length=100)),
+                ('field_060', models.CharField(blank=True, default='', max_length=100)),
+                ('field_061', models.CharField(blank=True, default='', max_length=100)),
+                ('field_062', models.CharField(blank=True, default='', max_length=100)),
+                ('field_063', models.CharField(blank=True, default='', max_length=100)),
+                ('field_064', models.CharField(blank=True, default='', max_length=100)),
+                ('field_065', models.CharField(blank=True, default='', max_length=100)),
+                ('field_066', models.CharField(blank=True, default='', max_length=100)),
+                ('field_067', models.CharField(blank=True, default='', max_length=100)),
+                ('field_068', models.CharField(blank=True, default='', max_length=100)),
+                ('field_069', models.CharField(blank=True, default='', max_length=100)),
+                ('field_070', models.CharField(blank=True, default='', max_length=100)),
+                ('field_071', models.CharField(blank=True, default='', max_length=100)),
+                ('field_072', models.CharField(blank=True, default='', max_length=100)),
+                ('field_073', models.CharField(blank=True, default='', max_length=100)),
+                ('field_074', models.CharField(blank=True, default='', max_length=100)),
+                ('field_075', models.CharField(blank=True, default='', max_length=100)),
+                ('field_076', models.CharField(blank=True, default='', max_length=100)),
+                ('field_077', models.CharField(blank=True, default='', max_length=100)),
+                ('field_078', models.CharField(blank=True, default='', max_length=100)),
+                ('field_079', models.CharField(blank=True, default='', max_length=100)),
+                ('field_080', models.CharField(blank=True, default='', max_length=100)),
+                ('field_081', models.CharField(blank=True, default='', max_length=100)),
+                ('field_082', models.CharField(blank=True, default='', max_length=100)),
+                ('field_083', models.CharField(blank=True, default='', max_length=100)),
+                ('field_084', models.CharField(blank=True, default='', max_length=100)),
+                ('field_085', models.CharField(blank=True, default='', max_length=100)),
+                ('field_086', models.CharField(blank=True, default='', max_length=100)),
+                ('field_087', models.CharField(blank=True, default='', max_length=100)),
+                ('field_088', models.CharField(blank=True, default='', max_length=100)),
+                ('field_089', models.CharField(blank=True, default='', max_length=100)),
+                ('field_090', models.CharField(blank=True, default='', max_length=100)),
+                ('field_091', models.CharField(blank=True, default='', max_length=100)),
+                ('field_092', models.CharField(blank=True, default='', max_length=100)),
+                ('field_093', models.CharField(blank=True, default='', max_length=100)),
+                ('field_094', models.CharField(blank=True, default='', max_length=100)),
+                ('field_095', models.CharField(blank=True, default='', max_length=100)),
+                ('field_096', models.CharField(blank=True, default='', max_length=100)),
+                ('field_097', models.CharField(blank=True, default='', max_length=100)),
+                ('field_098', models.CharField(blank=True, default='', max_length=100)),
+                ('field_099', models.CharField(blank=True, default='', max_length=100)),
+            ],
+        ),
+    ]
@@ -181,6 +181,26 @@ class VariantModel(models.Model):
         return f"VariantModel instance pk: {self.pk:d}"
 
 
+MANY_FIELDS_COUNT = 100
+
+
+class ManyFieldsModel(models.Model):
+    """
+    A model with many fields, used in the benchmarks.
+    It's not registered in the admin, to keep the admin pages of the tests unchanged.
+    """
+
+    def __str__(self):
+        return f"ManyFieldsModel instance pk: {self.pk:d}"
+
+
+for no in range(MANY_FIELDS_COUNT):
+    ManyFieldsModel.add_to_class(f"field_{no:03d}", models.CharField(max_length=100, blank=True, default=""))
+
+
+revisions.register(ManyFieldsModel)
+
+
 class CustomModel(models.Model):
     """Model which uses a custom version manager."""
 
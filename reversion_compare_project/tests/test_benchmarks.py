@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from reversion_compare_project.utils.benchmarks import BenchmarkResult, make_text_pair, run_benchmarks
+
+
+class BenchmarksTestCase(TestCase):
+    def test_run_benchmarks(self):
+        results = run_benchmarks(sizes=(10, 1000), scale=3, repeat=1)
+        names = [result.name for result in results]
+        self.assertIn('html_diff 1000B rewrite', names)
+        self.assertIn('diff2lines+lines2html 10B', names)
+        self.assertIn('compare 100 fields', names)
+        self.assertIn('compare 3 m2m items', names)
+        self.assertIn('history page 3 versions', names)
+
+        result = {result.name: result for result in results}['compare 3 versions']
+        self.assertGreater(result.time, 0)
+        self.assertGreater(result.allocations, 0)
+        self.assertGreater(result.queries, 0)
+
+    def test_make_text_pair(self):
+        for pattern in ('char', 'lines', 'append', 'rewrite'):
+            with self.subTest(pattern=pattern):
+                value1, value2 = make_text_pair(1000, pattern)
+                self.assertEqual(len(value1), 1000)
+                self.assertNotEqual(value1, value2)
+
+    def test_regressions(self):
+        baseline = BenchmarkResult(name='foo', time=1.0, allocations=1000, queries=2)
+        self.assertEqual(
+            BenchmarkResult(name='foo', time=1.2, allocations=1200, queries=2).get_regressions(baseline), []
+        )
+        self.assertEqual(
+            BenchmarkResult(name='foo', time=1.3, allocations=1300, queries=3).get_regressions(baseline),
+            [
+                'time: 1.000000s -> 1.300000s',
+                'allocations: 1000 -> 1300 bytes',
+                'queries: 2 -> 3',
+            ],
+        )
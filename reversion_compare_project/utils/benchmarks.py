@@ -0,0 +1,263 @@
+"""
+    django-reversion-compare benchmarks
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Micro-benchmarks of the diff and compare hot paths.
+    Run them via: ./manage.py run_benchmarks --help
+
+    :copyleft: 2026 by the django-reversion-compare team, see AUTHORS for more details.
+    :license: GNU GPL v3 or above, see LICENSE for more details.
+"""
+
+import dataclasses
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.contrib import admin
+from django.db import connection
+from django.http import QueryDict
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from reversion import create_revision, set_comment
+from reversion.models import Version
+
+from reversion_compare.admin import CompareVersionAdmin
+from reversion_compare.helpers import DIFF_MAX_SIZE, diff2lines, diff_memo, dmp_char_diff, html_diff, lines2html
+from reversion_compare_project.models import (
+    MANY_FIELDS_COUNT,
+    ManyFieldsModel,
+    Person,
+    Pet,
+    SimpleModel,
+    VariantModel,
+)
+from reversion_compare_project.utils.fixtures import LOREM_IPSUM, Fixtures
+
+
+TEXT_SIZES = (10, 1_000, 100_000, 1_000_000, 10_000_000)
+
+# Allowed deviation from the baseline, before it's a regression:
+TIME_TOLERANCE = 0.25
+TIME_MIN_DIFFERENCE = 0.005  # Ignore timer noise of very fast benchmarks
+ALLOCATION_TOLERANCE = 0.25
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    name: str
+    time: float  # Median seconds of all runs
+    allocations: int  # Peak of allocated bytes of one run
+    queries: int  # Number of database queries of one run
+
+    def get_regressions(self, baseline: 'BenchmarkResult') -> list[str]:
+        regressions = []
+        if self.time - baseline.time > max(baseline.time * TIME_TOLERANCE, TIME_MIN_DIFFERENCE):
+            regressions.append(f'time: {baseline.time:.6f}s -> {self.time:.6f}s')
+        if self.allocations > baseline.allocations * (1 + ALLOCATION_TOLERANCE):
+            regressions.append(f'allocations: {baseline.allocations} -> {self.allocations} bytes')
+        if self.queries > baseline.queries:
+            regressions.append(f'queries: {baseline.queries} -> {self.queries}')
+        return regressions
+
+
+def measure(name, func, repeat=3) -> BenchmarkResult:
+    """
+    Measure the time without tracemalloc overhead and allocations/queries with a separate run.
+    """
+    timings = []
+    for __ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        time=statistics.median(timings),
+        allocations=peak,
+        queries=len(queries.captured_queries),
+    )
+
+
+def make_text(size, seed=0) -> str:
+    """
+    Returns a Lorem ipsum text with lines of ~80 characters and the given size.
+    """
+    rnd = random.Random(seed)
+    words = LOREM_IPSUM.split()
+    lines = []
+    line = []
+    length = line_length = 0
+    while length < size:
+        word = rnd.choice(words)
+        line.append(word)
+        length += len(word) + 1
+        line_length += len(word) + 1
+        if line_length > 80:
+            lines.append(' '.join(line))
+            line = []
+            line_length = 0
+    lines.append(' '.join(line))
+    return '\n'.join(lines)[:size]
+
+
+def make_text_pair(size, pattern) -> tuple[str, str]:
+    """
+    Returns two texts with the given size and edit pattern:
+
+        char: one character changed in the middle
+        lines: every 10th line changed
+        append: one line appended
+        rewrite: a completely different text
+    """
+    value1 = make_text(size)
+    if pattern == 'char':
+        middle = size // 2
+        value2 = value1[:middle] + '#' + value1[middle + 1 :]
+    elif pattern == 'lines':
+        lines = value1.splitlines()
+        value2 = '\n'.join(line.upper() if no % 10 == 0 else line for no, line in enumerate(lines))
+    elif pattern == 'append':
+        value2 = value1 + '\nThe appended line.'
+    elif pattern == 'rewrite':
+        value2 = make_text(size, seed=1)
+    else:
+        raise ValueError(f'Unknown edit pattern: {pattern!r}')
+    return value1, value2
+
+
+EDIT_PATTERNS = ('char', 'lines', 'append', 'rewrite')
+
+
+def benchmark_html_diff(sizes, repeat) -> list[BenchmarkResult]:
+    results = []
+    for size in sizes:
+        for pattern in EDIT_PATTERNS:
+            value1, value2 = make_text_pair(size, pattern)
+
+            def func(value1=value1, value2=value2):
+                diff_memo.clear()  # Measure the diff generation, not the memo
+                html_diff(value1, value2)
+
+            # Raise the size limit, so that the large texts are diffed and not only summarized.
+            # The DIFF_TIMEOUT still applies: A diff that runs out of time measures the fallbacks.
+            with override_settings(REVERSION_COMPARE_DIFF_MAX_SIZE=max(size * 2, DIFF_MAX_SIZE)):
+                results.append(measure(f'html_diff {size}B {pattern}', func, repeat=repeat))
+    return results
+
+
+def benchmark_rendering(sizes, repeat) -> list[BenchmarkResult]:
+    results = []
+    for size in sizes:
+        value1, value2 = make_text_pair(size, 'lines')
+        diff = dmp_char_diff(value1, value2, timeout=0)
+        results.append(
+            measure(f'diff2lines+lines2html {size}B', lambda diff=diff: lines2html(diff2lines(diff)), repeat=repeat)
+        )
+    return results
+
+
+def create_many_versions_data(count) -> SimpleModel:
+    with create_revision():
+        item = SimpleModel.objects.create(text='version 0')
+    for no in range(1, count):
+        with create_revision():
+            item.text = f'version {no}'
+            item.save()
+            set_comment(f'change to version {no}')
+    return item
+
+
+def create_many_m2m_data(count) -> Person:
+    with create_revision():
+        pets = [Pet.objects.create(name=f'pet {no}') for no in range(count)]
+        person = Person.objects.create(name='Many pets')
+        person.pets.add(*pets)
+        person.save()
+        set_comment('initial version')
+
+    with create_revision():
+        for pet in pets[::3]:
+            pet.name += ' changed'
+            pet.save()
+        person.pets.remove(*pets[1::3])
+        person.save()
+        set_comment('change/remove pets')
+    return person
+
+
+def create_many_fields_data() -> ManyFieldsModel:
+    field_names = [f'field_{no:03d}' for no in range(MANY_FIELDS_COUNT)]
+    with create_revision():
+        item = ManyFieldsModel.objects.create(**{name: f'{name} value' for name in field_names})
+        set_comment('initial version')
+
+    with create_revision():
+        for name in field_names[::2]:
+            setattr(item, name, f'{name} changed value')
+        item.save()
+        set_comment('change every second field')
+    return item
+
+
+def benchmark_compare(obj, repeat, name) -> list[BenchmarkResult]:
+    model = type(obj)
+    model_admin = admin.site._registry.get(model) or CompareVersionAdmin(model, admin.site)
+    queryset = Version.objects.get_for_object(obj)
+    version_ids = list(queryset.values_list('pk', flat=True))  # newest first
+
+    def func():
+        diff_memo.clear()
+        # Fetch the versions again, because the deserialized data will be cached on the instances:
+        version1 = queryset.get(pk=version_ids[-1])
+        version2 = queryset.get(pk=version_ids[0])
+        model_admin.compare(obj, version1, version2)
+
+    return [measure(f'compare {name}', func, repeat=repeat)]
+
+
+def benchmark_history(obj, repeat, name) -> list[BenchmarkResult]:
+    model_admin = admin.site._registry[type(obj)]
+    queryset = Version.objects.get_for_object(obj)
+    version_ids = list(queryset.values_list('pk', flat=True))  # newest first
+    request_GET = {'version_id1': version_ids[-1], 'version_id2': version_ids[0]}
+    return [
+        measure(f'history page {name}', lambda: model_admin._get_history_page(QueryDict(), queryset), repeat=repeat),
+        measure(
+            f'resolve versions {name}',
+            lambda: model_admin._resolve_versions_and_navigation(request_GET, queryset),
+            repeat=repeat,
+        ),
+    ]
+
+
+def run_benchmarks(sizes=TEXT_SIZES, scale=100, repeat=3) -> list[BenchmarkResult]:
+    """
+    Run all benchmarks. The database must be set up and can be changed.
+    The scale is the number of versions and m2m items of the compare benchmarks.
+    """
+    results = benchmark_html_diff(sizes, repeat)
+    results += benchmark_rendering(sizes, repeat)
+
+    variant_item, __ = Fixtures(verbose=False).create_VariantModel_data()
+    results += benchmark_compare(variant_item, repeat, name=f'{VariantModel.__name__} all fields')
+
+    many_fields_item = create_many_fields_data()
+    results += benchmark_compare(many_fields_item, repeat, name=f'{MANY_FIELDS_COUNT} fields')
+
+    person = create_many_m2m_data(scale)
+    results += benchmark_compare(person, repeat, name=f'{scale} m2m items')
+
+    item = create_many_versions_data(scale)
+    results += benchmark_compare(item, repeat, name=f'{scale} versions')
+    results += benchmark_history(item, repeat, name=f'{scale} versions')
+    return results